@@ -0,0 +1,40 @@
+import argparse
+import asyncio
+import logging
+
+from benchmarks.common import make_server, measure_fanout, print_table, server_port
+
+
+async def run(clients: int, messages: int, shard_counts: list[int]):
+    rows = []
+    for shards in shard_counts:
+        server = make_server(fanout_shards=shards)
+        await server.start()
+        result = await measure_fanout(server_port(server), clients, messages)
+        latency = server.room.fanout_stats()["latency_ms"]
+        await server.stop()
+
+        rows.append(
+            {
+                "shards": shards,
+                **result,
+                "fanout_p99_ms": latency["p99"],
+            }
+        )
+
+    print_table("Sharded fan-out", rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fan-out throughput by shard count")
+    parser.add_argument("--clients", type=int, default=1000)
+    parser.add_argument("--messages", type=int, default=200)
+    parser.add_argument("--shards", type=int, nargs="+", default=[1, 4, 16])
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.CRITICAL)
+    asyncio.run(run(args.clients, args.messages, args.shards))
+
+
+if __name__ == "__main__":
+    main()
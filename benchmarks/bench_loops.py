@@ -0,0 +1,91 @@
+import argparse
+import json
+import logging
+import resource
+import subprocess
+import sys
+import time
+
+from benchmarks.common import (
+    join,
+    make_server,
+    measure_fanout,
+    print_table,
+    server_port,
+)
+from chatserver.network.eventloop import loop_backend, new_event_loop
+
+
+async def run(clients: int, messages: int) -> dict:
+    server = make_server()
+    await server.start()
+    port = server_port(server)
+
+    start = time.perf_counter()
+    connections = [await join(port, f"accept{i}") for i in range(clients)]
+    accept_seconds = time.perf_counter() - start
+    for _, writer in connections:
+        writer.close()
+
+    result = await measure_fanout(port, clients, messages)
+    await server.stop()
+
+    return {
+        "joins_per_second": clients / accept_seconds,
+        "deliveries_per_second": result["deliveries_per_second"],
+        "fanout_p99_ms": server.room.fanout_stats()["latency_ms"]["p99"],
+    }
+
+
+def run_backend(backend: str, clients: int, messages: int, eager_tasks: bool):
+    loop = new_event_loop(backend, eager_tasks)
+    try:
+        row = {"loop": loop_backend(loop).value, "eager_tasks": eager_tasks}
+        row.update(loop.run_until_complete(run(clients, messages)))
+    finally:
+        loop.close()
+
+    row["peak_rss_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(json.dumps(row))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare event loop backends")
+    parser.add_argument("--clients", type=int, default=500)
+    parser.add_argument("--messages", type=int, default=200)
+    parser.add_argument(
+        "--loops", nargs="+", default=["asyncio", "uvloop"], help="Backends to run"
+    )
+    parser.add_argument("--eager-tasks", action="store_true")
+    parser.add_argument("--backend", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    if args.backend:
+        run_backend(args.backend, args.clients, args.messages, args.eager_tasks)
+        return
+
+    rows = []
+    for backend in args.loops:
+        command = [
+            sys.executable,
+            "-m",
+            "benchmarks.bench_loops",
+            "--backend",
+            backend,
+            "--clients",
+            str(args.clients),
+            "--messages",
+            str(args.messages),
+        ]
+        if args.eager_tasks:
+            command.append("--eager-tasks")
+        output = subprocess.run(command, capture_output=True, text=True, check=True)
+        row = json.loads(output.stdout.strip().splitlines()[-1])
+        rows.append({"requested": backend, **row})
+
+    print_table("Event loop backends", rows)
+
+
+if __name__ == "__main__":
+    main()
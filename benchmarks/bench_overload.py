@@ -0,0 +1,87 @@
+import argparse
+import asyncio
+import logging
+import time
+
+from benchmarks.common import join, make_server, print_table, server_port
+
+
+async def flood(writer: asyncio.StreamWriter, rate: float, duration: float, tag: str):
+    interval = 1 / rate
+    deadline = time.perf_counter() + duration
+    i = 0
+    while time.perf_counter() < deadline:
+        writer.write(f"{tag} load {i}\n".encode())
+        i += 1
+        await asyncio.sleep(interval)
+    await writer.drain()
+
+
+async def discard(reader: asyncio.StreamReader):
+    while await reader.read(1 << 16):
+        pass
+
+
+async def run(viewers: int, senders: int, rate: int, duration: float):
+    server = make_server(
+        rate_limit_max_messages=rate * 10,
+        rate_limit_window_seconds=5,
+        overload_interval=0.25,
+        overload_queue_slow=100,
+        overload_queue_shed=500,
+        overload_latency_slow_ms=10.0,
+        overload_latency_shed_ms=40.0,
+        overload_recover_intervals=4,
+    )
+    await server.start()
+    port = server_port(server)
+
+    connections = [await join(port, f"viewer{i}") for i in range(viewers)]
+    connections += [await join(port, f"sender{i}") for i in range(senders)]
+    readers = [asyncio.create_task(discard(reader)) for reader, _ in connections]
+
+    floods = [
+        asyncio.create_task(flood(writer, rate, duration, f"s{i}"))
+        for i, (_, writer) in enumerate(connections[viewers:])
+    ]
+
+    rows = []
+    start = time.perf_counter()
+    while time.perf_counter() - start < duration * 2:
+        await asyncio.sleep(0.5)
+        stats = server.overload.stats()
+        rows.append(
+            {
+                "seconds": time.perf_counter() - start,
+                "level": stats["level"],
+                "queue_depth": stats["queue_depth"],
+                "fanout_ms": stats["fanout_ms"],
+                "rate_limit": stats["effective_rate_limit"],
+                "broadcasts": server.room.broadcasts,
+            }
+        )
+
+    await asyncio.gather(*floods)
+    for reader_task in readers:
+        reader_task.cancel()
+    for _, writer in connections:
+        writer.close()
+    await server.stop()
+
+    print_table("Overload controller timeline", rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Synthetic overload driver")
+    parser.add_argument("--viewers", type=int, default=1000)
+    parser.add_argument("--senders", type=int, default=20)
+    parser.add_argument("--rate", type=int, default=100, help="Lines/s per sender")
+    parser.add_argument("--duration", type=float, default=5.0)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.CRITICAL)
+    asyncio.run(run(args.viewers, args.senders, args.rate, args.duration))
+
+
+if __name__ == "__main__":
+    main()
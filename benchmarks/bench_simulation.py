@@ -0,0 +1,65 @@
+import argparse
+import logging
+
+from benchmarks.common import print_table
+from benchmarks.simulation import LinkProfile, SimulationConfig, run_simulation
+
+
+def main():
+    parser = argparse.ArgumentParser(description="In-process room simulation")
+    parser.add_argument("--clients", type=int, default=50_000)
+    parser.add_argument("--senders", type=int, default=1)
+    parser.add_argument("--messages", type=int, default=100)
+    parser.add_argument("--rate", type=float, default=0.0, help="Messages/s (0: max)")
+    parser.add_argument("--size", type=int, default=32, help="Message bytes")
+    parser.add_argument("--latency", type=float, default=0.02, help="Seconds")
+    parser.add_argument("--bandwidth", type=float, default=0.0, help="Bytes/s")
+    parser.add_argument("--slow-fraction", type=float, default=0.0)
+    parser.add_argument("--slow-bandwidth", type=float, default=2048.0)
+    parser.add_argument("--stalled-fraction", type=float, default=0.0)
+    parser.add_argument("--stall-at", type=float, default=0.5)
+    parser.add_argument("--stall-timeout", type=float, default=5.0)
+    parser.add_argument("--shards", type=int, default=4)
+    parser.add_argument("--virtual-time", action="store_true")
+    parser.add_argument("--trace-memory", action="store_true")
+    args = parser.parse_args()
+
+    normal = 1.0 - args.slow_fraction - args.stalled_fraction
+    links = [
+        (normal, LinkProfile(latency=args.latency, bandwidth=args.bandwidth)),
+        (
+            args.slow_fraction,
+            LinkProfile(latency=args.latency, bandwidth=args.slow_bandwidth),
+        ),
+        (
+            args.stalled_fraction,
+            LinkProfile(latency=args.latency, stall_at=args.stall_at),
+        ),
+    ]
+    config = SimulationConfig(
+        clients=args.clients,
+        senders=args.senders,
+        messages=args.messages,
+        rate=args.rate,
+        message_size=args.size,
+        links=links,
+        stall_timeout=args.stall_timeout,
+        virtual_time=args.virtual_time,
+        trace_memory=args.trace_memory,
+        fanout_shards=args.shards,
+    )
+
+    logging.basicConfig(level=logging.CRITICAL)
+    summary = run_simulation(config).summary()
+
+    row = {}
+    for key, value in summary.items():
+        if isinstance(value, dict):
+            row.update({f"{key[:-3]}_{k}_ms": v for k, v in value.items()})
+        else:
+            row[key] = value
+    print_table("Simulation", [row])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+import argparse
+import asyncio
+import logging
+import tracemalloc
+
+from benchmarks.common import make_server, measure_fanout, print_table, server_port
+
+VARIANTS = {
+    "defaults": {},
+    "no-nodelay": {"tcp_nodelay": False},
+    "no-keepalive": {"tcp_keepalive": False},
+    "sndbuf-16k": {"socket_sndbuf": 16 * 1024},
+    "sndbuf-1m": {"socket_sndbuf": 1024 * 1024},
+    "high-water-16k": {"write_buffer_high": 16 * 1024},
+    "high-water-1m": {"write_buffer_high": 1024 * 1024},
+}
+
+
+async def run(clients: int, messages: int, variants: list[str]):
+    rows = []
+    for name in variants:
+        server = make_server(**VARIANTS[name])
+        await server.start()
+
+        tracemalloc.start()
+        result = await measure_fanout(server_port(server), clients, messages)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        latency = server.room.fanout_stats()["latency_ms"]
+        await server.stop()
+
+        rows.append(
+            {
+                "variant": name,
+                "deliveries_per_second": result["deliveries_per_second"],
+                "fanout_p50_ms": latency["p50"],
+                "fanout_p99_ms": latency["p99"],
+                "peak_alloc_kib": peak / 1024,
+            }
+        )
+
+    print_table("Socket tuning", rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Effect of socket tuning options")
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--messages", type=int, default=200)
+    parser.add_argument(
+        "--variants", nargs="+", choices=list(VARIANTS), default=list(VARIANTS)
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.CRITICAL)
+    asyncio.run(run(args.clients, args.messages, args.variants))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+import argparse
+import random
+import time
+
+from benchmarks.common import print_table
+from chatserver.core.exceptions import SpamDetectedError
+from chatserver.core.spam import SpamAction, SpamFilter
+
+WORDS = (
+    "deploy build failed green merge review ticket coffee lunch meeting "
+    "server latency cache python asyncio socket ping pong release rollback "
+    "hotfix tomorrow today anyone seen the new dashboard graph looks weird"
+).split()
+
+PASTES = [
+    "FREE NITRO >>> visit totally-legit.example now <<<",
+    "join my discord join my discord join my discord",
+    "░░░░▄▄▄▄▀▀▀▀▀▀▀▀▄▄▄▄▄▄░░░░░░░░░░░░░",
+]
+
+
+def mutate(line: str, rng: random.Random) -> str:
+    choice = rng.randrange(4)
+    if choice == 0:
+        return line.upper()
+    if choice == 1:
+        return line + "!" * rng.randrange(1, 4)
+    if choice == 2:
+        return line.replace(" ", "  ")
+    return line
+
+
+def build_corpus(
+    size: int, flood_ratio: float, seed: int
+) -> list[tuple[float, str, str]]:
+    rng = random.Random(seed)
+    corpus = []
+    now = 0.0
+
+    for _ in range(size):
+        now += rng.expovariate(200.0)
+        if rng.random() < flood_ratio:
+            nickname = f"bot{rng.randrange(200)}"
+            content = mutate(rng.choice(PASTES), rng)
+        else:
+            nickname = f"user{rng.randrange(2000)}"
+            content = " ".join(rng.choices(WORDS, k=rng.randint(2, 15)))
+        corpus.append((now, nickname, content))
+
+    return corpus
+
+
+def run(corpus: list[tuple[float, str, str]], action: SpamAction) -> dict:
+    spam = SpamFilter(action=action, burst_threshold=1000)
+    blocked = {"duplicate": 0, "burst": 0, "muted": 0, "slow": 0}
+
+    start = time.perf_counter()
+    for now, nickname, content in corpus:
+        try:
+            spam.check(nickname, content, now)
+        except SpamDetectedError as e:
+            blocked[e.reason] += 1
+    elapsed = time.perf_counter() - start
+
+    return {
+        "action": str(action),
+        "messages": len(corpus),
+        "us_per_message": elapsed * 1e6 / len(corpus),
+        **blocked,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Spam filter cost on a flood corpus")
+    parser.add_argument("--messages", type=int, default=200_000)
+    parser.add_argument("--flood-ratio", type=float, default=0.4)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.messages, args.flood_ratio, args.seed)
+    rows = [run(corpus, action) for action in SpamAction]
+    print_table("Spam filter", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+import argparse
+import asyncio
+import logging
+import socket
+import ssl
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.common import make_server, measure_fanout, print_table, server_port
+
+
+def generate_self_signed_cert(directory: Path) -> tuple[str, str]:
+    cert = directory / "cert.pem"
+    key = directory / "key.pem"
+    subprocess.run(
+        [
+            "openssl",
+            "req",
+            "-x509",
+            "-newkey",
+            "ec",
+            "-pkeyopt",
+            "ec_paramgen_curve:prime256v1",
+            "-nodes",
+            "-days",
+            "1",
+            "-subj",
+            "/CN=localhost",
+            "-keyout",
+            str(key),
+            "-out",
+            str(cert),
+        ],
+        check=True,
+        capture_output=True,
+    )
+    return str(cert), str(key)
+
+
+def client_context() -> ssl.SSLContext:
+    context = ssl.create_default_context()
+    context.check_hostname = False
+    context.verify_mode = ssl.CERT_NONE
+    return context
+
+
+def handshake(port: int, context: ssl.SSLContext, session=None):
+    with socket.create_connection(("127.0.0.1", port)) as sock:
+        with context.wrap_socket(sock, session=session) as tls:
+            tls.recv(4096)
+            return tls.session, tls.session_reused
+
+
+def measure_handshakes(port: int, rounds: int) -> list[dict]:
+    context = client_context()
+    session, _ = handshake(port, context)
+
+    results = []
+    for label, resume in (("full", False), ("resumed", True)):
+        reused = 0
+        start = time.perf_counter()
+        for _ in range(rounds):
+            new_session, was_reused = handshake(
+                port, context, session if resume else None
+            )
+            reused += was_reused
+            if resume:
+                session = new_session
+        elapsed = time.perf_counter() - start
+        results.append(
+            {
+                "handshake": label,
+                "rounds": rounds,
+                "ms_per_handshake": elapsed * 1000 / rounds,
+                "reused": reused,
+            }
+        )
+    return results
+
+
+async def run(clients: int, messages: int, rounds: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        cert, key = generate_self_signed_cert(Path(tmp))
+
+        rows = []
+        for label, kwargs, context in (
+            ("plaintext", {}, None),
+            ("tls", {"tls_cert_file": cert, "tls_key_file": key}, client_context()),
+        ):
+            server = make_server(**kwargs)
+            await server.start()
+            result = await measure_fanout(
+                server_port(server), clients, messages, context
+            )
+            rows.append({"listener": label, **result})
+
+            if context is not None:
+                handshakes = await asyncio.to_thread(
+                    measure_handshakes, server_port(server), rounds
+                )
+
+            await server.stop()
+
+    print_table("Fan-out throughput", rows)
+    print_table("TLS handshakes", handshakes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="TLS vs plaintext fan-out")
+    parser.add_argument("--clients", type=int, default=100)
+    parser.add_argument("--messages", type=int, default=200)
+    parser.add_argument("--handshakes", type=int, default=100)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.CRITICAL)
+    asyncio.run(run(args.clients, args.messages, args.handshakes))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+import asyncio
+import ssl
+import time
+
+from chatserver.network.server import Server
+
+
+def make_server(**kwargs) -> Server:
+    options = {
+        "host": "127.0.0.1",
+        "port": 0,
+        "room_name": "Bench",
+        "max_users": 10_000,
+        "enable_history": False,
+        "history_size": 50,
+        "plain_text": True,
+        "rate_limit_max_messages": 1_000_000,
+    }
+    options.update(kwargs)
+    return Server(**options)
+
+
+def server_port(server: Server) -> int:
+    return server.server.sockets[0].getsockname()[1]
+
+
+async def join(
+    port: int, nickname: str, ssl_context: ssl.SSLContext | None = None
+) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+    reader, writer = await asyncio.open_connection(
+        "127.0.0.1", port, ssl=ssl_context, limit=1 << 20
+    )
+    await reader.readuntil(b"nickname: ")
+    writer.write(f"{nickname}\n".encode())
+    await writer.drain()
+    await reader.readuntil(b"> ")
+    return reader, writer
+
+
+async def wait_for_marker(reader: asyncio.StreamReader, marker: bytes):
+    await reader.readuntil(marker)
+
+
+async def measure_fanout(
+    port: int,
+    clients: int,
+    messages: int,
+    ssl_context: ssl.SSLContext | None = None,
+) -> dict:
+    connections = [await join(port, f"user{i}", ssl_context) for i in range(clients)]
+    _, sender = connections[0]
+
+    marker = f"bench-done-{messages}".encode()
+    waiters = [
+        asyncio.create_task(wait_for_marker(reader, marker))
+        for reader, _ in connections
+    ]
+
+    start = time.perf_counter()
+    for i in range(messages):
+        sender.write(f"bench message {i}\n".encode())
+    sender.write(marker + b"\n")
+    await sender.drain()
+    await asyncio.gather(*waiters)
+    elapsed = time.perf_counter() - start
+
+    for _, writer in connections:
+        writer.close()
+
+    deliveries = clients * (messages + 1)
+    return {
+        "clients": clients,
+        "messages": messages,
+        "seconds": elapsed,
+        "deliveries_per_second": deliveries / elapsed,
+    }
+
+
+def print_table(title: str, rows: list[dict]):
+    print(f"\n{title}")
+    if not rows:
+        return
+
+    columns = list(rows[0])
+    print("  ".join(f"{col:>22}" for col in columns))
+    for row in rows:
+        cells = []
+        for col in columns:
+            value = row[col]
+            cells.append(
+                f"{value:>22.3f}" if isinstance(value, float) else f"{value!s:>22}"
+            )
+        print("  ".join(cells))
@@ -0,0 +1,359 @@
+import asyncio
+import math
+import re
+import resource
+import time
+import tracemalloc
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+from chatserver.core.client import Client
+from chatserver.core.room import Room
+
+MARKER = re.compile(rb"sim-(\d+)")
+WRITE_BUFFER_HIGH = 64 * 1024
+WRITE_BUFFER_LOW = 16 * 1024
+
+
+class VirtualTimeLoop(asyncio.SelectorEventLoop):
+    def __init__(self):
+        super().__init__()
+        self._now = 0.0
+
+    def time(self) -> float:
+        return self._now
+
+    def _run_once(self):
+        if not self._ready and self._scheduled:
+            self._now = max(self._now, self._scheduled[0]._when)
+        super()._run_once()
+
+
+@dataclass
+class LinkProfile:
+    latency: float = 0.0
+    bandwidth: float = 0.0
+    stall_at: float | None = None
+    stall_for: float = math.inf
+
+    def start_time(self, now: float, started: float) -> float:
+        if self.stall_at is None:
+            return now
+        stall_start = started + self.stall_at
+        if stall_start <= now < stall_start + self.stall_for:
+            return stall_start + self.stall_for
+        return now
+
+
+class FakeTransport:
+    def __init__(
+        self,
+        link: LinkProfile,
+        reader: asyncio.StreamReader,
+        on_arrival: Callable[[bytes, float], None] | None = None,
+    ):
+        self.link = link
+        self.reader = reader
+        self.on_arrival = on_arrival
+        self.bytes_written = 0
+
+        self._loop = asyncio.get_running_loop()
+        self._started = self._loop.time()
+        self._free_at = self._started
+        self._pending: deque[tuple[float, int]] = deque()
+        self._buffered = 0
+        self._closing = False
+        self._closed = self._loop.create_future()
+
+    def write(self, data: bytes):
+        if self._closing:
+            return
+
+        now = self._loop.time()
+        start = self.link.start_time(max(now, self._free_at), self._started)
+        if self.link.bandwidth > 0:
+            start += len(data) / self.link.bandwidth
+        self._free_at = start
+
+        self.bytes_written += len(data)
+        if start > now:
+            self._pending.append((start, len(data)))
+            self._buffered += len(data)
+
+        if self.on_arrival:
+            self.on_arrival(data, start + self.link.latency)
+
+    def get_write_buffer_size(self) -> int:
+        now = self._loop.time()
+        while self._pending and self._pending[0][0] <= now:
+            self._buffered -= self._pending.popleft()[1]
+        return self._buffered
+
+    def get_write_buffer_limits(self) -> tuple[int, int]:
+        return WRITE_BUFFER_LOW, WRITE_BUFFER_HIGH
+
+    def time_until(self, size: int) -> float:
+        buffered = self.get_write_buffer_size()
+        for complete_at, length in self._pending:
+            if buffered <= size:
+                break
+            buffered -= length
+            if buffered <= size:
+                return complete_at - self._loop.time()
+        return 0.0
+
+    def is_closing(self) -> bool:
+        return self._closing
+
+    def close(self):
+        if not self._closing:
+            self._closing = True
+            self._closed.set_result(None)
+            self.reader.feed_eof()
+
+    def abort(self):
+        self.close()
+
+    async def wait_closed(self):
+        await self._closed
+
+    def get_extra_info(self, name: str, default=None):
+        return default
+
+
+class FakeWriter:
+    def __init__(self, transport: FakeTransport):
+        self.transport = transport
+
+    def write(self, data: bytes):
+        self.transport.write(data)
+
+    def is_closing(self) -> bool:
+        return self.transport.is_closing()
+
+    async def drain(self):
+        transport = self.transport
+        while (
+            not transport.is_closing()
+            and transport.get_write_buffer_size() > WRITE_BUFFER_HIGH
+        ):
+            wait = transport.time_until(WRITE_BUFFER_LOW)
+            if math.isinf(wait):
+                await asyncio.shield(transport._closed)
+            else:
+                await asyncio.sleep(wait)
+
+    def close(self):
+        self.transport.close()
+
+    async def wait_closed(self):
+        await self.transport.wait_closed()
+
+    def get_extra_info(self, name: str, default=None):
+        return self.transport.get_extra_info(name, default)
+
+
+@dataclass
+class SimulationConfig:
+    clients: int = 1000
+    senders: int = 1
+    messages: int = 100
+    rate: float = 0.0
+    message_size: int = 32
+    links: list[tuple[float, LinkProfile]] = field(
+        default_factory=lambda: [(1.0, LinkProfile())]
+    )
+    probe_every: int = 100
+    stall_timeout: float = 30.0
+    virtual_time: bool = False
+    trace_memory: bool = False
+    fanout_shards: int = 4
+
+    def link_for(self, index: int) -> LinkProfile:
+        position = index / max(self.clients, 1)
+        total = 0.0
+        for fraction, link in self.links:
+            total += fraction
+            if position < total:
+                return link
+        return self.links[-1][1]
+
+
+@dataclass
+class SimulationReport:
+    clients: int = 0
+    messages: int = 0
+    sim_seconds: float = 0.0
+    wall_seconds: float = 0.0
+    deliveries: int = 0
+    peak_memory_mb: float = 0.0
+    dropped: int = 0
+    undelivered: int = 0
+    fanout: dict = field(default_factory=dict)
+    arrivals: list[float] = field(default_factory=list, repr=False)
+
+    def arrival_ms(self) -> dict:
+        arrivals = sorted(self.arrivals)
+
+        def percentile(fraction: float) -> float:
+            if not arrivals:
+                return 0.0
+            index = min(int(len(arrivals) * fraction), len(arrivals) - 1)
+            return round(arrivals[index] * 1000, 3)
+
+        return {
+            "p50": percentile(0.5),
+            "p99": percentile(0.99),
+            "max": round(arrivals[-1] * 1000, 3) if arrivals else 0.0,
+        }
+
+    def summary(self) -> dict:
+        wall = max(self.wall_seconds, 1e-9)
+        return {
+            "clients": self.clients,
+            "messages": self.messages,
+            "sim_seconds": round(self.sim_seconds, 3),
+            "wall_seconds": round(self.wall_seconds, 3),
+            "deliveries": self.deliveries,
+            "deliveries_per_second": round(self.deliveries / wall, 1),
+            "fanout_ms": self.fanout["latency_ms"],
+            "arrival_ms": self.arrival_ms(),
+            "peak_memory_mb": round(self.peak_memory_mb, 1),
+            "dropped": self.dropped,
+            "undelivered": self.undelivered,
+        }
+
+
+@dataclass
+class Simulation:
+    config: SimulationConfig
+
+    room: Room = field(init=False)
+    clients: list[Client] = field(default_factory=list, init=False)
+    report: SimulationReport = field(default_factory=SimulationReport, init=False)
+
+    _sent_at: dict[int, float] = field(default_factory=dict, init=False, repr=False)
+    _posted: int = field(default=0, init=False, repr=False)
+    _tasks: list[asyncio.Task] = field(default_factory=list, init=False, repr=False)
+
+    def __post_init__(self):
+        self.room = Room(
+            name="Simulation",
+            max_users=self.config.clients,
+            enable_history=False,
+            history_size=50,
+            plain_text=True,
+            rate_limit_max_messages=1_000_000_000,
+            fanout_shards=self.config.fanout_shards,
+        )
+        self.room.add_listener(self._on_message)
+
+    def _on_message(self, msg):
+        if not msg.is_system and MARKER.match(msg.content.encode()):
+            self._posted += 1
+
+    def _on_arrival(self, data: bytes, arrival: float):
+        for match in MARKER.finditer(data):
+            sent_at = self._sent_at.get(int(match.group(1)))
+            if sent_at is None:
+                continue
+            if math.isinf(arrival):
+                self.report.undelivered += 1
+            else:
+                self.report.arrivals.append(arrival - sent_at)
+
+    def _connect(self, index: int) -> Client:
+        reader = asyncio.StreamReader()
+        reader.feed_data(f"user{index}\n".encode())
+        probe = self.config.probe_every and index % self.config.probe_every == 0
+        transport = FakeTransport(
+            self.config.link_for(index),
+            reader,
+            self._on_arrival if probe else None,
+        )
+        return Client(reader, FakeWriter(transport), self.room)
+
+    async def _settle(self):
+        room = self.room
+        while room.queue_depth or room.broadcasts < room.last_seq:
+            await asyncio.sleep(0.001)
+
+    async def _watch_stalls(self):
+        timeout = self.config.stall_timeout
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(min(timeout / 2, 5.0))
+            now = loop.time()
+            for client in self.clients:
+                transport = client.writer.transport
+                if transport.is_closing():
+                    continue
+                if transport.get_write_buffer_size() <= WRITE_BUFFER_HIGH:
+                    client.stalled_since = 0.0
+                elif not client.stalled_since:
+                    client.stalled_since = now
+                elif now - client.stalled_since >= timeout:
+                    self.report.dropped += 1
+                    client.quitting = True
+                    transport.abort()
+
+    async def run(self) -> SimulationReport:
+        config = self.config
+        loop = asyncio.get_running_loop()
+        if config.trace_memory:
+            tracemalloc.start()
+
+        self.room.start()
+        for index in range(config.clients):
+            client = self._connect(index)
+            if await client.initialize():
+                self.clients.append(client)
+                self._tasks.append(asyncio.create_task(client.handle()))
+
+        watchdog = asyncio.create_task(self._watch_stalls())
+        await self._settle()
+        self.room.fanout_latencies.clear()
+        deliveries = self.room.deliveries
+        started, wall_started = loop.time(), time.perf_counter()
+
+        senders = self.clients[: max(config.senders, 1)]
+        for n in range(config.messages):
+            self._sent_at[n] = loop.time()
+            line = f"sim-{n} ".ljust(config.message_size, "x")
+            senders[n % len(senders)].reader.feed_data(f"{line}\n".encode())
+            await asyncio.sleep(1 / config.rate if config.rate > 0 else 0)
+
+        while self._posted < config.messages and any(
+            not sender.writer.is_closing() for sender in senders
+        ):
+            await asyncio.sleep(0.001)
+        await self._settle()
+
+        self.report.sim_seconds = loop.time() - started
+        self.report.wall_seconds = time.perf_counter() - wall_started
+        self.report.clients = len(self.clients)
+        self.report.messages = config.messages
+        self.report.deliveries = self.room.deliveries - deliveries
+        self.report.fanout = self.room.fanout_stats()
+
+        if config.trace_memory:
+            self.report.peak_memory_mb = tracemalloc.get_traced_memory()[1] / 2**20
+            tracemalloc.stop()
+        else:
+            maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            self.report.peak_memory_mb = maxrss / 1024
+
+        watchdog.cancel()
+        for client in self.clients:
+            client.quitting = True
+            client.reader.feed_eof()
+        await asyncio.gather(watchdog, *self._tasks, return_exceptions=True)
+        await self.room.stop()
+        return self.report
+
+
+def run_simulation(config: SimulationConfig) -> SimulationReport:
+    loop_factory = VirtualTimeLoop if config.virtual_time else None
+    with asyncio.Runner(loop_factory=loop_factory) as runner:
+        return runner.run(Simulation(config).run())
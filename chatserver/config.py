@@ -1,5 +1,4 @@
-from functools import lru_cache
-
+from pydantic import NonNegativeFloat, NonNegativeInt, PositiveFloat, PositiveInt
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -12,21 +11,113 @@ class Settings(BaseSettings):
     )
 
     host: str = "0.0.0.0"
-    port: int = 2323
+    port: NonNegativeInt = 2323
     room_name: str = "Chat Room"
-    max_users: int = 10
+    max_users: PositiveInt = 10
     enable_history: bool = False
-    history_size: int = 50
+    history_size: PositiveInt = 50
+    history_join_tail: NonNegativeInt = 20
+    fanout_shards: PositiveInt = 4
+    spectator_max_buffer: PositiveInt = 262144
+    presence_window: NonNegativeFloat = 2.0
+    presence_burst: NonNegativeInt = 3
+    mention_history: NonNegativeInt = 20
+    mention_bell: bool = False
+    digest_max_lines: PositiveInt = 100
     plain_text: bool = False
     log_level: str = "INFO"
+    loop_backend: str = "asyncio"
+    eager_tasks: bool = False
+
+    max_message_length: PositiveInt = 1000
+    rate_limit_max_messages: PositiveInt = 5
+    rate_limit_window_seconds: PositiveInt = 5
+    max_nickname_len: PositiveInt = 20
+    min_nickname_len: PositiveInt = 2
+    resume_grace_seconds: NonNegativeInt = 60
+
+    spam_action: str = "off"
+    spam_duplicate_window_seconds: PositiveFloat = 10.0
+    spam_duplicate_threshold: PositiveInt = 3
+    spam_min_length: NonNegativeInt = 10
+    spam_burst_window_seconds: PositiveFloat = 2.0
+    spam_burst_threshold: PositiveInt = 30
+    spam_penalty_seconds: NonNegativeFloat = 30.0
+    spam_slow_mode_interval: NonNegativeFloat = 2.0
+
+    admin_socket: str = ""
+
+    machine_port: NonNegativeInt = 0
+    machine_tokens: list[str] = []
+    machine_rate_per_second: PositiveFloat = 50.0
+    machine_burst: PositiveInt = 500
+
+    monitor_enabled: bool = True
+    monitor_interval: PositiveFloat = 0.5
+    monitor_slow_callback_ms: NonNegativeFloat = 100.0
+    monitor_callback_timing: bool = False
+    monitor_gc_pause_ms: NonNegativeFloat = 50.0
+
+    tls_cert_file: str = ""
+    tls_key_file: str = ""
+    tls_handshake_timeout: PositiveFloat = 5.0
+    tls_session_tickets: NonNegativeInt = 2
+
+    node_id: str = ""
+    mesh_host: str = "127.0.0.1"
+    mesh_port: NonNegativeInt = 0
+    mesh_peers: list[str] = []
+    mesh_seen_size: PositiveInt = 10000
+    mesh_queue_size: PositiveInt = 1000
+    mesh_secret: str = ""
 
-    max_message_length: int = 1000
-    rate_limit_max_messages: int = 5
-    rate_limit_window_seconds: int = 5
-    max_nickname_len: int = 20
-    min_nickname_len: int = 2
+    capture_file: str = ""
+    capture_anonymize: bool = False
+
+    tcp_nodelay: bool = True
+    tcp_keepalive: bool = True
+    tcp_keepidle: NonNegativeInt = 60
+    tcp_keepintvl: NonNegativeInt = 10
+    tcp_keepcnt: NonNegativeInt = 5
+    socket_sndbuf: NonNegativeInt = 0
+    socket_rcvbuf: NonNegativeInt = 0
+    listen_backlog: PositiveInt = 100
+    write_buffer_high: NonNegativeInt = 0
+    write_buffer_low: NonNegativeInt = 0
+    write_stall_timeout: NonNegativeFloat = 30.0
+
+    overload_enabled: bool = True
+    overload_interval: PositiveFloat = 1.0
+    overload_queue_slow: PositiveInt = 500
+    overload_queue_shed: PositiveInt = 2000
+    overload_latency_slow_ms: NonNegativeFloat = 250.0
+    overload_latency_shed_ms: NonNegativeFloat = 1000.0
+    overload_lag_slow_ms: NonNegativeFloat = 100.0
+    overload_lag_shed_ms: NonNegativeFloat = 500.0
+    overload_recover_intervals: PositiveInt = 3
+
+    archive_dir: str = ""
+    archive_segment_bytes: PositiveInt = 64 * 1024 * 1024
+    archive_flush_interval: PositiveFloat = 1.0
+    archive_batch_size: PositiveInt = 500
+    replication_socket: str = ""
+    replication_queue_size: PositiveInt = 10000
+    standby: bool = False
+    failover_seconds: NonNegativeFloat = 3.0
+
+
+_settings: Settings | None = None
 
 
-@lru_cache
 def get_settings() -> Settings:
-    return Settings()
+    global _settings
+    if _settings is None:
+        _settings = Settings()
+    return _settings
+
+
+def reload_settings() -> Settings:
+    global _settings
+    settings = Settings()
+    _settings = settings
+    return settings
@@ -0,0 +1,194 @@
+import asyncio
+import gzip
+import json
+import logging
+import os
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from chatserver.core.message import Message
+from chatserver.core.room import Room
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_SUFFIX = ".jsonl.gz"
+INDEX_SUFFIX = ".idx"
+
+
+def archive_record(msg: Message) -> dict:
+    return {**msg.to_dict(), "seq": msg.seq}
+
+
+def segment_name(msg: Message) -> str:
+    return f"{msg.timestamp:%Y%m%d-%H%M%S}-{msg.seq:010d}{SEGMENT_SUFFIX}"
+
+
+@dataclass
+class IndexEntry:
+    offset: int
+    length: int
+    first_seq: int
+    last_seq: int
+    first_ts: str
+    last_ts: str
+
+    def overlaps(self, since: datetime | None, until: datetime | None) -> bool:
+        if since and datetime.fromisoformat(self.last_ts) < since:
+            return False
+        if until and datetime.fromisoformat(self.first_ts) > until:
+            return False
+        return True
+
+
+@dataclass
+class Archiver:
+    room: Room
+    directory: str
+    segment_bytes: int = 64 * 1024 * 1024
+    flush_interval: float = 1.0
+    batch_size: int = 500
+
+    archived: int = field(default=0, init=False)
+    failures: int = field(default=0, init=False)
+    segment: str = field(default="", init=False)
+
+    _pending: list[Message] = field(default_factory=list, init=False, repr=False)
+    _wakeup: asyncio.Event = field(default_factory=asyncio.Event, init=False)
+    _stopping: bool = field(default=False, init=False, repr=False)
+    _task: asyncio.Task | None = field(default=None, init=False, repr=False)
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    async def start(self):
+        os.makedirs(self.directory, exist_ok=True)
+        self.room.add_listener(self._on_room_message)
+        self._task = asyncio.create_task(self._run())
+        logger.info(f"Archiving messages to {self.directory}")
+
+    async def stop(self):
+        self.room.remove_listener(self._on_room_message)
+        if self._task:
+            self._stopping = True
+            self._wakeup.set()
+            await self._task
+            self._task = None
+
+    def _on_room_message(self, msg: Message):
+        self._pending.append(msg)
+        if len(self._pending) >= self.batch_size:
+            self._wakeup.set()
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+            pending, self._pending = self._pending, []
+            written = await self._flush(pending)
+            if written < len(pending):
+                self._pending[:0] = pending[written:]
+                if self._stopping:
+                    logger.error(
+                        f"Archive stopped with {self.pending} messages unwritten"
+                    )
+                    return
+                await asyncio.sleep(self.flush_interval)
+                continue
+
+            if self._stopping:
+                return
+
+    async def _flush(self, pending: list[Message]) -> int:
+        for start in range(0, len(pending), self.batch_size):
+            batch = pending[start : start + self.batch_size]
+            try:
+                await asyncio.to_thread(self._write_batch, batch)
+            except Exception as e:
+                self.failures += 1
+                self.segment = ""
+                logger.error(
+                    f"Failed to archive {len(pending) - start} messages, "
+                    f"will retry: {e}"
+                )
+                return start
+            self.archived += len(batch)
+        return len(pending)
+
+    def _write_batch(self, batch: list[Message]):
+        path = os.path.join(self.directory, self.segment) if self.segment else ""
+        if (
+            not path
+            or not os.path.exists(path)
+            or os.path.getsize(path) >= self.segment_bytes
+        ):
+            os.makedirs(self.directory, exist_ok=True)
+            self.segment = segment_name(batch[0])
+            path = os.path.join(self.directory, self.segment)
+
+        lines = [json.dumps(archive_record(msg), ensure_ascii=False) for msg in batch]
+        member = gzip.compress(("\n".join(lines) + "\n").encode("utf-8"), mtime=0)
+
+        with open(path, "ab") as segment:
+            offset = segment.tell()
+            segment.write(member)
+
+        entry = IndexEntry(
+            offset=offset,
+            length=len(member),
+            first_seq=batch[0].seq,
+            last_seq=batch[-1].seq,
+            first_ts=batch[0].timestamp.isoformat(),
+            last_ts=batch[-1].timestamp.isoformat(),
+        )
+        with open(path.removesuffix(SEGMENT_SUFFIX) + INDEX_SUFFIX, "a") as index:
+            index.write(json.dumps(entry.__dict__) + "\n")
+
+    def stats(self) -> dict:
+        return {
+            "archived": self.archived,
+            "pending": self.pending,
+            "failures": self.failures,
+            "segment": self.segment,
+        }
+
+
+def read_index(path: str) -> list[IndexEntry]:
+    with open(path) as index:
+        return [IndexEntry(**json.loads(line)) for line in index if line.strip()]
+
+
+def export_range(
+    directory: str, since: datetime | None = None, until: datetime | None = None
+) -> Iterator[dict]:
+    for name in sorted(os.listdir(directory)):
+        if not name.endswith(INDEX_SUFFIX):
+            continue
+
+        base = os.path.join(directory, name.removesuffix(INDEX_SUFFIX))
+        if not os.path.exists(base + SEGMENT_SUFFIX):
+            continue
+        entries = [
+            e for e in read_index(base + INDEX_SUFFIX) if e.overlaps(since, until)
+        ]
+        if not entries:
+            continue
+
+        with open(base + SEGMENT_SUFFIX, "rb") as segment:
+            for entry in entries:
+                segment.seek(entry.offset)
+                data = gzip.decompress(segment.read(entry.length))
+
+                for line in data.decode("utf-8").splitlines():
+                    record = json.loads(line)
+                    timestamp = datetime.fromisoformat(record["timestamp"])
+                    if since and timestamp < since:
+                        continue
+                    if until and timestamp > until:
+                        continue
+                    yield record
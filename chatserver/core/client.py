@@ -1,10 +1,11 @@
 import asyncio
 import logging
+import time
+from collections import deque
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import TYPE_CHECKING
 
-from chatserver.config import get_settings
 from chatserver.ui.constants import (
     CURSOR_UP,
     CLEAR_LINE,
@@ -13,45 +14,79 @@ from chatserver.ui.constants import (
 )
 from chatserver.core.validators import validate_nickname
 from chatserver.core.exceptions import (
+    InvalidResumeTokenError,
     NicknameTakenError,
     MessageTooLongError,
     RateLimitError,
     RoomFullError,
+    SpamDetectedError,
 )
 from chatserver.ui.banner import BANNER
-from chatserver.ui.formatter import Formatter
+from chatserver.ui.formatter import Formatter, TerminalProfile, shared_formatter
 from chatserver.core.message import Message
+from chatserver.core.overload import LoadLevel
 
 if TYPE_CHECKING:
     from chatserver.core.room import Room
 
 logger = logging.getLogger(__name__)
 
-settings = get_settings()
+HISTORY_PAGE_SIZE = 20
+MAX_HISTORY_PAGE_SIZE = 200
+ROSTER_MATCH_LIMIT = 100
+BELL = b"\a"
+MIN_DIGEST_SECONDS = 1.0
+MAX_DIGEST_SECONDS = 3600.0
+DIGEST_FORMATTER = shared_formatter(TerminalProfile.PLAIN)
 
 
-@dataclass
+@dataclass(eq=False, slots=True)
 class Client:
     reader: asyncio.StreamReader
     writer: asyncio.StreamWriter
     room: "Room"
 
     nickname: str = field(default="")
+    address: str = field(default="")
     formatter: Formatter = field(init=False)
+    connected_at: float = field(default_factory=time.monotonic, init=False)
+    last_activity: float = field(default=0.0, init=False)
+    messages_sent: int = field(default=0, init=False)
     full_room_rejection: bool = field(default=False, init=False)
-    message_timestamps: list[datetime] = field(default_factory=list, init=False)
-    _write_lock: asyncio.Lock = field(
-        default_factory=asyncio.Lock, init=False, repr=False
+    resume_token: str = field(default="", init=False, repr=False)
+    resumed_from: int | None = field(default=None, init=False)
+    last_seq: int = field(default=0, init=False)
+    quitting: bool = field(default=False, init=False)
+    spectating: bool = field(default=False, init=False)
+    mention_bell: bool = field(default=False, init=False)
+    digest_interval: float = field(default=0.0, init=False)
+    stalled_since: float = field(default=0.0, init=False)
+    _sent_times: list[float] | None = field(default=None, init=False, repr=False)
+    _write_lock: asyncio.Lock | None = field(default=None, init=False, repr=False)
+    _digest: deque[tuple[int, bytes]] | None = field(
+        default=None, init=False, repr=False
     )
+    _digest_skipped: int = field(default=0, init=False, repr=False)
+    _digest_task: asyncio.Task | None = field(default=None, init=False, repr=False)
 
     def __post_init__(self):
-        self.formatter = Formatter(plain_text=self.room.plain_text)
+        self.formatter = shared_formatter(
+            TerminalProfile.PLAIN if self.room.plain_text else TerminalProfile.ANSI256
+        )
+        self.last_activity = self.connected_at
+        self.mention_bell = self.room.mention_bell
 
     async def initialize(self) -> bool:
         try:
             if not await self._request_nickname():
                 return False
 
+            if self.spectating:
+                return await self._start_spectating()
+
+            if self.resumed_from is not None:
+                return await self._resume_session()
+
             await self.room.join(self)
 
             if self.full_room_rejection:
@@ -63,12 +98,49 @@ class Client:
                 return False
 
             await self._send_history()
+            await self._send_resume_token()
 
             return True
         except Exception as e:
             logger.error(f"Error initializing client: {e}")
             return False
 
+    async def _resume_session(self) -> bool:
+        if not await self.room.rejoin(self):
+            await self._write(f"{RoomFullError()}\r\n")
+            return False
+
+        logger.info(f"{self.nickname} resumed session")
+        since = self.resumed_from
+        self.resumed_from = self.room.last_seq
+
+        replay = [self._system_message(f"Welcome back, {self.nickname}!")]
+        first_seq = self.room.history.first_seq
+        if self.resumed_from > since and (first_seq is None or first_seq > since + 1):
+            replay.append(
+                self._system_message(
+                    "Some messages were missed and are no longer available."
+                )
+            )
+        replay.extend(self.room.get_history_since(since))
+
+        self.writer.write(b"".join(self._render(msg) for msg in replay))
+        await self.drain()
+        self._mark_sent(self.resumed_from)
+
+        await self._send_resume_token()
+        return True
+
+    async def _send_resume_token(self):
+        if self.room.resume_grace_seconds <= 0:
+            return
+
+        self.resume_token = self.room.issue_resume_token(self.nickname)
+        await self.send_system_message(
+            f"Resume token: {self.resume_token} "
+            f"(enter /resume {self.resume_token} at the nickname prompt to reconnect)"
+        )
+
     async def _request_nickname(self) -> bool:
         try:
             welcome = self.formatter.format_title("Welcome to MeshChat")
@@ -83,6 +155,21 @@ class Client:
 
                 nickname = line.decode("utf-8", errors="ignore").strip()
 
+                if nickname == "/spectate":
+                    self.spectating = True
+                    return True
+
+                if nickname.startswith("/resume "):
+                    session = self.room.resume(nickname.split(" ", 1)[1].strip())
+                    if session is None:
+                        await self._write(f"{InvalidResumeTokenError()}\r\n")
+                        continue
+
+                    self.nickname = session.nickname
+                    self.resumed_from = session.last_seq
+                    self.last_seq = session.last_seq
+                    return True
+
                 try:
                     validate_nickname(nickname)
                 except Exception as e:
@@ -100,6 +187,16 @@ class Client:
             logger.error(f"Error requesting nickname: {e}")
             return False
 
+    async def _start_spectating(self) -> bool:
+        colored_banner = self.formatter.format_banner(BANNER)
+        await self._write(f"{colored_banner}\r\n")
+        await self.send_system_message(
+            f"You are spectating {self.room.name}. Input is ignored; "
+            "disconnect to leave."
+        )
+        await self._send_history()
+        return True
+
     async def _send_welcome_message(self) -> bool:
         try:
             colored_banner = self.formatter.format_banner(BANNER)
@@ -116,14 +213,19 @@ class Client:
             return False
 
     async def _send_history(self):
-        history = self.room.get_history()
-        if not history:
+        if not self.room.history or self.room.history_join_tail <= 0:
+            return
+
+        if self.room.load_level >= LoadLevel.SHED:
+            await self.send_system_message(
+                "The server is busy, so recent history was skipped. Use /history later."
+            )
             return
 
         header = self.formatter.format_system_message("--- Recent messages ---")
         await self._write(f"{header}\r\n")
 
-        for msg in history:
+        for msg in self.room.get_history_tail(self.room.history_join_tail):
             await self.send_message(msg)
 
         footer = self.formatter.format_system_message("--- End of history ---")
@@ -142,7 +244,9 @@ class Client:
                 if not line:
                     break
 
+                self.last_activity = time.monotonic()
                 message = line.decode("utf-8", errors="ignore").strip()
+                logger.debug(f"Received {len(line)} bytes from {self.nickname}")
 
                 await self._clear_input_line()
 
@@ -150,8 +254,10 @@ class Client:
                     await self._show_prompt()
                     continue
 
-                if len(message) > settings.max_message_length:
-                    await self.send_system_message(str(MessageTooLongError()))
+                if len(message) > self.room.max_message_length:
+                    await self.send_system_message(
+                        str(MessageTooLongError(self.room.max_message_length))
+                    )
                     await self._show_prompt()
                     continue
 
@@ -166,7 +272,7 @@ class Client:
                 if message.startswith("/"):
                     await self._handle_command(message)
                 else:
-                    await self.room.broadcast(
+                    await self._post(
                         Message(
                             from_user=self.nickname,
                             content=message,
@@ -179,37 +285,82 @@ class Client:
         except Exception as e:
             logger.error(f"Error handling client {self.nickname}: {e}")
         finally:
-            await self.room.leave(self)
+            if self.resume_token and not self.quitting:
+                await self.room.suspend(self)
+            else:
+                await self.room.leave(self)
             await self.close()
 
     async def _clear_input_line(self):
-        if not self.room.plain_text:
+        if not self.formatter.plain_text and self._digest is None:
             await self._write(f"{CURSOR_UP}{CLEAR_LINE}{CURSOR_TO_START}")
 
     async def _show_prompt(self):
-        await self._write(INPUT_PROMPT)
+        if self._digest is None:
+            await self._write(INPUT_PROMPT)
 
     def _check_rate_limit(self):
-        now = datetime.now()
-        self.message_timestamps.append(now)
+        now = time.monotonic()
+        sent = self._sent_times or []
+        sent.append(now)
 
-        cutoff = now - timedelta(seconds=settings.rate_limit_window_seconds)
-        self.message_timestamps = [ts for ts in self.message_timestamps if ts > cutoff]
+        cutoff = now - self.room.rate_limit_window_seconds
+        sent = [ts for ts in sent if ts > cutoff]
+        self._sent_times = sent or None
 
-        if len(self.message_timestamps) > settings.rate_limit_max_messages:
+        if len(sent) > self.room.effective_rate_limit:
             raise RateLimitError()
 
+    async def _post(self, msg: Message):
+        spam_filter = self.room.spam_filter
+        if spam_filter is not None:
+            try:
+                spam_filter.check(self.nickname, msg.content)
+            except SpamDetectedError as e:
+                logger.debug(f"Blocked message from {self.nickname}: {e.reason}")
+                await self.send_system_message(str(e))
+                return
+
+        self.messages_sent += 1
+        await self.room.broadcast(msg)
+
+    @property
+    def idle_seconds(self) -> float:
+        return time.monotonic() - self.last_activity
+
+    @property
+    def write_buffer_size(self) -> int:
+        transport = self.writer.transport
+        if transport is None or transport.is_closing():
+            return 0
+        return transport.get_write_buffer_size()
+
+    @property
+    def read_buffer_size(self) -> int:
+        return len(getattr(self.reader, "_buffer", b""))
+
+    def stats(self) -> dict:
+        return {
+            "nickname": self.nickname,
+            "address": self.address,
+            "connected_seconds": round(time.monotonic() - self.connected_at, 3),
+            "idle_seconds": round(self.idle_seconds, 3),
+            "messages_sent": self.messages_sent,
+            "read_buffer": self.read_buffer_size,
+            "write_buffer": self.write_buffer_size,
+        }
+
     async def _handle_command(self, cmd: str):
         parts = cmd.split(" ", 1)
         command = parts[0].lower()
 
         if command == "/who":
-            await self._show_user_list()
+            await self._show_user_list(parts[1].strip() if len(parts) > 1 else "")
         elif command == "/me":
             if len(parts) < 2 or not parts[1].strip():
                 await self.send_system_message("Usage: /me <action>")
             else:
-                await self.room.broadcast(
+                await self._post(
                     Message(
                         from_user=self.nickname,
                         content=parts[1],
@@ -217,9 +368,18 @@ class Client:
                         is_action=True,
                     )
                 )
+        elif command == "/history":
+            await self._show_history(parts[1] if len(parts) > 1 else "")
+        elif command == "/mentions":
+            await self._show_mentions(parts[1] if len(parts) > 1 else "")
+        elif command == "/digest":
+            await self._set_digest(parts[1] if len(parts) > 1 else "")
+        elif command == "/mode":
+            await self._set_mode(parts[1] if len(parts) > 1 else "")
         elif command == "/help":
             await self._show_help()
         elif command == "/quit":
+            self.quitting = True
             await self.send_system_message("Goodbye!")
             await self.close()
         else:
@@ -227,49 +387,254 @@ class Client:
                 "Unknown command. Type /help for available commands."
             )
 
-    async def _show_user_list(self):
-        users = self.room.get_user_list()
+    async def _show_user_list(self, prefix: str):
+        roster = self.room.roster
+        if not prefix:
+            await self._send(
+                roster.render(self.formatter, self.room.name, self.room.max_users)
+            )
+            return
+
+        users = roster.prefix(prefix, limit=ROSTER_MATCH_LIMIT)
         msg = self.formatter.format_user_list(
-            self.room.name, users, self.room.max_users
+            self.room.name, users, self.room.max_users, match=prefix
         )
         await self._write(f"{msg}\r\n")
 
+    async def _show_history(self, args: str):
+        if not self.room.enable_history:
+            await self.send_system_message("History is disabled in this room.")
+            return
+
+        tokens = args.split()
+        try:
+            if tokens and tokens[0].lower() == "before":
+                before = int(tokens[1])
+                count = int(tokens[2]) if len(tokens) > 2 else HISTORY_PAGE_SIZE
+            else:
+                before = None
+                count = int(tokens[0]) if tokens else HISTORY_PAGE_SIZE
+        except (IndexError, ValueError):
+            await self.send_system_message(
+                "Usage: /history [count] or /history before <seq> [count]"
+            )
+            return
+
+        count = min(max(count, 0), MAX_HISTORY_PAGE_SIZE)
+        if before is None:
+            messages = self.room.get_history_tail(count)
+        else:
+            messages = self.room.get_history_before(before, count)
+
+        lines = [
+            f"#{msg.seq} {self.formatter.format_message(msg)}\r\n" for msg in messages
+        ]
+        if not lines:
+            await self.send_system_message("No messages in that range.")
+            return
+
+        await self._write("".join(lines))
+
+    async def _show_mentions(self, args: str):
+        tokens = args.lower().split()
+        if tokens and tokens[0] == "bell":
+            if len(tokens) > 1 and tokens[1] in ("on", "off"):
+                self.mention_bell = tokens[1] == "on"
+            state = "on" if self.mention_bell else "off"
+            await self.send_system_message(f"Mention bell is {state}.")
+            return
+
+        try:
+            count = int(tokens[0]) if tokens else self.room.mention_history
+        except ValueError:
+            await self.send_system_message(
+                "Usage: /mentions [count] or /mentions bell [on|off]"
+            )
+            return
+
+        lines = [
+            f"#{msg.seq} {self.formatter.format_message(msg)}\r\n"
+            for msg in self.room.get_mentions(self.nickname, count)
+        ]
+        if not lines:
+            await self.send_system_message("Nobody has mentioned you yet.")
+            return
+
+        await self._write("".join(lines))
+
+    async def _set_digest(self, args: str):
+        arg = args.strip().lower()
+        if arg in ("off", "0"):
+            await self._stop_digest()
+            await self.send_system_message("Digest mode off.")
+            return
+
+        try:
+            seconds = float(arg)
+            if not MIN_DIGEST_SECONDS <= seconds <= MAX_DIGEST_SECONDS:
+                raise ValueError(seconds)
+        except ValueError:
+            state = (
+                f"every {self.digest_interval:g}s"
+                if self._digest is not None
+                else "off"
+            )
+            await self.send_system_message(
+                f"Usage: /digest <{MIN_DIGEST_SECONDS:g}-{MAX_DIGEST_SECONDS:g} "
+                f"seconds> or /digest off (currently {state})"
+            )
+            return
+
+        if self._digest is None:
+            self._digest = deque(maxlen=max(self.room.digest_max_lines, 1))
+        if self._digest_task:
+            self._digest_task.cancel()
+        self.digest_interval = seconds
+        self._digest_task = asyncio.create_task(self._run_digest())
+
+        await self.send_system_message(
+            f"Digest mode on: new messages arrive every {seconds:g}s in one block."
+        )
+
+    async def _run_digest(self):
+        while True:
+            await asyncio.sleep(self.digest_interval)
+            await self._flush_digest()
+
+    async def _flush_digest(self):
+        if not self._digest:
+            return
+
+        entries = list(self._digest)
+        skipped = self._digest_skipped
+        self._digest.clear()
+        self._digest_skipped = 0
+
+        header = f"--- {len(entries) + skipped} new messages ---\r\n"
+        if skipped:
+            header += f"({skipped} older messages skipped, see /history)\r\n"
+        await self._send(header.encode("utf-8") + b"".join(data for _, data in entries))
+        self._mark_sent(entries[-1][0])
+
+    async def _stop_digest(self):
+        if self._digest_task:
+            self._digest_task.cancel()
+            self._digest_task = None
+        if self._digest is not None:
+            await self._flush_digest()
+            self._digest = None
+        self.digest_interval = 0.0
+
+    async def _set_mode(self, args: str):
+        tokens = args.split()
+        try:
+            profile = TerminalProfile(tokens[0].lower())
+            width = int(tokens[1]) if len(tokens) > 1 else 0
+            if width < 0:
+                raise ValueError(width)
+        except (IndexError, ValueError):
+            modes = ", ".join(p.value for p in TerminalProfile)
+            await self.send_system_message(f"Usage: /mode <{modes}> [width]")
+            return
+
+        self.formatter = shared_formatter(profile, width)
+        wrap = f", wrapped at {width} columns" if width else ""
+        await self.send_system_message(f"Display mode set to {profile.value}{wrap}.")
+
     async def _show_help(self):
         help_msg = self.formatter.format_help()
         await self._write(f"{help_msg}\r\n")
 
-    async def send_system_message(self, content: str):
-        msg = Message(
+    def _system_message(self, content: str) -> Message:
+        return Message(
             from_user="System",
             content=content,
             timestamp=datetime.now(),
             is_system=True,
         )
-        await self.send_message(msg)
+
+    def _render(self, msg: Message) -> bytes:
+        return self.room.render_cache.render(
+            msg, self.formatter, self.nickname in msg.mentions
+        )
+
+    async def send_system_message(self, content: str):
+        await self.send_message(self._system_message(content))
 
     async def send_message(self, msg: Message):
-        time_str = msg.timestamp.strftime("%H:%M:%S")
+        await self._send(self._render(msg))
+        self._mark_sent(msg.seq)
+
+    def _mark_sent(self, seq: int):
+        if (
+            seq > self.last_seq
+            and not self.writer.is_closing()
+            and not self.writer.transport.get_write_buffer_size()
+        ):
+            self.last_seq = seq
+
+    def deliver(self, msg: Message) -> bool:
+        if self.resumed_from is not None and msg.seq <= self.resumed_from:
+            return False
 
-        if msg.is_system:
-            formatted = self.formatter.format_system_message(msg.content)
-        elif msg.is_action:
-            formatted = self.formatter.format_action_message(msg.from_user, msg.content)
-        else:
-            formatted = self.formatter.format_user_message(
-                msg.from_user, msg.content, time_str
+        if self.writer.is_closing():
+            return False
+
+        if self._digest is not None:
+            if len(self._digest) == self._digest.maxlen:
+                self._digest_skipped += 1
+            self._digest.append(
+                (
+                    msg.seq,
+                    self.room.render_cache.render(
+                        msg, DIGEST_FORMATTER, self.nickname in msg.mentions
+                    ),
+                )
             )
+            return False
 
-        await self._write(f"{formatted}\r\n")
+        if self.nickname in msg.mentions:
+            self.writer.write(self.room.render_cache.render(msg, self.formatter, True))
+            if self.mention_bell:
+                self.writer.write(BELL)
+        else:
+            self.writer.write(self.room.render_cache.render(msg, self.formatter))
+
+        transport = self.writer.transport
+        buffered = transport.get_write_buffer_size()
+        if not buffered:
+            self.last_seq = msg.seq
+        return buffered > transport.get_write_buffer_limits()[1]
+
+    @property
+    def write_lock(self) -> asyncio.Lock:
+        if self._write_lock is None:
+            self._write_lock = asyncio.Lock()
+        return self._write_lock
+
+    async def drain(self):
+        async with self.write_lock:
+            try:
+                await self.writer.drain()
+            except Exception as e:
+                logger.error(f"Error writing to {self.nickname}: {e}")
 
     async def _write(self, data: str):
-        async with self._write_lock:
+        await self._send(data.encode("utf-8"))
+
+    async def _send(self, data: bytes):
+        async with self.write_lock:
             try:
-                self.writer.write(data.encode("utf-8"))
+                self.writer.write(data)
                 await self.writer.drain()
             except Exception as e:
                 logger.error(f"Error writing to {self.nickname}: {e}")
 
     async def close(self):
+        if self._digest_task:
+            self._digest_task.cancel()
+            self._digest_task = None
+
         try:
             self.writer.close()
             await self.writer.wait_closed()
@@ -3,9 +3,6 @@ from dataclasses import dataclass
 from chatserver.config import get_settings
 
 
-settings = get_settings()
-
-
 @dataclass
 class NicknameEmptyError(Exception):
     def __str__(self):
@@ -15,12 +12,14 @@ class NicknameEmptyError(Exception):
 @dataclass
 class NicknameTooShortError(Exception):
     def __str__(self):
+        settings = get_settings()
         return f"Nickname must be at least {settings.min_nickname_len} characters."
 
 
 @dataclass
 class NicknameTooLongError(Exception):
     def __str__(self):
+        settings = get_settings()
         return f"Nickname must be at most {settings.max_nickname_len} characters."
 
 
@@ -46,8 +45,11 @@ class NicknameTakenError(Exception):
 
 @dataclass
 class MessageTooLongError(Exception):
+    max_length: int | None = None
+
     def __str__(self):
-        return f"Message is too long (max {settings.max_message_length} characters)."
+        max_length = self.max_length or get_settings().max_message_length
+        return f"Message is too long (max {max_length} characters)."
 
 
 @dataclass
@@ -60,3 +62,25 @@ class RateLimitError(Exception):
 class RoomFullError(Exception):
     def __str__(self):
         return "The chat room is currently full. Please try again later."
+
+
+@dataclass
+class InvalidResumeTokenError(Exception):
+    def __str__(self):
+        return "Resume token is invalid or has expired. Please enter a nickname."
+
+
+SPAM_REASONS = {
+    "duplicate": "This message was already posted several times. Please don't repeat it.",
+    "burst": "The room is being flooded. Please wait a moment before sending.",
+    "muted": "You are temporarily muted for flooding.",
+    "slow": "Slow mode is on. Please wait a few seconds between messages.",
+}
+
+
+@dataclass
+class SpamDetectedError(Exception):
+    reason: str
+
+    def __str__(self):
+        return SPAM_REASONS.get(self.reason, "Your message was blocked as spam.")
@@ -0,0 +1,108 @@
+import asyncio
+import logging
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from chatserver.core.message import Message
+
+if TYPE_CHECKING:
+    from chatserver.core.client import Client
+
+logger = logging.getLogger(__name__)
+
+SHARD_QUEUE_SIZE = 1024
+DRAIN_TIMEOUT = 0.5
+
+
+@dataclass
+class Delivery:
+    msg: Message
+    queued_at: float
+    pending: int
+
+
+@dataclass
+class DeliveryShard:
+    index: int
+    on_done: Callable[[Delivery, int], None]
+    queue_size: int = SHARD_QUEUE_SIZE
+    drain_timeout: float = DRAIN_TIMEOUT
+
+    clients: tuple["Client", ...] = field(default=(), init=False)
+    delivered: int = field(default=0, init=False)
+    lagging: set["Client"] = field(default_factory=set, init=False)
+
+    _queue: asyncio.Queue[Delivery] = field(init=False, repr=False)
+    _task: asyncio.Task | None = field(default=None, init=False, repr=False)
+
+    def __post_init__(self):
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+
+    def __len__(self) -> int:
+        return len(self.clients)
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def add(self, client: "Client"):
+        if client not in self.clients:
+            self.clients = (*self.clients, client)
+
+    def remove(self, client: "Client") -> bool:
+        try:
+            index = self.clients.index(client)
+        except ValueError:
+            return False
+        self.clients = self.clients[:index] + self.clients[index + 1 :]
+        self.lagging.discard(client)
+        return True
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def submit(self, delivery: Delivery):
+        await self._queue.put(delivery)
+
+    async def _run(self):
+        while True:
+            delivery = await self._queue.get()
+            clients = self.clients
+
+            backlogged = []
+            for client in clients:
+                try:
+                    if client.deliver(delivery.msg):
+                        if client not in self.lagging:
+                            backlogged.append(client)
+                    elif self.lagging:
+                        self.lagging.discard(client)
+                except Exception as e:
+                    logger.error(f"Error delivering to {client.nickname}: {e}")
+
+            if backlogged:
+                await asyncio.gather(*(self._drain(client) for client in backlogged))
+
+            self.delivered += len(clients)
+            self.on_done(delivery, len(clients))
+
+    async def _drain(self, client: "Client"):
+        try:
+            await asyncio.wait_for(client.drain(), self.drain_timeout)
+        except asyncio.TimeoutError:
+            self.lagging.add(client)
+            logger.warning(
+                f"{client.nickname} did not drain within {self.drain_timeout}s; "
+                "delivering without waiting until it catches up"
+            )
@@ -0,0 +1,93 @@
+from collections.abc import Iterator
+
+from chatserver.core.message import Message
+
+
+class History:
+    def __init__(self, maxlen: int):
+        self._maxlen = maxlen
+        self._buffer: list[Message | None] = [None] * maxlen
+        self._size = 0
+        self._total = 0
+
+    @property
+    def maxlen(self) -> int:
+        return self._maxlen
+
+    @property
+    def first_seq(self) -> int | None:
+        return self[0].seq if self._size else None
+
+    @property
+    def last_seq(self) -> int | None:
+        return self[-1].seq if self._size else None
+
+    @property
+    def _oldest(self) -> int:
+        return self._total - self._size
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __bool__(self) -> bool:
+        return self._size > 0
+
+    def __getitem__(self, index: int) -> Message:
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("history index out of range")
+        return self._buffer[(self._oldest + index) % self._maxlen]
+
+    def __iter__(self) -> Iterator[Message]:
+        return self._iter_range(self._oldest, self._total)
+
+    def append(self, msg: Message):
+        if self._maxlen == 0:
+            return
+
+        self._buffer[self._total % self._maxlen] = msg
+        self._total += 1
+        if self._size < self._maxlen:
+            self._size += 1
+
+    def clear(self):
+        self._buffer = [None] * self._maxlen
+        self._size = 0
+
+    def resize(self, maxlen: int):
+        keep = min(self._size, maxlen)
+        messages = [self[i] for i in range(self._size - keep, self._size)]
+
+        self._maxlen = maxlen
+        self._buffer = [None] * maxlen
+        self._size = keep
+        for offset, msg in enumerate(messages):
+            self._buffer[(self._total - keep + offset) % maxlen] = msg
+
+    def tail(self, count: int) -> Iterator[Message]:
+        return self._iter_range(max(self._oldest, self._total - count), self._total)
+
+    def since(self, seq: int) -> Iterator[Message]:
+        return self._iter_range(self._bisect(seq, inclusive=True), self._total)
+
+    def before(self, seq: int, count: int) -> Iterator[Message]:
+        stop = self._bisect(seq, inclusive=False)
+        return self._iter_range(max(self._oldest, stop - count), stop)
+
+    def _bisect(self, seq: int, inclusive: bool) -> int:
+        low, high = self._oldest, self._total
+        while low < high:
+            mid = (low + high) // 2
+            mid_seq = self._buffer[mid % self._maxlen].seq
+            if mid_seq < seq or (inclusive and mid_seq == seq):
+                low = mid + 1
+            else:
+                high = mid
+        return low
+
+    def _iter_range(self, start: int, stop: int) -> Iterator[Message]:
+        for position in range(start, stop):
+            if position < self._oldest:
+                continue
+            yield self._buffer[position % self._maxlen]
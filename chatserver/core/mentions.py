@@ -0,0 +1,113 @@
+from collections import deque
+
+from chatserver.core.message import Message
+
+MENTION_MARK = "@"
+MENTION_HISTORY = 20
+
+_END = ""
+
+
+def is_nickname_char(c: str) -> bool:
+    return c.isalnum() or c in ("_", "-")
+
+
+class MentionTrie:
+    def __init__(self):
+        self._root: dict = {}
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, nickname: str) -> bool:
+        node = self._root
+        for c in nickname.casefold():
+            node = node.get(c)
+            if node is None:
+                return False
+        return nickname in node.get(_END, ())
+
+    def add(self, nickname: str):
+        node = self._root
+        for c in nickname.casefold():
+            node = node.setdefault(c, {})
+        names = node.setdefault(_END, set())
+        if nickname not in names:
+            names.add(nickname)
+            self._size += 1
+
+    def remove(self, nickname: str):
+        folded = nickname.casefold()
+        path = [self._root]
+        for c in folded:
+            node = path[-1].get(c)
+            if node is None:
+                return
+            path.append(node)
+
+        names = path[-1].get(_END)
+        if names is None or nickname not in names:
+            return
+        names.remove(nickname)
+        self._size -= 1
+        if names:
+            return
+        del path[-1][_END]
+
+        for depth in range(len(folded), 0, -1):
+            if path[depth]:
+                break
+            del path[depth - 1][folded[depth - 1]]
+
+    def find(self, text: str) -> frozenset[str]:
+        found = set()
+        i = text.find(MENTION_MARK)
+        while i != -1:
+            if i == 0 or not is_nickname_char(text[i - 1]):
+                found.update(self._match(text, i + 1))
+            i = text.find(MENTION_MARK, i + 1)
+        return frozenset(found)
+
+    def _match(self, text: str, start: int) -> set[str]:
+        node = self._root
+        match = set()
+        for i in range(start, len(text)):
+            c = text[i]
+            if not is_nickname_char(c):
+                break
+            for folded in c.casefold():
+                node = node.get(folded)
+                if node is None:
+                    return match
+            if _END in node and (
+                i + 1 == len(text) or not is_nickname_char(text[i + 1])
+            ):
+                match = node[_END]
+        return match
+
+
+class MentionIndex:
+    def __init__(self, limit: int = MENTION_HISTORY):
+        self.limit = limit
+        self.recorded = 0
+        self._recent: dict[str, deque[Message]] = {}
+
+    def __len__(self) -> int:
+        return len(self._recent)
+
+    def record(self, nickname: str, msg: Message):
+        recent = self._recent.get(nickname)
+        if recent is None:
+            recent = self._recent[nickname] = deque(maxlen=self.limit)
+        recent.append(msg)
+        self.recorded += 1
+
+    def recent(self, nickname: str, count: int | None = None) -> list[Message]:
+        messages = list(self._recent.get(nickname, ()))
+        if count is not None:
+            messages = messages[-count:] if count > 0 else []
+        return messages
+
+    def forget(self, nickname: str):
+        self._recent.pop(nickname, None)
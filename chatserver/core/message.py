@@ -1,5 +1,6 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
+from uuid import uuid4
 
 
 @dataclass
@@ -9,3 +10,33 @@ class Message:
     timestamp: datetime
     is_system: bool = False
     is_action: bool = False
+    id: str = field(default_factory=lambda: uuid4().hex)
+    origin: str = ""
+    lamport: int = 0
+    seq: int = 0
+    mentions: frozenset[str] = frozenset()
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "origin": self.origin,
+            "lamport": self.lamport,
+            "from_user": self.from_user,
+            "content": self.content,
+            "timestamp": self.timestamp.isoformat(),
+            "is_system": self.is_system,
+            "is_action": self.is_action,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Message":
+        return cls(
+            from_user=data["from_user"],
+            content=data["content"],
+            timestamp=datetime.fromisoformat(data["timestamp"]),
+            is_system=data.get("is_system", False),
+            is_action=data.get("is_action", False),
+            id=data["id"],
+            origin=data.get("origin", ""),
+            lamport=data.get("lamport", 0),
+        )
@@ -0,0 +1,214 @@
+import asyncio
+import gc
+import logging
+import time
+import tracemalloc
+from collections import Counter, deque
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+logger = logging.getLogger(__name__)
+
+_original_handle_run = asyncio.events.Handle._run
+
+
+def _coroutine_chain(coro) -> list[str]:
+    chain = []
+    while coro is not None and len(chain) < 8:
+        code = getattr(coro, "cr_code", None) or getattr(coro, "gi_code", None)
+        if code is None:
+            break
+        chain.append(code.co_qualname)
+        coro = getattr(coro, "cr_await", None) or getattr(coro, "gi_yieldfrom", None)
+    return chain
+
+
+def describe_callback(callback) -> str:
+    owner = getattr(callback, "__self__", None)
+    if isinstance(owner, asyncio.Task):
+        chain = _coroutine_chain(owner.get_coro())
+        if chain:
+            return " -> ".join(chain)
+        return owner.get_name()
+
+    return getattr(callback, "__qualname__", None) or repr(callback)
+
+
+@dataclass
+class LoopMonitor:
+    interval: float = 0.5
+    slow_callback_seconds: float = 0.1
+    gc_pause_seconds: float = 0.05
+    samples: int = 120
+    time_callbacks: bool = False
+
+    lag_samples: deque[float] = field(init=False, repr=False)
+    max_lag: float = field(default=0.0, init=False)
+    slow_callbacks: Counter[str] = field(default_factory=Counter, init=False)
+    slowest_callbacks: dict[str, float] = field(default_factory=dict, init=False)
+    gc_collections: Counter[int] = field(default_factory=Counter, init=False)
+    gc_pause_total: float = field(default=0.0, init=False)
+    gc_pause_max: float = field(default=0.0, init=False)
+    callback_timing: bool = field(default=False, init=False)
+
+    _task: asyncio.Task | None = field(default=None, init=False, repr=False)
+    _timed_run: Callable | None = field(default=None, init=False, repr=False)
+    _gc_started: float = field(default=0.0, init=False, repr=False)
+
+    def __post_init__(self):
+        self.lag_samples = deque(maxlen=self.samples)
+
+    def start(self):
+        if self._task is not None:
+            return
+
+        loop = asyncio.get_running_loop()
+        self._task = loop.create_task(self._sample_lag())
+        if self.time_callbacks:
+            self._install_callback_timer(loop)
+        gc.callbacks.append(self._on_gc)
+
+    async def stop(self):
+        if self._on_gc in gc.callbacks:
+            gc.callbacks.remove(self._on_gc)
+        self._remove_callback_timer()
+
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _sample_lag(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            lag = max(loop.time() - start - self.interval, 0.0)
+
+            self.lag_samples.append(lag)
+            if lag > self.max_lag:
+                self.max_lag = lag
+            if lag > self.slow_callback_seconds:
+                logger.warning(f"Event loop lag {lag * 1000:.1f} ms")
+
+    def _install_callback_timer(self, loop: asyncio.AbstractEventLoop):
+        if not isinstance(loop, asyncio.BaseEventLoop):
+            logger.info(
+                f"Slow callback timing is not available on {type(loop).__name__}; "
+                "lag and GC monitoring stay active"
+            )
+            return
+
+        if asyncio.events.Handle._run is not _original_handle_run:
+            logger.warning(
+                "asyncio Handle._run is already patched; slow callback timing stays off"
+            )
+            return
+
+        monitor = self
+        threshold = self.slow_callback_seconds
+
+        def timed_run(handle):
+            start = time.perf_counter()
+            try:
+                return _original_handle_run(handle)
+            finally:
+                duration = time.perf_counter() - start
+                if duration > threshold:
+                    monitor._record_slow_callback(handle._callback, duration)
+
+        asyncio.events.Handle._run = timed_run
+        self._timed_run = timed_run
+        self.callback_timing = True
+
+    def _remove_callback_timer(self):
+        if self._timed_run is None:
+            return
+
+        if asyncio.events.Handle._run is self._timed_run:
+            asyncio.events.Handle._run = _original_handle_run
+        self._timed_run = None
+        self.callback_timing = False
+
+    def _record_slow_callback(self, callback, duration: float):
+        name = describe_callback(callback)
+        self.slow_callbacks[name] += 1
+        if duration > self.slowest_callbacks.get(name, 0.0):
+            self.slowest_callbacks[name] = duration
+        logger.warning(f"Slow callback {name} took {duration * 1000:.1f} ms")
+
+    def _on_gc(self, phase: str, info: dict):
+        if phase == "start":
+            self._gc_started = time.perf_counter()
+            return
+
+        pause = time.perf_counter() - self._gc_started
+        self.gc_collections[info["generation"]] += 1
+        self.gc_pause_total += pause
+        if pause > self.gc_pause_max:
+            self.gc_pause_max = pause
+        if pause > self.gc_pause_seconds:
+            logger.warning(
+                f"GC pause {pause * 1000:.1f} ms (generation {info['generation']})"
+            )
+
+    def stats(self) -> dict:
+        lags = sorted(self.lag_samples)
+        p99 = lags[min(int(len(lags) * 0.99), len(lags) - 1)] if lags else 0.0
+
+        return {
+            "lag_ms": {
+                "last": round(self.lag_samples[-1] * 1000, 3) if lags else 0.0,
+                "p99": round(p99 * 1000, 3),
+                "max": round(self.max_lag * 1000, 3),
+            },
+            "callback_timing": self.callback_timing,
+            "slow_callbacks": [
+                {
+                    "callback": name,
+                    "count": count,
+                    "max_ms": round(self.slowest_callbacks[name] * 1000, 3),
+                }
+                for name, count in self.slow_callbacks.most_common(10)
+            ],
+            "gc": {
+                "collections": {
+                    str(gen): count for gen, count in self.gc_collections.items()
+                },
+                "pause_total_ms": round(self.gc_pause_total * 1000, 3),
+                "pause_max_ms": round(self.gc_pause_max * 1000, 3),
+            },
+        }
+
+
+def tracemalloc_snapshot(limit: int = 10) -> dict:
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+        return {"tracing": True, "started": True, "top": []}
+
+    current, peak = tracemalloc.get_traced_memory()
+    snapshot = tracemalloc.take_snapshot()
+    top = snapshot.statistics("lineno")[:limit]
+
+    return {
+        "tracing": True,
+        "started": False,
+        "current_bytes": current,
+        "peak_bytes": peak,
+        "top": [
+            {
+                "location": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                "size_bytes": stat.size,
+                "count": stat.count,
+            }
+            for stat in top
+        ],
+    }
+
+
+def tracemalloc_stop() -> dict:
+    tracemalloc.stop()
+    return {"tracing": False}
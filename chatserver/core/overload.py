@@ -0,0 +1,161 @@
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime
+from enum import IntEnum
+from itertools import islice
+from typing import TYPE_CHECKING
+
+from chatserver.core.message import Message
+
+if TYPE_CHECKING:
+    from chatserver.core.monitor import LoopMonitor
+    from chatserver.core.room import Room
+
+logger = logging.getLogger(__name__)
+
+LATENCY_WINDOW = 256
+
+
+class LoadLevel(IntEnum):
+    NORMAL = 0
+    SLOW = 1
+    SHED = 2
+
+
+RATE_DIVISORS = {LoadLevel.NORMAL: 1, LoadLevel.SLOW: 2, LoadLevel.SHED: 4}
+
+ANNOUNCEMENTS = {
+    LoadLevel.NORMAL: "Load is back to normal. Slow mode is off.",
+    LoadLevel.SLOW: "The server is busy. Slow mode is on: {limit} messages per {window}s.",
+    LoadLevel.SHED: (
+        "The server is overloaded. Slow mode is on ({limit} messages per {window}s) "
+        "and join/leave notices and history replays are paused."
+    ),
+}
+
+
+@dataclass
+class LoadSample:
+    queue_depth: int
+    latency_ms: float
+    lag_ms: float
+
+
+@dataclass
+class OverloadController:
+    room: "Room"
+    monitor: "LoopMonitor | None" = None
+    interval: float = 1.0
+    queue_slow: int = 500
+    queue_shed: int = 2000
+    latency_slow_ms: float = 250.0
+    latency_shed_ms: float = 1000.0
+    lag_slow_ms: float = 100.0
+    lag_shed_ms: float = 500.0
+    recover_intervals: int = 3
+
+    level: LoadLevel = field(default=LoadLevel.NORMAL, init=False)
+    transitions: int = field(default=0, init=False)
+    last_sample: LoadSample | None = field(default=None, init=False)
+
+    _calm: int = field(default=0, init=False, repr=False)
+    _broadcasts: int = field(default=0, init=False, repr=False)
+    _task: asyncio.Task | None = field(default=None, init=False, repr=False)
+
+    def start(self):
+        if self._task is None:
+            self._broadcasts = self.room.broadcasts
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.update(self.sample())
+
+    def sample(self) -> LoadSample:
+        new = self.room.broadcasts - self._broadcasts
+        self._broadcasts = self.room.broadcasts
+
+        recent = islice(reversed(self.room.fanout_latencies), min(new, LATENCY_WINDOW))
+        latency = max(recent, default=0.0)
+
+        lag = 0.0
+        if self.monitor and self.monitor.lag_samples:
+            lag = self.monitor.lag_samples[-1]
+
+        return LoadSample(self.room.queue_depth, latency * 1000, lag * 1000)
+
+    def classify(self, sample: LoadSample) -> LoadLevel:
+        if (
+            sample.queue_depth >= self.queue_shed
+            or sample.latency_ms >= self.latency_shed_ms
+            or sample.lag_ms >= self.lag_shed_ms
+        ):
+            return LoadLevel.SHED
+        if (
+            sample.queue_depth >= self.queue_slow
+            or sample.latency_ms >= self.latency_slow_ms
+            or sample.lag_ms >= self.lag_slow_ms
+        ):
+            return LoadLevel.SLOW
+        return LoadLevel.NORMAL
+
+    async def update(self, sample: LoadSample) -> LoadLevel:
+        self.last_sample = sample
+        target = self.classify(sample)
+
+        if target > self.level:
+            self._calm = 0
+            await self._set_level(target)
+        elif target < self.level:
+            self._calm += 1
+            if self._calm >= self.recover_intervals:
+                self._calm = 0
+                await self._set_level(LoadLevel(self.level - 1))
+        else:
+            self._calm = 0
+
+        return self.level
+
+    async def _set_level(self, level: LoadLevel):
+        previous, self.level = self.level, level
+        self.transitions += 1
+        self.room.load_level = level
+        logger.warning(
+            f"Load level {previous.name} -> {level.name} ({self.last_sample})"
+        )
+
+        content = ANNOUNCEMENTS[level].format(
+            limit=self.room.effective_rate_limit,
+            window=self.room.rate_limit_window_seconds,
+        )
+        await self.room.broadcast(
+            Message(
+                from_user="System",
+                content=content,
+                timestamp=datetime.now(),
+                is_system=True,
+            )
+        )
+
+    def stats(self) -> dict:
+        sample = self.last_sample
+        return {
+            "level": self.level.name.lower(),
+            "transitions": self.transitions,
+            "effective_rate_limit": self.room.effective_rate_limit,
+            "shed_notices": self.room.shed_notices,
+            "queue_depth": sample.queue_depth if sample else 0,
+            "fanout_ms": round(sample.latency_ms, 3) if sample else 0.0,
+            "lag_ms": round(sample.lag_ms, 3) if sample else 0.0,
+        }
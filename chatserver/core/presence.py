@@ -0,0 +1,115 @@
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+
+DIGEST_NAME_LIMIT = 5
+
+
+def presence_digest(joined: list[str], left: list[str]) -> str:
+    if len(joined) + len(left) > DIGEST_NAME_LIMIT:
+        return f"{len(joined)} users joined, {len(left)} left"
+
+    parts = []
+    if joined:
+        verb = "has" if len(joined) == 1 else "have"
+        parts.append(f"{', '.join(joined)} {verb} joined the room")
+    if left:
+        verb = "has" if len(left) == 1 else "have"
+        parts.append(f"{', '.join(left)} {verb} left the room")
+    return "; ".join(parts)
+
+
+@dataclass
+class PresenceCoalescer:
+    announce: Callable[[str], Awaitable[None]]
+    window: float = 2.0
+    burst: int = 3
+
+    digests: int = field(default=0, init=False)
+    suppressed: int = field(default=0, init=False)
+
+    _joined: dict[str, None] = field(default_factory=dict, init=False, repr=False)
+    _left: dict[str, None] = field(default_factory=dict, init=False, repr=False)
+    _window_end: float = field(default=0.0, init=False, repr=False)
+    _flush_at: float = field(default=0.0, init=False, repr=False)
+    _sent: int = field(default=0, init=False, repr=False)
+    _flush: asyncio.Task | None = field(default=None, init=False, repr=False)
+
+    @property
+    def pending(self) -> int:
+        return len(self._joined) + len(self._left)
+
+    async def joined(self, nickname: str):
+        now = self._tick()
+        if self.window <= 0:
+            await self.announce(presence_digest([nickname], []))
+            return
+
+        if nickname in self._left:
+            del self._left[nickname]
+            self.suppressed += 1
+            return
+
+        if not self._joined and self._sent < self.burst:
+            self._sent += 1
+            await self.announce(presence_digest([nickname], []))
+            return
+
+        self._joined[nickname] = None
+        self._schedule(max(self._window_end, now))
+
+    async def left(self, nickname: str):
+        now = self._tick()
+        if self.window <= 0:
+            await self.announce(presence_digest([], [nickname]))
+            return
+
+        if nickname in self._joined:
+            del self._joined[nickname]
+            self.suppressed += 1
+            return
+
+        self._left[nickname] = None
+        self._schedule(now + self.window)
+
+    def _tick(self) -> float:
+        now = time.monotonic()
+        if now >= self._window_end:
+            self._window_end = now + self.window
+            self._sent = 0
+        return now
+
+    def _schedule(self, at: float):
+        self._flush_at = max(self._flush_at, at)
+        if self._flush is None:
+            self._flush = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self):
+        while (delay := self._flush_at - time.monotonic()) > 0:
+            await asyncio.sleep(delay)
+        self._flush = None
+
+        joined, left = list(self._joined), list(self._left)
+        self._joined.clear()
+        self._left.clear()
+
+        if joined or left:
+            self.digests += 1
+            await self.announce(presence_digest(joined, left))
+
+    async def stop(self):
+        if self._flush:
+            self._flush.cancel()
+            try:
+                await self._flush
+            except asyncio.CancelledError:
+                pass
+            self._flush = None
+
+    def stats(self) -> dict:
+        return {
+            "pending": self.pending,
+            "digests": self.digests,
+            "suppressed_pairs": self.suppressed,
+        }
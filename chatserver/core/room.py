@@ -1,17 +1,40 @@
 import asyncio
 import logging
-from collections import deque
+import secrets
+import time
+from collections import Counter, deque
+from collections.abc import Callable, Iterator
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import TYPE_CHECKING
 
+from chatserver.core.fanout import Delivery, DeliveryShard
+from chatserver.core.history import History
+from chatserver.core.mentions import MENTION_HISTORY, MentionIndex, MentionTrie
 from chatserver.core.message import Message
+from chatserver.core.overload import RATE_DIVISORS, LoadLevel
+from chatserver.core.presence import PresenceCoalescer
+from chatserver.core.roster import Roster
+from chatserver.core.spam import SpamFilter
+from chatserver.core.spectators import Spectators
+from chatserver.ui.formatter import Formatter, TerminalProfile, shared_formatter
+from chatserver.ui.render_cache import RenderCache
 
 if TYPE_CHECKING:
     from chatserver.core.client import Client
 
 logger = logging.getLogger(__name__)
 
+MIN_RENDER_CACHE_SIZE = 64
+FANOUT_SAMPLES = 4096
+
+
+@dataclass
+class SuspendedSession:
+    nickname: str
+    last_seq: int
+    expiry: asyncio.Task | None = None
+
 
 @dataclass
 class Room:
@@ -20,27 +43,90 @@ class Room:
     enable_history: bool
     history_size: int
     plain_text: bool
+    rate_limit_max_messages: int = 5
+    rate_limit_window_seconds: int = 5
+    max_message_length: int = 1000
+    resume_grace_seconds: int = 60
+    history_join_tail: int = 20
+    fanout_shards: int = 4
+    spectator_max_buffer: int = 256 * 1024
+    presence_window: float = 2.0
+    presence_burst: int = 3
+    mention_history: int = MENTION_HISTORY
+    mention_bell: bool = False
+    digest_max_lines: int = 100
+    spam_filter: SpamFilter | None = None
 
     clients: dict[str, "Client | None"] = field(default_factory=dict)
-    history: deque[Message] = field(default_factory=deque)
+    history: History = field(init=False)
+    render_cache: RenderCache = field(init=False, repr=False)
+    shards: list[DeliveryShard] = field(init=False, repr=False)
+    roster: Roster = field(default_factory=Roster, init=False, repr=False)
+    mentions: MentionTrie = field(default_factory=MentionTrie, init=False, repr=False)
+    mention_index: MentionIndex = field(init=False, repr=False)
+    spectators: Spectators = field(init=False, repr=False)
+    presence: PresenceCoalescer = field(init=False, repr=False)
+    spectator_formatter: Formatter = field(init=False, repr=False)
+    listeners: list[Callable[[Message], None]] = field(default_factory=list)
+    state_listeners: list[Callable[[str, dict], None]] = field(
+        default_factory=list, repr=False
+    )
+    message_counts: Counter[str] = field(default_factory=Counter)
+    load_level: LoadLevel = field(default=LoadLevel.NORMAL, init=False)
+    shed_notices: int = field(default=0, init=False)
+    broadcasts: int = field(default=0, init=False)
+    deliveries: int = field(default=0, init=False)
+    fanout_latencies: deque[float] = field(
+        default_factory=lambda: deque(maxlen=FANOUT_SAMPLES), init=False, repr=False
+    )
 
     _lock: asyncio.Lock = field(default_factory=asyncio.Lock, init=False, repr=False)
-    _broadcast_queue: asyncio.Queue[Message] = field(
+    _broadcast_queue: asyncio.Queue[tuple[Message, float]] = field(
         default_factory=asyncio.Queue, init=False, repr=False
     )
     _running: bool = field(default=False, init=False, repr=False)
+    _seq: int = field(default=0, init=False, repr=False)
+    _suspended: dict[str, SuspendedSession] = field(
+        default_factory=dict, init=False, repr=False
+    )
     _task: asyncio.Task | None = field(default=None, init=False, repr=False)
+    _placement: dict["Client", DeliveryShard] = field(
+        default_factory=dict, init=False, repr=False
+    )
 
     def __post_init__(self):
-        self.history = deque(maxlen=self.history_size)
+        self.history = History(self.history_size)
+        self.render_cache = RenderCache(max(self.history_size, MIN_RENDER_CACHE_SIZE))
+        self.spectators = Spectators(self.spectator_max_buffer)
+        self.mention_index = MentionIndex(self.mention_history)
+        self.presence = PresenceCoalescer(
+            self._announce_presence, self.presence_window, self.presence_burst
+        )
+        self.spectator_formatter = shared_formatter(
+            TerminalProfile.PLAIN if self.plain_text else TerminalProfile.ANSI256
+        )
+        self.shards = [
+            DeliveryShard(index, self._on_delivered)
+            for index in range(max(self.fanout_shards, 1))
+        ]
 
     def start(self):
         if not self._running:
             self._running = True
+            for shard in self.shards:
+                shard.start()
             self._task = asyncio.create_task(self._run())
 
     async def stop(self):
         self._running = False
+
+        expiries = [session.expiry for session in self._suspended.values()]
+        self._suspended.clear()
+        for expiry in expiries:
+            expiry.cancel()
+        await asyncio.gather(*expiries, return_exceptions=True)
+        await self.presence.stop()
+
         if self._task:
             self._task.cancel()
             try:
@@ -48,17 +134,35 @@ class Room:
             except asyncio.CancelledError:
                 pass
 
+        for shard in self.shards:
+            await shard.stop()
+
     async def _run(self):
         try:
             while self._running:
-                msg = await self._broadcast_queue.get()
-                await self._broadcast_message(msg)
+                msg, queued_at = await self._broadcast_queue.get()
+                await self._broadcast_message(msg, queued_at)
         except asyncio.CancelledError:
             pass
 
+    def _attach(self, client: "Client"):
+        if client not in self._placement:
+            shard = min(self.shards, key=len)
+            shard.add(client)
+            self._placement[client] = shard
+        self.roster.add(client.nickname)
+        self.mentions.add(client.nickname)
+
+    def _detach(self, client: "Client"):
+        self.roster.remove(client.nickname)
+        self.mentions.remove(client.nickname)
+        shard = self._placement.pop(client, None)
+        if shard is not None:
+            shard.remove(client)
+
     async def join(self, client: "Client"):
         async with self._lock:
-            active_count = sum(1 for c in self.clients.values() if c is not None)
+            active_count = self.active_count
 
             if active_count >= self.max_users:
                 if client.nickname in self.clients:
@@ -67,55 +171,326 @@ class Room:
                 return
 
             self.clients[client.nickname] = client
+            self._attach(client)
 
-        await self.broadcast(
-            Message(
-                from_user="System",
-                content=f"{client.nickname} has joined the room",
-                timestamp=datetime.now(),
-                is_system=True,
+        await self.presence.joined(client.nickname)
+
+    async def rejoin(self, client: "Client") -> bool:
+        async with self._lock:
+            active_count = self.active_count
+
+            if active_count >= self.max_users:
+                if self.clients.get(client.nickname) is None:
+                    self.clients.pop(client.nickname, None)
+                client.full_room_rejection = True
+                return False
+
+            self.clients[client.nickname] = client
+            self._attach(client)
+
+        return True
+
+    def issue_resume_token(self, nickname: str = "") -> str:
+        token = secrets.token_urlsafe(16)
+        if nickname:
+            self._notify_state("session", nickname=nickname, token=token)
+        return token
+
+    def sessions(self) -> dict[str, str]:
+        sessions = {
+            client.nickname: client.resume_token
+            for client in self.clients.values()
+            if client is not None and client.resume_token
+        }
+        for token, session in self._suspended.items():
+            sessions[session.nickname] = token
+        return sessions
+
+    def restore_sessions(self, sessions: dict[str, str]):
+        for nickname, token in sessions.items():
+            if nickname in self.clients:
+                continue
+            self.clients[nickname] = None
+            self._suspended[token] = SuspendedSession(
+                nickname=nickname,
+                last_seq=self._seq,
+                expiry=asyncio.create_task(self._expire_session(token)),
             )
-        )
+
+    async def suspend(self, client: "Client"):
+        async with self._lock:
+            if self.clients.get(client.nickname) is not client:
+                return
+
+            self._detach(client)
+            if not self._running:
+                del self.clients[client.nickname]
+                return
+
+            self.clients[client.nickname] = None
+            self._suspended[client.resume_token] = SuspendedSession(
+                nickname=client.nickname,
+                last_seq=client.last_seq,
+                expiry=asyncio.create_task(self._expire_session(client.resume_token)),
+            )
+
+    def resume(self, token: str) -> SuspendedSession | None:
+        session = self._suspended.pop(token, None)
+        if session:
+            session.expiry.cancel()
+            return session
+        return self._take_over(token)
+
+    def _take_over(self, token: str) -> SuspendedSession | None:
+        for nickname, client in self.clients.items():
+            if client is not None and client.resume_token == token:
+                break
+        else:
+            return None
+
+        logger.info(f"{nickname} reconnected, closing the previous connection")
+        self._detach(client)
+        self.clients[nickname] = None
+        client.writer.transport.abort()
+        return SuspendedSession(nickname=nickname, last_seq=client.last_seq)
+
+    async def _expire_session(self, token: str):
+        await asyncio.sleep(self.resume_grace_seconds)
+
+        session = self._suspended.pop(token, None)
+        if session is None:
+            return
+
+        async with self._lock:
+            if (
+                session.nickname in self.clients
+                and self.clients[session.nickname] is None
+            ):
+                del self.clients[session.nickname]
+
+        self.mention_index.forget(session.nickname)
+        self._notify_state("leave", nickname=session.nickname)
+        await self.presence.left(session.nickname)
 
     async def leave(self, client: "Client"):
         async with self._lock:
-            if client.nickname in self.clients:
+            if self.clients.get(client.nickname) is client:
                 del self.clients[client.nickname]
+                self._detach(client)
                 should_broadcast = True
             else:
                 should_broadcast = False
 
         if should_broadcast:
-            await self.broadcast(
-                Message(
-                    from_user="System",
-                    content=f"{client.nickname} has left the room",
-                    timestamp=datetime.now(),
-                    is_system=True,
-                )
+            self.mention_index.forget(client.nickname)
+            self._notify_state("leave", nickname=client.nickname)
+            await self.presence.left(client.nickname)
+
+    async def _announce_presence(self, content: str):
+        if self.load_level >= LoadLevel.SHED:
+            self.shed_notices += 1
+            return
+
+        await self.broadcast(
+            Message(
+                from_user="System",
+                content=content,
+                timestamp=datetime.now(),
+                is_system=True,
             )
+        )
+
+    @property
+    def effective_rate_limit(self) -> int:
+        return max(self.rate_limit_max_messages // RATE_DIVISORS[self.load_level], 1)
+
+    @property
+    def active_count(self) -> int:
+        return sum(len(shard) for shard in self.shards)
+
+    @property
+    def queue_depth(self) -> int:
+        return self._broadcast_queue.qsize() + sum(s.pending for s in self.shards)
 
     async def broadcast(self, msg: Message):
-        await self._broadcast_queue.put(msg)
+        await self._broadcast_queue.put((msg, time.perf_counter()))
+
+    def add_listener(self, listener: Callable[[Message], None]):
+        self.listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[Message], None]):
+        if listener in self.listeners:
+            self.listeners.remove(listener)
+
+    def _notify_listeners(self, msg: Message):
+        for listener in self.listeners:
+            try:
+                listener(msg)
+            except Exception as e:
+                logger.error(f"Error in room listener: {e}")
+
+    def add_state_listener(self, listener: Callable[[str, dict], None]):
+        self.state_listeners.append(listener)
+
+    def remove_state_listener(self, listener: Callable[[str, dict], None]):
+        if listener in self.state_listeners:
+            self.state_listeners.remove(listener)
+
+    def _notify_state(self, kind: str, **data):
+        for listener in self.state_listeners:
+            try:
+                listener(kind, data)
+            except Exception as e:
+                logger.error(f"Error in room state listener: {e}")
+
+    @property
+    def last_seq(self) -> int:
+        return self._seq
+
+    async def _broadcast_message(self, msg: Message, queued_at: float):
+        self._seq += 1
+        msg.seq = self._seq
 
-    async def _broadcast_message(self, msg: Message):
         if self.enable_history:
             self.history.append(msg)
 
-        async with self._lock:
-            clients = [client for client in self.clients.values() if client is not None]
+        if not msg.is_system:
+            self.message_counts[msg.from_user] += 1
+            self._index_mentions(msg)
+
+        self._notify_listeners(msg)
 
-        tasks = [client.send_message(msg) for client in clients]
-        await asyncio.gather(*tasks, return_exceptions=True)
+        logger.debug(f"Broadcasting message {msg.id} to {len(self.shards)} shards")
+
+        if self.spectators:
+            self.spectators.publish(
+                self.render_cache.render(msg, self.spectator_formatter)
+            )
+
+        delivery = Delivery(msg, queued_at, pending=len(self.shards))
+        for shard in self.shards:
+            await shard.submit(delivery)
+
+    def _index_mentions(self, msg: Message):
+        if not self.mentions:
+            return
+
+        msg.mentions = self.mentions.find(msg.content) - {msg.from_user}
+        for nickname in msg.mentions:
+            self.mention_index.record(nickname, msg)
+
+    def get_mentions(self, nickname: str, count: int | None = None) -> list[Message]:
+        return self.mention_index.recent(nickname, count)
+
+    def _on_delivered(self, delivery: Delivery, count: int):
+        self.deliveries += count
+        delivery.pending -= 1
+        if delivery.pending == 0:
+            self.broadcasts += 1
+            self.fanout_latencies.append(time.perf_counter() - delivery.queued_at)
+
+    def apply_settings(
+        self,
+        max_users: int,
+        history_size: int,
+        rate_limit_max_messages: int,
+        rate_limit_window_seconds: int,
+        max_message_length: int,
+    ):
+        settings = {
+            "max_users": max_users,
+            "history_size": history_size,
+            "rate_limit_max_messages": rate_limit_max_messages,
+            "rate_limit_window_seconds": rate_limit_window_seconds,
+            "max_message_length": max_message_length,
+        }
+        invalid = [key for key, value in settings.items() if value < 1]
+        if invalid:
+            raise ValueError(f"settings must be positive: {', '.join(invalid)}")
+
+        if history_size != self.history_size:
+            self.history.resize(history_size)
+            self.render_cache.resize(max(history_size, MIN_RENDER_CACHE_SIZE))
+
+        self.max_users = max_users
+        self.history_size = history_size
+        self.rate_limit_max_messages = rate_limit_max_messages
+        self.rate_limit_window_seconds = rate_limit_window_seconds
+        self.max_message_length = max_message_length
+
+        self._notify_state("settings", **self.settings())
+
+    def settings(self) -> dict:
+        return {
+            "max_users": self.max_users,
+            "history_size": self.history_size,
+            "rate_limit_max_messages": self.rate_limit_max_messages,
+            "rate_limit_window_seconds": self.rate_limit_window_seconds,
+            "max_message_length": self.max_message_length,
+        }
+
+    def restore_snapshot(self, seq: int, settings: dict, history: list[Message]):
+        self.apply_settings(**settings)
+        self.history.clear()
+        self.message_counts.clear()
+        for msg in history:
+            self.restore_message(msg)
+        self._seq = seq
+
+    def restore_message(self, msg: Message):
+        self._seq = max(self._seq, msg.seq)
+        if self.enable_history:
+            self.history.append(msg)
+        if not msg.is_system:
+            self.message_counts[msg.from_user] += 1
 
     def get_history(self) -> list[Message]:
         return list(self.history)
 
+    def get_history_since(self, seq: int) -> Iterator[Message]:
+        return self.history.since(seq)
+
+    def get_history_tail(self, count: int) -> Iterator[Message]:
+        return self.history.tail(count)
+
+    def get_history_before(self, seq: int, count: int) -> Iterator[Message]:
+        return self.history.before(seq, count)
+
     def get_user_list(self) -> list[str]:
         return list(self.clients.keys())
 
+    def get_client(self, nickname: str) -> "Client | None":
+        return self.clients.get(nickname)
+
+    def top_talkers(self, limit: int = 10) -> list[tuple[str, int]]:
+        return self.message_counts.most_common(limit)
+
+    def fanout_stats(self) -> dict:
+        latencies = sorted(self.fanout_latencies)
+
+        def percentile(fraction: float) -> float:
+            if not latencies:
+                return 0.0
+            index = min(int(len(latencies) * fraction), len(latencies) - 1)
+            return round(latencies[index] * 1000, 3)
+
+        return {
+            "broadcasts": self.broadcasts,
+            "deliveries": self.deliveries,
+            "lagging": sum(len(shard.lagging) for shard in self.shards),
+            "latency_ms": {
+                "p50": percentile(0.5),
+                "p99": percentile(0.99),
+                "max": round(latencies[-1] * 1000, 3) if latencies else 0.0,
+            },
+        }
+
     def reserve_nickname(self, nickname: str) -> bool:
         if nickname in self.clients:
             return False
         self.clients[nickname] = None
         return True
+
+    def release_nickname(self, nickname: str):
+        if nickname in self.clients and self.clients[nickname] is None:
+            del self.clients[nickname]
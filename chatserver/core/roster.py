@@ -0,0 +1,61 @@
+from bisect import bisect_left, insort
+
+from chatserver.ui.formatter import Formatter
+
+
+def roster_key(nickname: str) -> tuple[str, str]:
+    return nickname.casefold(), nickname
+
+
+class Roster:
+    def __init__(self):
+        self._keys: list[tuple[str, str]] = []
+        self._rendered: dict[tuple, bytes] = {}
+        self.renders = 0
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, nickname: str) -> bool:
+        key = roster_key(nickname)
+        index = bisect_left(self._keys, key)
+        return index < len(self._keys) and self._keys[index] == key
+
+    def __iter__(self):
+        return (nickname for _, nickname in self._keys)
+
+    def add(self, nickname: str):
+        if nickname in self:
+            return
+        insort(self._keys, roster_key(nickname))
+        self._rendered.clear()
+
+    def remove(self, nickname: str):
+        key = roster_key(nickname)
+        index = bisect_left(self._keys, key)
+        if index < len(self._keys) and self._keys[index] == key:
+            del self._keys[index]
+            self._rendered.clear()
+
+    def names(self) -> list[str]:
+        return [nickname for _, nickname in self._keys]
+
+    def prefix(self, prefix: str, limit: int | None = None) -> list[str]:
+        folded = prefix.casefold()
+        matches = []
+        for index in range(bisect_left(self._keys, (folded,)), len(self._keys)):
+            key, nickname = self._keys[index]
+            if not key.startswith(folded) or len(matches) == limit:
+                break
+            matches.append(nickname)
+        return matches
+
+    def render(self, formatter: Formatter, room_name: str, max_users: int) -> bytes:
+        cache_key = (formatter.profile_key, room_name, max_users)
+        data = self._rendered.get(cache_key)
+        if data is None:
+            self.renders += 1
+            text = formatter.format_user_list(room_name, self.names(), max_users)
+            data = f"{text}\r\n".encode("utf-8")
+            self._rendered[cache_key] = data
+        return data
@@ -0,0 +1,133 @@
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from enum import StrEnum
+
+from chatserver.core.exceptions import SpamDetectedError
+
+
+class SpamAction(StrEnum):
+    DROP = "drop"
+    MUTE = "mute"
+    SLOW = "slow"
+
+
+def content_fingerprint(content: str) -> int:
+    return hash("".join(filter(str.isalnum, content.casefold())))
+
+
+def _decrement(counts: dict, key):
+    if counts[key] == 1:
+        del counts[key]
+    else:
+        counts[key] -= 1
+
+
+@dataclass
+class SpamFilter:
+    action: SpamAction = SpamAction.DROP
+    duplicate_window_seconds: float = 10.0
+    duplicate_threshold: int = 3
+    min_length: int = 10
+    burst_window_seconds: float = 2.0
+    burst_threshold: int = 30
+    penalty_seconds: float = 30.0
+    slow_mode_interval: float = 2.0
+
+    checked: int = field(default=0, init=False)
+    blocked: int = field(default=0, init=False)
+    slow_mode_until: float = field(default=0.0, init=False)
+
+    _recent: deque[tuple[float, int, str]] = field(
+        default_factory=deque, init=False, repr=False
+    )
+    _counts: dict[int, int] = field(default_factory=dict, init=False, repr=False)
+    _sender_counts: dict[tuple[str, int], int] = field(
+        default_factory=dict, init=False, repr=False
+    )
+    _burst: deque[tuple[float, str]] = field(
+        default_factory=deque, init=False, repr=False
+    )
+    _burst_counts: dict[str, int] = field(default_factory=dict, init=False, repr=False)
+    _muted: dict[str, float] = field(default_factory=dict, init=False, repr=False)
+    _last_sent: dict[str, float] = field(default_factory=dict, init=False, repr=False)
+
+    def check(self, nickname: str, content: str, now: float | None = None):
+        if now is None:
+            now = time.monotonic()
+        self.checked += 1
+
+        muted_until = self._muted.get(nickname)
+        if muted_until is not None:
+            if now < muted_until:
+                self.blocked += 1
+                raise SpamDetectedError("muted")
+            del self._muted[nickname]
+
+        if now < self.slow_mode_until:
+            last = self._last_sent.get(nickname)
+            if last is not None and now - last < self.slow_mode_interval:
+                self.blocked += 1
+                raise SpamDetectedError("slow")
+        elif self._last_sent:
+            self._last_sent.clear()
+
+        reason, culprit = self._detect(nickname, content, now)
+        if reason:
+            self.blocked += 1
+            if self.action == SpamAction.SLOW:
+                self.slow_mode_until = now + self.penalty_seconds
+            if culprit:
+                self._penalize(nickname, now)
+            raise SpamDetectedError(reason)
+
+        if now < self.slow_mode_until:
+            self._last_sent[nickname] = now
+
+    def _detect(self, nickname: str, content: str, now: float) -> tuple[str, bool]:
+        burst, burst_counts = self._burst, self._burst_counts
+        burst.append((now, nickname))
+        burst_counts[nickname] = burst_counts.get(nickname, 0) + 1
+        cutoff = now - self.burst_window_seconds
+        while burst[0][0] < cutoff:
+            _decrement(burst_counts, burst.popleft()[1])
+
+        recent, counts = self._recent, self._counts
+        cutoff = now - self.duplicate_window_seconds
+        while recent and recent[0][0] < cutoff:
+            _, old, sender = recent.popleft()
+            _decrement(counts, old)
+            _decrement(self._sender_counts, (sender, old))
+
+        if len(burst) > self.burst_threshold:
+            return "burst", 2 * burst_counts[nickname] >= len(burst)
+
+        if len(content) < self.min_length:
+            return "", False
+
+        fingerprint = content_fingerprint(content)
+        recent.append((now, fingerprint, nickname))
+        count = counts.get(fingerprint, 0) + 1
+        counts[fingerprint] = count
+        key = (nickname, fingerprint)
+        own = self._sender_counts.get(key, 0) + 1
+        self._sender_counts[key] = own
+
+        if count >= self.duplicate_threshold:
+            return "duplicate", own > 1
+        return "", False
+
+    def _penalize(self, nickname: str, now: float):
+        if self.action == SpamAction.MUTE:
+            self._muted[nickname] = now + self.penalty_seconds
+        elif self.action == SpamAction.SLOW:
+            self._last_sent[nickname] = now
+
+    def stats(self) -> dict:
+        return {
+            "action": str(self.action),
+            "checked": self.checked,
+            "blocked": self.blocked,
+            "muted": len(self._muted),
+            "slow_mode": time.monotonic() < self.slow_mode_until,
+        }
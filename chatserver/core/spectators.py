@@ -0,0 +1,43 @@
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class Spectators:
+    def __init__(self, max_buffer: int = 256 * 1024):
+        self.max_buffer = max_buffer
+        self.dropped = 0
+        self._transports: set[asyncio.WriteTransport] = set()
+
+    def __len__(self) -> int:
+        return len(self._transports)
+
+    def add(self, transport: asyncio.WriteTransport):
+        self._transports.add(transport)
+
+    def remove(self, transport: asyncio.WriteTransport):
+        self._transports.discard(transport)
+
+    def publish(self, data: bytes):
+        stale = None
+        for transport in self._transports:
+            if transport.is_closing():
+                stale = stale or []
+                stale.append(transport)
+            elif transport.get_write_buffer_size() > self.max_buffer:
+                logger.info("Dropping spectator that fell behind")
+                transport.abort()
+                self.dropped += 1
+                stale = stale or []
+                stale.append(transport)
+            else:
+                transport.write(data)
+
+        if stale:
+            self._transports.difference_update(stale)
+
+    def close(self):
+        for transport in self._transports:
+            transport.close()
+        self._transports.clear()
@@ -7,10 +7,10 @@ from chatserver.core.exceptions import (
     NicknameInvalidCharsError,
 )
 
-settings = get_settings()
-
 
 def validate_nickname(nickname: str):
+    settings = get_settings()
+
     if not nickname:
         raise NicknameEmptyError()
 
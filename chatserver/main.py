@@ -1,16 +1,11 @@
-import asyncio
 import logging
-import signal
 
 import click
 
-from chatserver.config import get_settings
-from chatserver.network.server import Server
-
 logger = logging.getLogger(__name__)
 
 
-@click.command()
+@click.group(invoke_without_command=True)
 @click.option("--host", type=str, help="Host to bind to")
 @click.option("--port", type=int, help="TCP port to listen on")
 @click.option("--room-name", type=str, help="Chat room name")
@@ -21,7 +16,122 @@ logger = logging.getLogger(__name__)
 @click.option(
     "--log-level", type=str, help="Logging level (DEBUG, INFO, WARNING, ERROR)"
 )
-def cli(host, port, room_name, max_users, history, history_size, plain_text, log_level):
+@click.option("--admin-socket", type=str, help="Unix socket path for admin commands")
+@click.option("--machine-port", type=int, help="TCP port for the bot JSON protocol")
+@click.option("--tls-cert", type=str, help="PEM certificate file to enable TLS")
+@click.option("--tls-key", type=str, help="PEM private key file for TLS")
+@click.option(
+    "--spam-action",
+    type=click.Choice(["off", "drop", "mute", "slow"]),
+    help="Action taken on flood or duplicate messages",
+)
+@click.option("--node-id", type=str, help="Unique node name within the mesh")
+@click.option("--mesh-port", type=int, help="TCP port for mesh peer links")
+@click.option(
+    "--peer", "peers", multiple=True, help="Mesh peer as host:port (repeatable)"
+)
+@click.option("--capture", type=str, help="Record inbound traffic to a capture file")
+@click.option(
+    "--capture-anonymize", is_flag=True, help="Scrub nicknames and text in captures"
+)
+@click.option(
+    "--tcp-nodelay/--no-tcp-nodelay", default=None, help="Disable Nagle's algorithm"
+)
+@click.option(
+    "--keepalive/--no-keepalive", default=None, help="Enable TCP keepalive probes"
+)
+@click.option("--keepidle", type=int, help="Idle seconds before keepalive probes")
+@click.option("--keepintvl", type=int, help="Seconds between keepalive probes")
+@click.option("--keepcnt", type=int, help="Unanswered probes before dropping a peer")
+@click.option("--sndbuf", type=int, help="SO_SNDBUF bytes per connection")
+@click.option("--rcvbuf", type=int, help="SO_RCVBUF bytes per connection")
+@click.option("--backlog", type=int, help="Listen backlog")
+@click.option("--write-buffer-high", type=int, help="Transport write high-water mark")
+@click.option("--write-buffer-low", type=int, help="Transport write low-water mark")
+@click.option("--archive-dir", type=str, help="Directory for the compressed archive")
+@click.option(
+    "--replication-socket",
+    type=str,
+    help="Unix socket streaming room state to a standby (or followed with --standby)",
+)
+@click.option(
+    "--standby", is_flag=True, help="Follow a primary and take over when it dies"
+)
+@click.option(
+    "--failover-seconds",
+    type=float,
+    help="Seconds without the primary before a standby takes over",
+)
+@click.option(
+    "--loop",
+    "loop_backend",
+    type=click.Choice(["asyncio", "uvloop"]),
+    help="Event loop implementation (uvloop falls back to asyncio if missing)",
+)
+@click.option(
+    "--eager-tasks/--no-eager-tasks",
+    default=None,
+    help="Start new tasks eagerly (Python 3.12+)",
+)
+@click.option(
+    "--write-stall-timeout",
+    type=float,
+    help="Seconds a peer may stay over the high-water mark before it is dropped",
+)
+@click.pass_context
+def cli(
+    ctx,
+    host,
+    port,
+    room_name,
+    max_users,
+    history,
+    history_size,
+    plain_text,
+    log_level,
+    admin_socket,
+    machine_port,
+    tls_cert,
+    tls_key,
+    spam_action,
+    node_id,
+    mesh_port,
+    peers,
+    capture,
+    capture_anonymize,
+    tcp_nodelay,
+    keepalive,
+    keepidle,
+    keepintvl,
+    keepcnt,
+    sndbuf,
+    rcvbuf,
+    backlog,
+    write_buffer_high,
+    write_buffer_low,
+    write_stall_timeout,
+    archive_dir,
+    replication_socket,
+    standby,
+    failover_seconds,
+    loop_backend,
+    eager_tasks,
+):
+    if ctx.invoked_subcommand is not None:
+        return
+
+    import asyncio
+
+    from pydantic import ValidationError
+
+    from chatserver.config import Settings, get_settings
+    from chatserver.network.eventloop import (
+        install_signal_handlers,
+        new_event_loop,
+        remove_signal_handlers,
+    )
+    from chatserver.network.server import Server
+
     settings = get_settings()
     config_dict = settings.model_dump()
 
@@ -32,14 +142,52 @@ def cli(host, port, room_name, max_users, history, history_size, plain_text, log
         "max_users": max_users,
         "history_size": history_size,
         "log_level": log_level,
+        "admin_socket": admin_socket,
+        "machine_port": machine_port,
+        "tls_cert_file": tls_cert,
+        "tls_key_file": tls_key,
+        "spam_action": spam_action,
+        "node_id": node_id,
+        "mesh_port": mesh_port,
+        "mesh_peers": list(peers) or None,
+        "capture_file": capture,
+        "tcp_nodelay": tcp_nodelay,
+        "tcp_keepalive": keepalive,
+        "tcp_keepidle": keepidle,
+        "tcp_keepintvl": keepintvl,
+        "tcp_keepcnt": keepcnt,
+        "socket_sndbuf": sndbuf,
+        "socket_rcvbuf": rcvbuf,
+        "listen_backlog": backlog,
+        "write_buffer_high": write_buffer_high,
+        "write_buffer_low": write_buffer_low,
+        "write_stall_timeout": write_stall_timeout,
+        "archive_dir": archive_dir,
+        "replication_socket": replication_socket,
+        "failover_seconds": failover_seconds,
+        "loop_backend": loop_backend,
+        "eager_tasks": eager_tasks,
     }
 
     if history:
         overrides["enable_history"] = True
+    if capture_anonymize:
+        overrides["capture_anonymize"] = True
     if plain_text:
         overrides["plain_text"] = True
+    if standby:
+        overrides["standby"] = True
+
+    overrides = {k: v for k, v in overrides.items() if v is not None}
+    config_dict.update(overrides)
+
+    try:
+        Settings.model_validate(config_dict)
+    except ValidationError as e:
+        raise click.UsageError(str(e))
 
-    config_dict.update({k: v for k, v in overrides.items() if v is not None})
+    if config_dict["standby"] and not config_dict["replication_socket"]:
+        raise click.UsageError("--standby needs --replication-socket")
 
     level = config_dict.pop("log_level")
     logging.basicConfig(
@@ -48,6 +196,32 @@ def cli(host, port, room_name, max_users, history, history_size, plain_text, log
         datefmt="%H:%M:%S",
     )
 
+    spam_filter = None
+    if config_dict["spam_action"] != "off":
+        from chatserver.core.spam import SpamAction, SpamFilter
+
+        spam_filter = SpamFilter(
+            action=SpamAction(config_dict["spam_action"]),
+            duplicate_window_seconds=config_dict["spam_duplicate_window_seconds"],
+            duplicate_threshold=config_dict["spam_duplicate_threshold"],
+            min_length=config_dict["spam_min_length"],
+            burst_window_seconds=config_dict["spam_burst_window_seconds"],
+            burst_threshold=config_dict["spam_burst_threshold"],
+            penalty_seconds=config_dict["spam_penalty_seconds"],
+            slow_mode_interval=config_dict["spam_slow_mode_interval"],
+        )
+
+    monitor = None
+    if config_dict["monitor_enabled"]:
+        from chatserver.core.monitor import LoopMonitor
+
+        monitor = LoopMonitor(
+            interval=config_dict["monitor_interval"],
+            slow_callback_seconds=config_dict["monitor_slow_callback_ms"] / 1000,
+            time_callbacks=config_dict["monitor_callback_timing"],
+            gc_pause_seconds=config_dict["monitor_gc_pause_ms"] / 1000,
+        )
+
     server = Server(
         host=config_dict["host"],
         port=config_dict["port"],
@@ -56,27 +230,187 @@ def cli(host, port, room_name, max_users, history, history_size, plain_text, log
         enable_history=config_dict["enable_history"],
         history_size=config_dict["history_size"],
         plain_text=config_dict["plain_text"],
+        rate_limit_max_messages=config_dict["rate_limit_max_messages"],
+        rate_limit_window_seconds=config_dict["rate_limit_window_seconds"],
+        admin_socket=config_dict["admin_socket"],
+        machine_port=config_dict["machine_port"],
+        machine_tokens=config_dict["machine_tokens"],
+        machine_rate_per_second=config_dict["machine_rate_per_second"],
+        machine_burst=config_dict["machine_burst"],
+        tls_cert_file=config_dict["tls_cert_file"],
+        tls_key_file=config_dict["tls_key_file"],
+        tls_handshake_timeout=config_dict["tls_handshake_timeout"],
+        tls_session_tickets=config_dict["tls_session_tickets"],
+        node_id=config_dict["node_id"],
+        mesh_host=config_dict["mesh_host"],
+        mesh_port=config_dict["mesh_port"],
+        mesh_peers=config_dict["mesh_peers"],
+        mesh_seen_size=config_dict["mesh_seen_size"],
+        mesh_queue_size=config_dict["mesh_queue_size"],
+        mesh_secret=config_dict["mesh_secret"],
+        max_message_length=config_dict["max_message_length"],
+        resume_grace_seconds=config_dict["resume_grace_seconds"],
+        history_join_tail=config_dict["history_join_tail"],
+        fanout_shards=config_dict["fanout_shards"],
+        spectator_max_buffer=config_dict["spectator_max_buffer"],
+        presence_window=config_dict["presence_window"],
+        presence_burst=config_dict["presence_burst"],
+        mention_history=config_dict["mention_history"],
+        mention_bell=config_dict["mention_bell"],
+        digest_max_lines=config_dict["digest_max_lines"],
+        capture_file=config_dict["capture_file"],
+        capture_anonymize=config_dict["capture_anonymize"],
+        tcp_nodelay=config_dict["tcp_nodelay"],
+        tcp_keepalive=config_dict["tcp_keepalive"],
+        tcp_keepidle=config_dict["tcp_keepidle"],
+        tcp_keepintvl=config_dict["tcp_keepintvl"],
+        tcp_keepcnt=config_dict["tcp_keepcnt"],
+        socket_sndbuf=config_dict["socket_sndbuf"],
+        socket_rcvbuf=config_dict["socket_rcvbuf"],
+        listen_backlog=config_dict["listen_backlog"],
+        write_buffer_high=config_dict["write_buffer_high"],
+        write_buffer_low=config_dict["write_buffer_low"],
+        write_stall_timeout=config_dict["write_stall_timeout"],
+        overload_enabled=config_dict["overload_enabled"],
+        overload_interval=config_dict["overload_interval"],
+        overload_queue_slow=config_dict["overload_queue_slow"],
+        overload_queue_shed=config_dict["overload_queue_shed"],
+        overload_latency_slow_ms=config_dict["overload_latency_slow_ms"],
+        overload_latency_shed_ms=config_dict["overload_latency_shed_ms"],
+        overload_lag_slow_ms=config_dict["overload_lag_slow_ms"],
+        overload_lag_shed_ms=config_dict["overload_lag_shed_ms"],
+        overload_recover_intervals=config_dict["overload_recover_intervals"],
+        archive_dir=config_dict["archive_dir"],
+        archive_segment_bytes=config_dict["archive_segment_bytes"],
+        archive_flush_interval=config_dict["archive_flush_interval"],
+        archive_batch_size=config_dict["archive_batch_size"],
+        replication_socket=config_dict["replication_socket"],
+        replication_queue_size=config_dict["replication_queue_size"],
+        standby=config_dict["standby"],
+        failover_seconds=config_dict["failover_seconds"],
+        spam_filter=spam_filter,
+        monitor=monitor,
+        overrides=overrides,
     )
 
-    loop = asyncio.new_event_loop()
+    loop = new_event_loop(config_dict["loop_backend"], config_dict["eager_tasks"])
     asyncio.set_event_loop(loop)
+    main_task = loop.create_task(server.run())
 
-    def signal_handler():
+    def shutdown():
         logger.info("Received shutdown signal")
-        loop.create_task(server.stop())
-        loop.stop()
+        main_task.cancel()
 
-    signal.signal(signal.SIGINT, lambda *_: signal_handler())
-    signal.signal(signal.SIGTERM, lambda *_: signal_handler())
+    install_signal_handlers(loop, shutdown, server.reload_settings)
 
     try:
-        loop.run_until_complete(server.run())
-    except KeyboardInterrupt:
+        loop.run_until_complete(main_task)
+    except (KeyboardInterrupt, asyncio.CancelledError):
         pass
     finally:
+        remove_signal_handlers(loop)
         loop.run_until_complete(server.stop())
         loop.close()
 
 
+@cli.command(help="Replay a capture file against a fresh server")
+@click.argument("capture_file", type=click.Path(exists=True, dir_okay=False))
+@click.option(
+    "--speed",
+    type=float,
+    default=1.0,
+    show_default=True,
+    help="Playback speed multiplier (0 replays as fast as possible)",
+)
+def replay(capture_file, speed):
+    import asyncio
+    import json
+
+    from chatserver.config import get_settings
+    from chatserver.network.replay import replay as run_replay
+    from chatserver.network.server import Server
+
+    settings = get_settings()
+    logging.basicConfig(
+        level=getattr(logging, settings.log_level.upper()),
+        format="[%(asctime)s] %(levelname)s - %(message)s",
+        datefmt="%H:%M:%S",
+    )
+
+    rate_limit = settings.rate_limit_max_messages
+    if speed != 1.0:
+        rate_limit = 1_000_000
+
+    server = Server(
+        host="127.0.0.1",
+        port=0,
+        room_name=settings.room_name,
+        max_users=settings.max_users,
+        enable_history=settings.enable_history,
+        history_size=settings.history_size,
+        plain_text=settings.plain_text,
+        rate_limit_max_messages=rate_limit,
+        rate_limit_window_seconds=settings.rate_limit_window_seconds,
+        max_message_length=settings.max_message_length,
+        resume_grace_seconds=settings.resume_grace_seconds,
+        history_join_tail=settings.history_join_tail,
+        fanout_shards=settings.fanout_shards,
+    )
+
+    async def main():
+        await server.start()
+        try:
+            return await run_replay(capture_file, server, speed)
+        finally:
+            await server.stop()
+
+    report = asyncio.run(main())
+    click.echo(json.dumps(report.summary(), indent=2))
+
+
+@cli.command(help="Write an anonymized copy of a capture file")
+@click.argument("source", type=click.Path(exists=True, dir_okay=False))
+@click.argument("destination", type=click.Path(dir_okay=False))
+def anonymize(source, destination):
+    from chatserver.network.capture import anonymize_capture
+
+    count = anonymize_capture(source, destination)
+    click.echo(f"Wrote {count} records to {destination}")
+
+
+@cli.command(help="Export archived messages in a time range")
+@click.option("--archive-dir", type=str, help="Archive directory to read")
+@click.option("--since", type=click.DateTime(), help="Earliest timestamp to export")
+@click.option("--until", type=click.DateTime(), help="Latest timestamp to export")
+@click.option(
+    "--format",
+    "output_format",
+    type=click.Choice(["text", "jsonl"]),
+    default="text",
+    show_default=True,
+)
+def export(archive_dir, since, until, output_format):
+    import json
+
+    from chatserver.config import get_settings
+    from chatserver.core.archive import export_range
+
+    directory = archive_dir or get_settings().archive_dir
+    if not directory:
+        raise click.UsageError("No archive directory given (--archive-dir)")
+
+    for record in export_range(directory, since, until):
+        if output_format == "jsonl":
+            click.echo(json.dumps(record, ensure_ascii=False))
+        elif record["is_action"]:
+            click.echo(
+                f"[{record['timestamp']}] * {record['from_user']} {record['content']}"
+            )
+        else:
+            click.echo(
+                f"[{record['timestamp']}] {record['from_user']}: {record['content']}"
+            )
+
+
 if __name__ == "__main__":
     cli()
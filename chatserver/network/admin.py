@@ -0,0 +1,267 @@
+import asyncio
+import json
+import logging
+import os
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from chatserver.core.monitor import tracemalloc_snapshot, tracemalloc_stop
+
+if TYPE_CHECKING:
+    from chatserver.network.server import Server
+
+logger = logging.getLogger(__name__)
+
+
+class AdminCommandError(Exception):
+    pass
+
+
+@dataclass
+class AdminServer:
+    path: str
+    server: "Server"
+
+    unix_server: asyncio.AbstractServer | None = field(default=None, init=False)
+    commands: dict[str, Callable[[list[str]], Awaitable[object]]] = field(
+        init=False, repr=False
+    )
+
+    def __post_init__(self):
+        self.commands = {
+            "help": self._cmd_help,
+            "connections": self._cmd_connections,
+            "stats": self._cmd_stats,
+            "kick": self._cmd_kick,
+            "ban": self._cmd_ban,
+            "unban": self._cmd_unban,
+            "bans": self._cmd_bans,
+            "ratelimit": self._cmd_ratelimit,
+            "debug": self._cmd_debug,
+            "reload": self._cmd_reload,
+            "loop": self._cmd_loop,
+            "tracemalloc": self._cmd_tracemalloc,
+        }
+
+    async def start(self):
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+        self.unix_server = await asyncio.start_unix_server(
+            self._handle_connection, path=self.path
+        )
+        os.chmod(self.path, 0o600)
+        logger.info(f"Admin socket listening on {self.path}")
+
+    async def stop(self):
+        if self.unix_server:
+            self.unix_server.close()
+            await self.unix_server.wait_closed()
+            self.unix_server = None
+
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+
+                request = line.decode("utf-8", errors="ignore").strip()
+                if not request:
+                    continue
+
+                response = await self.execute(request)
+                writer.write(json.dumps(response).encode("utf-8") + b"\n")
+                await writer.drain()
+        except Exception as e:
+            logger.error(f"Error handling admin connection: {e}")
+        finally:
+            writer.close()
+
+    async def execute(self, request: str) -> dict:
+        parts = request.split()
+        command, args = parts[0].lower(), parts[1:]
+
+        handler = self.commands.get(command)
+        if handler is None:
+            return {"ok": False, "error": f"unknown command: {command}"}
+
+        try:
+            return {"ok": True, "data": await handler(args)}
+        except AdminCommandError as e:
+            return {"ok": False, "error": str(e)}
+
+    async def _cmd_help(self, args: list[str]) -> list[str]:
+        return sorted(self.commands)
+
+    async def _cmd_connections(self, args: list[str]) -> list[dict]:
+        return [client.stats() for client in self.server.connections]
+
+    async def _cmd_stats(self, args: list[str]) -> dict:
+        room = self.server.room
+        stats = {
+            "connections": len(self.server.connections),
+            "users": room.active_count,
+            "max_users": room.max_users,
+            "queue_depth": room.queue_depth,
+            "history_size": len(room.history),
+            "history_capacity": room.history.maxlen,
+            "rate_limit_max_messages": room.rate_limit_max_messages,
+            "rate_limit_window_seconds": room.rate_limit_window_seconds,
+            "top_talkers": [
+                {"nickname": nick, "messages": count}
+                for nick, count in room.top_talkers()
+            ],
+            "banned_hosts": len(self.server.banned_hosts),
+            "reaped_peers": self.server.reaped_peers,
+            "spectators": len(room.spectators),
+            "spectators_dropped": room.spectators.dropped,
+            "presence": room.presence.stats(),
+            "mentions": {
+                "nicknames": len(room.mentions),
+                "indexed_users": len(room.mention_index),
+                "recorded": room.mention_index.recorded,
+            },
+            "fanout": room.fanout_stats(),
+            "render_cache": {
+                "entries": len(room.render_cache),
+                "hits": room.render_cache.hits,
+                "misses": room.render_cache.misses,
+            },
+        }
+
+        if room.spam_filter:
+            stats["spam"] = room.spam_filter.stats()
+
+        if self.server.overload:
+            stats["overload"] = self.server.overload.stats()
+
+        if self.server.replication:
+            stats["replication"] = self.server.replication.stats()
+
+        if self.server.archiver:
+            stats["archive"] = self.server.archiver.stats()
+
+        if self.server.machine:
+            stats["machine_clients"] = self.server.machine.stats()
+
+        mesh = self.server.mesh
+        if mesh:
+            stats["mesh"] = {
+                "node_id": mesh.node_id,
+                "received": mesh.received,
+                "duplicates": mesh.duplicates,
+                "rejected": mesh.rejected,
+                "peers": [
+                    {
+                        "address": link.address,
+                        "connected": link.connected,
+                        "pending": link.pending,
+                        "dropped": link.dropped,
+                    }
+                    for link in mesh.links.values()
+                ],
+            }
+
+        return stats
+
+    async def _cmd_kick(self, args: list[str]) -> dict:
+        if not args:
+            raise AdminCommandError("usage: kick <nickname>")
+
+        if not await self.server.kick(args[0]):
+            raise AdminCommandError(f"no such user: {args[0]}")
+
+        return {"kicked": args[0]}
+
+    async def _cmd_ban(self, args: list[str]) -> dict:
+        if not args:
+            raise AdminCommandError("usage: ban <nickname|ip>")
+
+        host = await self.server.ban(args[0])
+        if host is None:
+            raise AdminCommandError(
+                f"not a connected nickname or IP address: {args[0]}"
+            )
+        return {"banned": host}
+
+    async def _cmd_unban(self, args: list[str]) -> dict:
+        if not args:
+            raise AdminCommandError("usage: unban <host>")
+
+        if args[0] not in self.server.banned_hosts:
+            raise AdminCommandError(f"host not banned: {args[0]}")
+
+        self.server.banned_hosts.discard(args[0])
+        return {"unbanned": args[0]}
+
+    async def _cmd_bans(self, args: list[str]) -> list[str]:
+        return sorted(self.server.banned_hosts)
+
+    async def _cmd_ratelimit(self, args: list[str]) -> dict:
+        room = self.server.room
+
+        if args:
+            try:
+                max_messages = int(args[0])
+                window = int(args[1]) if len(args) > 1 else None
+            except ValueError:
+                raise AdminCommandError("usage: ratelimit [max_messages [window]]")
+
+            settings = room.settings()
+            settings["rate_limit_max_messages"] = max_messages
+            if window is not None:
+                settings["rate_limit_window_seconds"] = window
+
+            try:
+                room.apply_settings(**settings)
+            except ValueError as e:
+                raise AdminCommandError(str(e))
+
+            self.server.rate_limit_max_messages = room.rate_limit_max_messages
+            self.server.rate_limit_window_seconds = room.rate_limit_window_seconds
+
+        return {
+            "max_messages": room.rate_limit_max_messages,
+            "window_seconds": room.rate_limit_window_seconds,
+        }
+
+    async def _cmd_debug(self, args: list[str]) -> dict:
+        chat_logger = logging.getLogger("chatserver")
+
+        if args:
+            if args[0].lower() not in ("on", "off"):
+                raise AdminCommandError("usage: debug [on|off]")
+            level = logging.DEBUG if args[0].lower() == "on" else logging.NOTSET
+            chat_logger.setLevel(level)
+
+        return {"debug": chat_logger.getEffectiveLevel() <= logging.DEBUG}
+
+    async def _cmd_reload(self, args: list[str]) -> dict:
+        if not self.server.reload_settings():
+            raise AdminCommandError("invalid settings, configuration unchanged")
+
+        return self.server.room.settings()
+
+    async def _cmd_loop(self, args: list[str]) -> dict:
+        if self.server.monitor is None:
+            raise AdminCommandError("loop monitor is disabled")
+
+        return self.server.monitor.stats()
+
+    async def _cmd_tracemalloc(self, args: list[str]) -> dict:
+        action = args[0].lower() if args else "snapshot"
+
+        if action == "stop":
+            return tracemalloc_stop()
+        if action not in ("start", "snapshot"):
+            raise AdminCommandError("usage: tracemalloc [start|snapshot|stop]")
+
+        limit = int(args[1]) if len(args) > 1 and args[1].isdigit() else 10
+        return tracemalloc_snapshot(limit)
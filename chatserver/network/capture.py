@@ -0,0 +1,142 @@
+import asyncio
+import struct
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import BinaryIO
+
+MAGIC = b"MCAP\x01"
+RECORD = struct.Struct("<BIII")
+
+
+class RecordKind(IntEnum):
+    CONNECT = 1
+    LINE = 2
+    DISCONNECT = 3
+
+
+@dataclass
+class CaptureRecord:
+    kind: RecordKind
+    conn_id: int
+    offset_ms: int
+    payload: bytes = b""
+
+
+def scrub_line(line: bytes) -> bytes:
+    text = line.decode("utf-8", errors="ignore")
+
+    if text.startswith("/"):
+        command, _, rest = text.partition(" ")
+        if not rest:
+            return line
+        return f"{command} {_mask(rest)}".encode("utf-8")
+
+    return _mask(text).encode("utf-8")
+
+
+def _mask(text: str) -> str:
+    return "".join("x" if c.isalnum() else c for c in text)
+
+
+class CaptureWriter:
+    def __init__(self, path: str, anonymize: bool = False):
+        self.path = path
+        self.anonymize = anonymize
+        self.records = 0
+        self._file: BinaryIO = open(path, "wb")
+        self._file.write(MAGIC)
+        self._start = time.monotonic()
+        self._next_id = 0
+        self._lines: dict[int, int] = {}
+
+    def _offset_ms(self) -> int:
+        return int((time.monotonic() - self._start) * 1000)
+
+    def _write(self, kind: RecordKind, conn_id: int, payload: bytes = b""):
+        if self._file.closed:
+            return
+        self._file.write(RECORD.pack(kind, conn_id, self._offset_ms(), len(payload)))
+        self._file.write(payload)
+        self.records += 1
+
+    def connect(self) -> int:
+        self._next_id += 1
+        self._lines[self._next_id] = 0
+        self._write(RecordKind.CONNECT, self._next_id)
+        return self._next_id
+
+    def line(self, conn_id: int, line: bytes):
+        if self.anonymize:
+            line = anonymize_line(line, conn_id, self._lines.get(conn_id, 0))
+        self._lines[conn_id] = self._lines.get(conn_id, 0) + 1
+        self._write(RecordKind.LINE, conn_id, line)
+
+    def disconnect(self, conn_id: int):
+        self._lines.pop(conn_id, None)
+        self._write(RecordKind.DISCONNECT, conn_id)
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+
+def anonymize_line(line: bytes, conn_id: int, index: int) -> bytes:
+    if index == 0 and not line.startswith(b"/"):
+        return f"user{conn_id}\n".encode()
+    return scrub_line(line)
+
+
+class CapturingReader:
+    def __init__(
+        self, reader: asyncio.StreamReader, capture: CaptureWriter, conn_id: int
+    ):
+        self._reader = reader
+        self._capture = capture
+        self._conn_id = conn_id
+
+    @property
+    def _buffer(self) -> bytearray:
+        return self._reader._buffer
+
+    async def readline(self) -> bytes:
+        line = await self._reader.readline()
+        if line:
+            self._capture.line(self._conn_id, line)
+        return line
+
+    async def read(self, n: int = -1) -> bytes:
+        return await self._reader.read(n)
+
+
+def read_capture(path: str) -> Iterator[CaptureRecord]:
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a MeshChat capture")
+
+        while header := f.read(RECORD.size):
+            kind, conn_id, offset_ms, length = RECORD.unpack(header)
+            yield CaptureRecord(RecordKind(kind), conn_id, offset_ms, f.read(length))
+
+
+def anonymize_capture(src: str, dst: str) -> int:
+    lines: dict[int, int] = {}
+    count = 0
+
+    with open(dst, "wb") as out:
+        out.write(MAGIC)
+        for record in read_capture(src):
+            payload = record.payload
+            if record.kind == RecordKind.LINE:
+                index = lines.get(record.conn_id, 0)
+                payload = anonymize_line(payload, record.conn_id, index)
+                lines[record.conn_id] = index + 1
+
+            out.write(
+                RECORD.pack(record.kind, record.conn_id, record.offset_ms, len(payload))
+            )
+            out.write(payload)
+            count += 1
+
+    return count
@@ -0,0 +1,75 @@
+import asyncio
+import logging
+import signal
+import sys
+from collections.abc import Callable
+from enum import StrEnum
+
+logger = logging.getLogger(__name__)
+
+EAGER_TASKS_AVAILABLE = sys.version_info >= (3, 12)
+
+
+class LoopBackend(StrEnum):
+    ASYNCIO = "asyncio"
+    UVLOOP = "uvloop"
+
+
+def new_event_loop(
+    backend: LoopBackend | str = LoopBackend.ASYNCIO, eager_tasks: bool = False
+) -> asyncio.AbstractEventLoop:
+    backend = LoopBackend(backend)
+    loop = None
+
+    if backend == LoopBackend.UVLOOP:
+        try:
+            import uvloop
+
+            loop = uvloop.new_event_loop()
+        except ImportError:
+            logger.warning(
+                "uvloop is not installed, falling back to the asyncio event loop"
+            )
+
+    if loop is None:
+        loop = asyncio.new_event_loop()
+
+    if eager_tasks:
+        if EAGER_TASKS_AVAILABLE:
+            loop.set_task_factory(asyncio.eager_task_factory)
+        else:
+            logger.warning("Eager task execution needs Python 3.12+, ignoring")
+
+    return loop
+
+
+def loop_backend(loop: asyncio.AbstractEventLoop) -> LoopBackend:
+    if type(loop).__module__.startswith("uvloop"):
+        return LoopBackend.UVLOOP
+    return LoopBackend.ASYNCIO
+
+
+def install_signal_handlers(
+    loop: asyncio.AbstractEventLoop,
+    shutdown: Callable[[], None],
+    reload: Callable[[], None],
+):
+    handlers = {signal.SIGINT: shutdown, signal.SIGTERM: shutdown}
+    if hasattr(signal, "SIGHUP"):
+        handlers[signal.SIGHUP] = reload
+
+    for signum, handler in handlers.items():
+        try:
+            loop.add_signal_handler(signum, handler)
+        except NotImplementedError:
+            signal.signal(signum, lambda *_, h=handler: loop.call_soon_threadsafe(h))
+
+
+def remove_signal_handlers(loop: asyncio.AbstractEventLoop):
+    for signum in (signal.SIGINT, signal.SIGTERM, getattr(signal, "SIGHUP", None)):
+        if signum is None:
+            continue
+        try:
+            loop.remove_signal_handler(signum)
+        except NotImplementedError:
+            signal.signal(signum, signal.SIG_DFL)
@@ -0,0 +1,303 @@
+import asyncio
+import json
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from chatserver.core.exceptions import (
+    NicknameEmptyError,
+    NicknameInvalidCharsError,
+    NicknameReservedError,
+    NicknameTakenError,
+    NicknameTooLongError,
+    NicknameTooShortError,
+)
+from chatserver.core.message import Message
+from chatserver.core.room import Room
+from chatserver.core.validators import validate_nickname
+
+logger = logging.getLogger(__name__)
+
+NICKNAME_ERRORS = (
+    NicknameEmptyError,
+    NicknameInvalidCharsError,
+    NicknameReservedError,
+    NicknameTooLongError,
+    NicknameTooShortError,
+)
+
+
+@dataclass
+class TokenBucket:
+    rate: float
+    burst: float
+
+    tokens: float = field(init=False)
+    updated: float = field(default_factory=time.monotonic, init=False)
+
+    def __post_init__(self):
+        self.tokens = self.burst
+
+    def take(self, count: int, now: float | None = None) -> int:
+        if now is None:
+            now = time.monotonic()
+
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+        granted = min(count, int(self.tokens + 1e-9))
+        self.tokens -= granted
+        return granted
+
+    def retry_after(self) -> float:
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+def encode_event(event: dict) -> bytes:
+    return json.dumps(event, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+def message_event(msg: Message) -> dict:
+    event = {
+        "type": "message",
+        "seq": msg.seq,
+        "from": msg.from_user,
+        "content": msg.content,
+        "ts": msg.timestamp.isoformat(timespec="seconds"),
+    }
+    if msg.is_system:
+        event["system"] = True
+    if msg.is_action:
+        event["action"] = True
+    return event
+
+
+@dataclass
+class MachineSession:
+    name: str
+    writer: asyncio.StreamWriter
+    bucket: TokenBucket
+    subscribe: bool
+    queue_size: int
+
+    posted: int = field(default=0, init=False)
+    rejected: int = field(default=0, init=False)
+    dropped: int = field(default=0, init=False)
+
+    _queue: asyncio.Queue[bytes] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+
+    def push(self, payload: bytes):
+        try:
+            self._queue.put_nowait(payload)
+        except asyncio.QueueFull:
+            self.dropped += 1
+
+    async def reply(self, event: dict):
+        self.writer.write(encode_event(event))
+        await self.writer.drain()
+
+    async def pump(self):
+        while True:
+            payload = await self._queue.get()
+            chunks = [payload]
+            while not self._queue.empty() and len(chunks) < 256:
+                chunks.append(self._queue.get_nowait())
+
+            self.writer.write(b"".join(chunks))
+            await self.writer.drain()
+
+
+@dataclass
+class MachineServer:
+    room: Room
+    host: str
+    port: int
+    tokens: list[str]
+    rate_per_second: float = 50.0
+    burst: int = 500
+    max_batch: int = 500
+    queue_size: int = 10000
+
+    server: asyncio.Server | None = field(default=None, init=False)
+    sessions: list[MachineSession] = field(default_factory=list, init=False)
+    _buckets: dict[str, TokenBucket] = field(default_factory=dict, init=False)
+
+    async def start(self):
+        self.room.add_listener(self._on_room_message)
+        self.server = await asyncio.start_server(
+            self._handle_connection, self.host, self.port, limit=1 << 20
+        )
+        self.port = self.server.sockets[0].getsockname()[1]
+        logger.info(f"Machine protocol listening on {self.host}:{self.port}")
+
+    async def stop(self):
+        self.room.remove_listener(self._on_room_message)
+
+        if self.server:
+            self.server.close()
+            await self.server.wait_closed()
+
+        for session in self.sessions:
+            session.writer.close()
+
+    def _on_room_message(self, msg: Message):
+        subscribers = [s for s in self.sessions if s.subscribe]
+        if not subscribers:
+            return
+
+        payload = encode_event(message_event(msg))
+        for session in subscribers:
+            session.push(payload)
+
+    def _bucket(self, token: str) -> TokenBucket:
+        bucket = self._buckets.get(token)
+        if bucket is None:
+            bucket = TokenBucket(self.rate_per_second, self.burst)
+            self._buckets[token] = bucket
+        return bucket
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ):
+        session = None
+        pump = None
+
+        try:
+            session = await self._authenticate(reader, writer)
+            if session is None:
+                return
+
+            self.sessions.append(session)
+            pump = asyncio.create_task(session.pump())
+            logger.info(f"Machine client {session.name} connected")
+
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+
+                try:
+                    request = json.loads(line)
+                except ValueError:
+                    await session.reply({"type": "error", "error": "bad json"})
+                    continue
+
+                if not isinstance(request, dict):
+                    await session.reply(
+                        {"type": "error", "error": "request must be an object"}
+                    )
+                elif request.get("type") == "post":
+                    await session.reply(await self._post(session, request))
+                else:
+                    await session.reply({"type": "error", "error": "unknown request"})
+        except Exception as e:
+            logger.error(f"Error handling machine client: {e}")
+        finally:
+            if session in self.sessions:
+                self.sessions.remove(session)
+            if session is not None:
+                self.room.release_nickname(session.name)
+            if pump:
+                pump.cancel()
+            writer.close()
+
+    async def _authenticate(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> MachineSession | None:
+        line = await reader.readline()
+
+        try:
+            request = json.loads(line)
+        except ValueError:
+            request = {}
+        if not isinstance(request, dict):
+            request = {}
+
+        token = request.get("token")
+        name = str(request.get("name", ""))
+
+        error = None
+        if request.get("type") != "auth" or token not in self.tokens:
+            error = "unauthorized"
+        else:
+            try:
+                validate_nickname(name)
+            except NICKNAME_ERRORS as e:
+                error = str(e)
+            else:
+                if not self.room.reserve_nickname(name):
+                    error = str(NicknameTakenError(name))
+
+        if error:
+            writer.write(encode_event({"type": "error", "error": error}))
+            await writer.drain()
+            return None
+
+        try:
+            writer.write(encode_event({"type": "ready", "name": name}))
+            await writer.drain()
+        except Exception:
+            self.room.release_nickname(name)
+            raise
+
+        return MachineSession(
+            name=name,
+            writer=writer,
+            bucket=self._bucket(token),
+            subscribe=bool(request.get("subscribe", True)),
+            queue_size=self.queue_size,
+        )
+
+    async def _post(self, session: MachineSession, request: dict) -> dict:
+        items = request.get("messages")
+        if not isinstance(items, list):
+            return {"type": "error", "error": "messages must be a list"}
+
+        items = items[: self.max_batch]
+        scale = self.room.effective_rate_limit / self.room.rate_limit_max_messages
+        session.bucket.rate = self.rate_per_second * scale
+        session.bucket.burst = self.burst * scale
+        granted = session.bucket.take(len(items))
+        now = datetime.now()
+
+        accepted = 0
+        for item in items[:granted]:
+            content = str(item.get("content", "")) if isinstance(item, dict) else ""
+            if not content or len(content) > self.room.max_message_length:
+                continue
+
+            await self.room.broadcast(
+                Message(
+                    from_user=session.name,
+                    content=content,
+                    timestamp=now,
+                    is_action=bool(item.get("action", False)),
+                )
+            )
+            accepted += 1
+
+        rejected = len(items) - accepted
+        session.posted += accepted
+        session.rejected += rejected
+
+        ack = {"type": "ack", "accepted": accepted, "rejected": rejected}
+        if granted < len(items):
+            ack["retry_after"] = round(session.bucket.retry_after(), 3)
+        return ack
+
+    def stats(self) -> list[dict]:
+        return [
+            {
+                "name": s.name,
+                "posted": s.posted,
+                "rejected": s.rejected,
+                "dropped_events": s.dropped,
+            }
+            for s in self.sessions
+        ]
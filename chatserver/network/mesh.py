@@ -0,0 +1,260 @@
+import asyncio
+import hmac
+import ipaddress
+import json
+import logging
+from collections import deque
+from dataclasses import dataclass, field
+
+from chatserver.core.message import Message
+from chatserver.core.room import Room
+
+logger = logging.getLogger(__name__)
+
+
+def parse_peer(peer: str) -> tuple[str, int]:
+    host, _, port = peer.rpartition(":")
+    return host or "127.0.0.1", int(port)
+
+
+@dataclass
+class SeenSet:
+    max_size: int
+
+    _ids: set[str] = field(default_factory=set, init=False, repr=False)
+    _order: deque[str] = field(default_factory=deque, init=False, repr=False)
+
+    def __contains__(self, msg_id: str) -> bool:
+        return msg_id in self._ids
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def add(self, msg_id: str) -> bool:
+        if msg_id in self._ids:
+            return False
+
+        self._ids.add(msg_id)
+        self._order.append(msg_id)
+
+        if len(self._order) > self.max_size:
+            self._ids.discard(self._order.popleft())
+
+        return True
+
+
+@dataclass
+class LamportClock:
+    time: int = 0
+
+    def tick(self) -> int:
+        self.time += 1
+        return self.time
+
+    def observe(self, remote_time: int) -> int:
+        self.time = max(self.time, remote_time) + 1
+        return self.time
+
+
+@dataclass
+class PeerLink:
+    host: str
+    port: int
+    node_id: str
+    queue_size: int
+    secret: str = ""
+
+    dropped: int = field(default=0, init=False)
+    connected: bool = field(default=False, init=False)
+
+    _queue: asyncio.Queue[bytes] = field(init=False, repr=False)
+    _task: asyncio.Task | None = field(default=None, init=False, repr=False)
+
+    def __post_init__(self):
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+
+    @property
+    def address(self) -> str:
+        return f"{self.host}:{self.port}"
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def send(self, payload: bytes):
+        try:
+            self._queue.put_nowait(payload)
+        except asyncio.QueueFull:
+            self.dropped += 1
+
+    async def _run(self):
+        backoff = 0.5
+
+        while True:
+            writer = None
+            try:
+                _, writer = await asyncio.open_connection(self.host, self.port)
+                hello = {"type": "hello", "node": self.node_id, "secret": self.secret}
+                writer.write(json.dumps(hello).encode("utf-8") + b"\n")
+                await writer.drain()
+
+                self.connected = True
+                backoff = 0.5
+                logger.info(f"Mesh link to {self.address} established")
+
+                while True:
+                    payload = await self._queue.get()
+                    writer.write(payload)
+                    await writer.drain()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                if self.connected:
+                    logger.warning(f"Mesh link to {self.address} lost: {e}")
+            finally:
+                self.connected = False
+                if writer is not None:
+                    writer.close()
+
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 30.0)
+
+
+@dataclass
+class Mesh:
+    node_id: str
+    room: Room
+    host: str = "127.0.0.1"
+    port: int = 0
+    peers: list[str] = field(default_factory=list)
+    seen_size: int = 10000
+    queue_size: int = 1000
+    secret: str = ""
+
+    clock: LamportClock = field(default_factory=LamportClock, init=False)
+    seen: SeenSet = field(init=False)
+    links: dict[str, PeerLink] = field(default_factory=dict, init=False)
+    server: asyncio.Server | None = field(default=None, init=False)
+    received: int = field(default=0, init=False)
+    duplicates: int = field(default=0, init=False)
+    rejected: int = field(default=0, init=False)
+
+    def __post_init__(self):
+        self.seen = SeenSet(self.seen_size)
+
+    async def start(self):
+        self.room.add_listener(self._on_room_message)
+
+        self.server = await asyncio.start_server(
+            self._handle_peer, self.host, self.port
+        )
+        self.port = self.server.sockets[0].getsockname()[1]
+        logger.info(f"Mesh node {self.node_id} listening on {self.host}:{self.port}")
+        if not self.secret:
+            logger.warning("No mesh secret set, only loopback peers will be accepted")
+
+        for peer in self.peers:
+            self.connect(peer)
+
+    def connect(self, peer: str):
+        host, port = parse_peer(peer)
+        link = PeerLink(host, port, self.node_id, self.queue_size, self.secret)
+        self.links[link.address] = link
+        link.start()
+
+    async def stop(self):
+        self.room.remove_listener(self._on_room_message)
+
+        if self.server:
+            self.server.close()
+            await self.server.wait_closed()
+
+        await asyncio.gather(
+            *(link.stop() for link in self.links.values()), return_exceptions=True
+        )
+
+    def _on_room_message(self, msg: Message):
+        if not msg.origin:
+            msg.origin = self.node_id
+            msg.lamport = self.clock.tick()
+            self.seen.add(msg.id)
+
+        if not self.links:
+            return
+
+        frame = {"type": "message", "message": msg.to_dict()}
+        payload = json.dumps(frame).encode("utf-8") + b"\n"
+
+        for link in self.links.values():
+            link.send(payload)
+
+    async def _handle_peer(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ):
+        peer_node = "unknown"
+        authorized = False
+
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+
+                try:
+                    frame = json.loads(line)
+                except ValueError:
+                    logger.warning(f"Invalid mesh frame from {peer_node}")
+                    continue
+
+                if frame.get("type") == "hello":
+                    peer_node = frame.get("node", peer_node)
+                    if not self._authorize(frame.get("secret"), writer):
+                        self.rejected += 1
+                        logger.warning(f"Rejected unauthorized mesh peer {peer_node}")
+                        break
+                    authorized = True
+                    logger.info(f"Mesh peer {peer_node} connected")
+                elif not authorized:
+                    self.rejected += 1
+                    logger.warning(f"Mesh peer {peer_node} sent frames before hello")
+                    break
+                elif frame.get("type") == "message":
+                    await self._receive(Message.from_dict(frame["message"]))
+        except Exception as e:
+            logger.error(f"Error handling mesh peer {peer_node}: {e}")
+        finally:
+            writer.close()
+
+    def _authorize(self, secret, writer: asyncio.StreamWriter) -> bool:
+        if self.secret:
+            return isinstance(secret, str) and hmac.compare_digest(
+                secret.encode("utf-8"), self.secret.encode("utf-8")
+            )
+
+        peername = writer.get_extra_info("peername")
+        try:
+            return ipaddress.ip_address(peername[0]).is_loopback
+        except (TypeError, ValueError):
+            return False
+
+    async def _receive(self, msg: Message):
+        if not self.seen.add(msg.id):
+            self.duplicates += 1
+            return
+
+        self.received += 1
+        self.clock.observe(msg.lamport)
+        await self.room.broadcast(msg)
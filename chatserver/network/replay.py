@@ -0,0 +1,115 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+
+from chatserver.network.capture import RecordKind, read_capture
+from chatserver.network.server import Server
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ReplayConnection:
+    reader: asyncio.StreamReader
+    writer: asyncio.StreamWriter
+
+    received: int = field(default=0, init=False)
+    _task: asyncio.Task | None = field(default=None, init=False, repr=False)
+
+    def start(self):
+        self._task = asyncio.create_task(self._drain())
+
+    async def _drain(self):
+        while chunk := await self.reader.read(1 << 16):
+            self.received += len(chunk)
+
+    async def close(self):
+        if not self.writer.is_closing() and self.writer.can_write_eof():
+            self.writer.write_eof()
+
+        if self._task:
+            try:
+                await asyncio.wait_for(self._task, timeout=5.0)
+            except (asyncio.TimeoutError, ConnectionError):
+                pass
+        self.writer.close()
+
+
+@dataclass
+class ReplayReport:
+    connections: int = 0
+    lines: int = 0
+    duration: float = 0.0
+    bytes_received: int = 0
+    fanout: dict = field(default_factory=dict)
+
+    def summary(self) -> dict:
+        duration = max(self.duration, 1e-9)
+        return {
+            "connections": self.connections,
+            "lines": self.lines,
+            "duration_seconds": round(self.duration, 3),
+            "lines_per_second": round(self.lines / duration, 1),
+            "broadcasts_per_second": round(self.fanout["broadcasts"] / duration, 1),
+            "deliveries_per_second": round(self.fanout["deliveries"] / duration, 1),
+            "bytes_received": self.bytes_received,
+            "fanout": self.fanout,
+        }
+
+
+async def replay(path: str, server: Server, speed: float = 1.0) -> ReplayReport:
+    host, port = server.server.sockets[0].getsockname()[:2]
+    connections: dict[int, ReplayConnection] = {}
+    closed: list[ReplayConnection] = []
+    closing: list[asyncio.Task] = []
+    report = ReplayReport()
+
+    start = time.perf_counter()
+    for record in read_capture(path):
+        if speed > 0:
+            delay = record.offset_ms / 1000 / speed - (time.perf_counter() - start)
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+        if record.kind == RecordKind.CONNECT:
+            reader, writer = await asyncio.open_connection(host, port, limit=1 << 20)
+            connection = ReplayConnection(reader, writer)
+            connection.start()
+            connections[record.conn_id] = connection
+            report.connections += 1
+            continue
+
+        connection = connections.get(record.conn_id)
+        if connection is None:
+            continue
+
+        if record.kind == RecordKind.LINE:
+            connection.writer.write(record.payload)
+            report.lines += 1
+        else:
+            del connections[record.conn_id]
+            closed.append(connection)
+            closing.append(asyncio.create_task(connection.close()))
+
+    for connection in connections.values():
+        await connection.writer.drain()
+
+    broadcasts = -1
+    while server.room.queue_depth or broadcasts != server.room.broadcasts:
+        broadcasts = server.room.broadcasts
+        await asyncio.sleep(0.05)
+
+    report.duration = time.perf_counter() - start
+    report.fanout = server.room.fanout_stats()
+
+    closing.extend(asyncio.create_task(c.close()) for c in connections.values())
+    await asyncio.gather(*closing)
+    closed.extend(connections.values())
+
+    report.bytes_received = sum(c.received for c in closed)
+    logger.info(
+        f"Replayed {report.lines} lines over {report.connections} connections "
+        f"in {report.duration:.2f}s"
+    )
+    return report
@@ -0,0 +1,232 @@
+import asyncio
+import json
+import logging
+import os
+from dataclasses import dataclass, field
+
+from chatserver.core.message import Message
+from chatserver.core.room import Room
+
+logger = logging.getLogger(__name__)
+
+REPLICATION_QUEUE_SIZE = 10000
+
+
+def encode_message(msg: Message) -> dict:
+    return {**msg.to_dict(), "seq": msg.seq}
+
+
+def decode_message(data: dict) -> Message:
+    msg = Message.from_dict(data)
+    msg.seq = data.get("seq", 0)
+    return msg
+
+
+def encode_frame(kind: str, payload) -> bytes:
+    if kind == "message":
+        frame = {"type": kind, "message": encode_message(payload)}
+    else:
+        frame = {"type": kind, **payload}
+    return json.dumps(frame).encode("utf-8") + b"\n"
+
+
+@dataclass
+class StandbyLink:
+    writer: asyncio.StreamWriter
+    queue_size: int = REPLICATION_QUEUE_SIZE
+
+    sent: int = field(default=0, init=False)
+    overflowed: bool = field(default=False, init=False)
+
+    _queue: asyncio.Queue[tuple[str, object]] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def send(self, kind: str, payload):
+        if self.overflowed:
+            return
+        try:
+            self._queue.put_nowait((kind, payload))
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+    async def run(self):
+        while not self.overflowed:
+            kind, payload = await self._queue.get()
+            self.writer.write(encode_frame(kind, payload))
+            self.sent += 1
+
+            while not self._queue.empty() and not self.overflowed:
+                kind, payload = self._queue.get_nowait()
+                self.writer.write(encode_frame(kind, payload))
+                self.sent += 1
+
+            await self.writer.drain()
+
+
+@dataclass
+class ReplicationPrimary:
+    room: Room
+    path: str
+    queue_size: int = REPLICATION_QUEUE_SIZE
+
+    standbys: list[StandbyLink] = field(default_factory=list, init=False)
+    resyncs: int = field(default=0, init=False)
+    server: asyncio.Server | None = field(default=None, init=False, repr=False)
+
+    async def start(self):
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+        self.server = await asyncio.start_unix_server(
+            self._handle_standby, path=self.path
+        )
+        os.chmod(self.path, 0o600)
+
+        self.room.add_listener(self._on_message)
+        self.room.add_state_listener(self._on_state)
+        logger.info(f"Replication socket listening on {self.path}")
+
+    async def stop(self):
+        self.room.remove_listener(self._on_message)
+        self.room.remove_state_listener(self._on_state)
+
+        if self.server:
+            self.server.close()
+            for link in self.standbys:
+                link.writer.close()
+            await self.server.wait_closed()
+            self.server = None
+
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+    def snapshot(self) -> dict:
+        return {
+            "seq": self.room.last_seq,
+            "settings": self.room.settings(),
+            "sessions": self.room.sessions(),
+            "history": [encode_message(msg) for msg in self.room.history],
+        }
+
+    def _on_message(self, msg: Message):
+        for link in self.standbys:
+            link.send("message", msg)
+
+    def _on_state(self, kind: str, data: dict):
+        for link in self.standbys:
+            link.send(kind, data)
+
+    async def _handle_standby(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ):
+        link = StandbyLink(writer, self.queue_size)
+        link.send("snapshot", self.snapshot())
+        self.standbys.append(link)
+        logger.info("Standby connected, snapshot queued")
+
+        try:
+            await link.run()
+            if link.overflowed:
+                self.resyncs += 1
+                logger.warning("Standby fell behind, dropping it so it resyncs")
+        except Exception as e:
+            logger.warning(f"Standby link lost: {e}")
+        finally:
+            self.standbys.remove(link)
+            writer.close()
+
+    def stats(self) -> dict:
+        return {
+            "standbys": len(self.standbys),
+            "pending": sum(link.pending for link in self.standbys),
+            "sent": sum(link.sent for link in self.standbys),
+            "resyncs": self.resyncs,
+        }
+
+
+@dataclass
+class StandbyReplica:
+    room: Room
+    path: str
+    failover_seconds: float = 3.0
+    retry_interval: float = 0.5
+
+    sessions: dict[str, str] = field(default_factory=dict, init=False)
+    snapshots: int = field(default=0, init=False)
+    applied: int = field(default=0, init=False)
+
+    async def follow(self):
+        loop = asyncio.get_running_loop()
+        lost_at = None
+
+        while True:
+            try:
+                reader, writer = await asyncio.open_unix_connection(
+                    self.path, limit=1 << 24
+                )
+            except OSError:
+                if (
+                    lost_at is not None
+                    and loop.time() - lost_at >= self.failover_seconds
+                ):
+                    logger.warning(
+                        f"Primary unreachable for {self.failover_seconds}s, taking over"
+                    )
+                    return
+                await asyncio.sleep(self.retry_interval)
+                continue
+
+            logger.info(f"Following primary at {self.path}")
+            try:
+                await self._consume(reader)
+            except (ConnectionError, ValueError) as e:
+                logger.warning(f"Replication stream broken: {e}")
+            finally:
+                writer.close()
+
+            if self.snapshots:
+                lost_at = loop.time()
+                logger.warning("Lost primary, waiting before failover")
+
+    async def _consume(self, reader: asyncio.StreamReader):
+        while line := await reader.readline():
+            self.apply(json.loads(line))
+
+    def apply(self, frame: dict):
+        kind = frame.get("type")
+        if kind == "message":
+            self.room.restore_message(decode_message(frame["message"]))
+        elif kind == "session":
+            self.sessions[frame["nickname"]] = frame["token"]
+        elif kind == "leave":
+            self.sessions.pop(frame["nickname"], None)
+        elif kind == "settings":
+            self.room.apply_settings(
+                **{key: value for key, value in frame.items() if key != "type"}
+            )
+        elif kind == "snapshot":
+            self.snapshots += 1
+            self.sessions = dict(frame["sessions"])
+            self.room.restore_snapshot(
+                frame["seq"],
+                frame["settings"],
+                [decode_message(data) for data in frame["history"]],
+            )
+            logger.info(
+                f"Replica synced at seq {frame['seq']} "
+                f"({len(frame['history'])} messages, {len(self.sessions)} sessions)"
+            )
+        self.applied += 1
+
+    def promote(self):
+        self.room.restore_sessions(self.sessions)
+        logger.info(
+            f"Promoted to primary at seq {self.room.last_seq} "
+            f"with {len(self.sessions)} resumable sessions"
+        )
@@ -1,12 +1,39 @@
 import asyncio
+import ipaddress
 import logging
+import socket
+import time
 from dataclasses import dataclass, field
 
+from pydantic import ValidationError
+
+from chatserver.config import Settings, reload_settings
+from chatserver.core.archive import Archiver
+from chatserver.core.overload import OverloadController
 from chatserver.core.room import Room
+from chatserver.core.spam import SpamFilter
 from chatserver.core.client import Client
+from chatserver.core.monitor import LoopMonitor
+from chatserver.network.admin import AdminServer
+from chatserver.network.capture import CaptureWriter, CapturingReader
+from chatserver.network.machine import MachineServer
+from chatserver.network.mesh import Mesh
+from chatserver.network.replication import ReplicationPrimary, StandbyReplica
+from chatserver.network.sockopts import SocketOptions
+from chatserver.network.tls import create_server_context
 
 logger = logging.getLogger(__name__)
 
+RELOADABLE = (
+    "max_users",
+    "history_size",
+    "rate_limit_max_messages",
+    "rate_limit_window_seconds",
+    "max_message_length",
+)
+
+RESTART_REQUIRED = ("host", "port", "room_name", "plain_text", "mesh_port")
+
 
 @dataclass
 class Server:
@@ -17,69 +44,440 @@ class Server:
     enable_history: bool
     history_size: int
     plain_text: bool
+    rate_limit_max_messages: int = 5
+    rate_limit_window_seconds: int = 5
+    max_message_length: int = 1000
+    resume_grace_seconds: int = 60
+    history_join_tail: int = 20
+    fanout_shards: int = 4
+    spectator_max_buffer: int = 256 * 1024
+    presence_window: float = 2.0
+    presence_burst: int = 3
+    mention_history: int = 20
+    mention_bell: bool = False
+    digest_max_lines: int = 100
+    spam_filter: SpamFilter | None = None
+    monitor: LoopMonitor | None = None
+    admin_socket: str = ""
+    machine_port: int = 0
+    machine_tokens: list[str] = field(default_factory=list)
+    machine_rate_per_second: float = 50.0
+    machine_burst: int = 500
+    tls_cert_file: str = ""
+    tls_key_file: str = ""
+    tls_handshake_timeout: float = 5.0
+    tls_session_tickets: int = 2
+    node_id: str = ""
+    mesh_host: str = "127.0.0.1"
+    mesh_port: int = 0
+    mesh_peers: list[str] = field(default_factory=list)
+    mesh_seen_size: int = 10000
+    mesh_queue_size: int = 1000
+    mesh_secret: str = field(default="", repr=False)
+    capture_file: str = ""
+    capture_anonymize: bool = False
+    tcp_nodelay: bool = True
+    tcp_keepalive: bool = True
+    tcp_keepidle: int = 60
+    tcp_keepintvl: int = 10
+    tcp_keepcnt: int = 5
+    socket_sndbuf: int = 0
+    socket_rcvbuf: int = 0
+    listen_backlog: int = 100
+    write_buffer_high: int = 0
+    write_buffer_low: int = 0
+    write_stall_timeout: float = 30.0
+    overload_enabled: bool = True
+    overload_interval: float = 1.0
+    overload_queue_slow: int = 500
+    overload_queue_shed: int = 2000
+    overload_latency_slow_ms: float = 250.0
+    overload_latency_shed_ms: float = 1000.0
+    overload_lag_slow_ms: float = 100.0
+    overload_lag_shed_ms: float = 500.0
+    overload_recover_intervals: int = 3
+    archive_dir: str = ""
+    archive_segment_bytes: int = 64 * 1024 * 1024
+    archive_flush_interval: float = 1.0
+    archive_batch_size: int = 500
+    replication_socket: str = ""
+    replication_queue_size: int = 10000
+    standby: bool = False
+    failover_seconds: float = 3.0
+    overrides: dict = field(default_factory=dict)
 
     room: Room = field(init=False)
+    mesh: Mesh | None = field(default=None, init=False)
+    admin: AdminServer | None = field(default=None, init=False)
+    machine: MachineServer | None = field(default=None, init=False)
+    capture: CaptureWriter | None = field(default=None, init=False)
+    archiver: Archiver | None = field(default=None, init=False)
+    overload: OverloadController | None = field(default=None, init=False)
+    replication: ReplicationPrimary | None = field(default=None, init=False)
+    socket_options: SocketOptions = field(init=False)
+    reaped_peers: int = field(default=0, init=False)
+    _reaper: asyncio.Task | None = field(default=None, init=False, repr=False)
+    banned_hosts: set[str] = field(default_factory=set, init=False)
+    _handlers: set[asyncio.Task] = field(default_factory=set, init=False, repr=False)
     server: asyncio.Server | None = field(default=None, init=False)
-    connections: list[Client] = field(default_factory=list, init=False)
+    connections: set[Client] = field(default_factory=set, init=False)
 
     def __post_init__(self):
+        self.socket_options = SocketOptions(
+            nodelay=self.tcp_nodelay,
+            keepalive=self.tcp_keepalive,
+            keepidle=self.tcp_keepidle,
+            keepintvl=self.tcp_keepintvl,
+            keepcnt=self.tcp_keepcnt,
+            sndbuf=self.socket_sndbuf,
+            rcvbuf=self.socket_rcvbuf,
+            write_buffer_high=self.write_buffer_high,
+            write_buffer_low=self.write_buffer_low,
+        )
+
         self.room = Room(
             name=self.room_name,
             max_users=self.max_users,
             enable_history=self.enable_history,
             history_size=self.history_size,
             plain_text=self.plain_text,
+            rate_limit_max_messages=self.rate_limit_max_messages,
+            rate_limit_window_seconds=self.rate_limit_window_seconds,
+            max_message_length=self.max_message_length,
+            resume_grace_seconds=self.resume_grace_seconds,
+            history_join_tail=self.history_join_tail,
+            fanout_shards=self.fanout_shards,
+            spectator_max_buffer=self.spectator_max_buffer,
+            presence_window=self.presence_window,
+            presence_burst=self.presence_burst,
+            mention_history=self.mention_history,
+            mention_bell=self.mention_bell,
+            digest_max_lines=self.digest_max_lines,
+            spam_filter=self.spam_filter,
         )
 
+        if self.admin_socket:
+            self.admin = AdminServer(self.admin_socket, self)
+
+        if self.overload_enabled:
+            self.overload = OverloadController(
+                room=self.room,
+                monitor=self.monitor,
+                interval=self.overload_interval,
+                queue_slow=self.overload_queue_slow,
+                queue_shed=self.overload_queue_shed,
+                latency_slow_ms=self.overload_latency_slow_ms,
+                latency_shed_ms=self.overload_latency_shed_ms,
+                lag_slow_ms=self.overload_lag_slow_ms,
+                lag_shed_ms=self.overload_lag_shed_ms,
+                recover_intervals=self.overload_recover_intervals,
+            )
+
+        if self.archive_dir:
+            self.archiver = Archiver(
+                room=self.room,
+                directory=self.archive_dir,
+                segment_bytes=self.archive_segment_bytes,
+                flush_interval=self.archive_flush_interval,
+                batch_size=self.archive_batch_size,
+            )
+
+        if self.machine_port:
+            self.machine = MachineServer(
+                room=self.room,
+                host=self.host,
+                port=self.machine_port,
+                tokens=self.machine_tokens,
+                rate_per_second=self.machine_rate_per_second,
+                burst=self.machine_burst,
+            )
+
+        if self.mesh_port or self.mesh_peers:
+            self.mesh = Mesh(
+                node_id=self.node_id or f"{socket.gethostname()}:{self.port}",
+                room=self.room,
+                host=self.mesh_host,
+                port=self.mesh_port,
+                peers=self.mesh_peers,
+                seen_size=self.mesh_seen_size,
+                queue_size=self.mesh_queue_size,
+                secret=self.mesh_secret,
+            )
+
     async def start(self):
+        if self.monitor:
+            self.monitor.start()
+
         self.room.start()
 
+        if self.overload:
+            self.overload.start()
+
+        if self.archiver:
+            await self.archiver.start()
+
+        if self.mesh:
+            await self.mesh.start()
+
+        if self.replication_socket:
+            self.replication = ReplicationPrimary(
+                self.room, self.replication_socket, self.replication_queue_size
+            )
+            await self.replication.start()
+
+        if self.admin:
+            await self.admin.start()
+
+        if self.machine:
+            await self.machine.start()
+
+        if self.capture_file:
+            self.capture = CaptureWriter(self.capture_file, self.capture_anonymize)
+            logger.info(f"Capturing inbound traffic to {self.capture_file}")
+
+        tls_kwargs = {}
+        if self.tls_cert_file:
+            tls_kwargs = {
+                "ssl": create_server_context(
+                    self.tls_cert_file,
+                    self.tls_key_file or self.tls_cert_file,
+                    self.tls_session_tickets,
+                ),
+                "ssl_handshake_timeout": self.tls_handshake_timeout,
+            }
+
         self.server = await asyncio.start_server(
-            self._handle_connection, self.host, self.port
+            self._handle_connection,
+            self.host,
+            self.port,
+            backlog=self.listen_backlog,
+            **tls_kwargs,
         )
 
+        if self.write_stall_timeout > 0:
+            self._reaper = asyncio.create_task(self._reap_stalled_peers())
+
         addr = self.server.sockets[0].getsockname()
         logger.info(
             f"Server started on {addr[0]}:{addr[1]} (room: {self.room_name}, max users: {self.max_users})"
         )
-        logger.info(f"Connect with: nc localhost {self.port}")
+        if tls_kwargs:
+            logger.info(
+                f"Connect with: openssl s_client -quiet -connect localhost:{addr[1]}"
+            )
+        else:
+            logger.info(f"Connect with: nc localhost {addr[1]}")
 
     async def _handle_connection(
         self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
     ):
         addr = writer.get_extra_info("peername")
+
+        if addr and addr[0] in self.banned_hosts:
+            logger.info(f"Rejected connection from banned host {addr[0]}")
+            writer.close()
+            return
+
         logger.info(f"New connection from {addr}")
+        self.socket_options.apply(writer)
+
+        conn_id = None
+        if self.capture:
+            conn_id = self.capture.connect()
+            reader = CapturingReader(reader, self.capture, conn_id)
 
-        client = Client(reader, writer, self.room)
-        self.connections.append(client)
+        address = f"{addr[0]}:{addr[1]}" if addr else ""
+        client = Client(reader, writer, self.room, address=address)
+        self.connections.add(client)
+
+        handler = asyncio.current_task()
+        self._handlers.add(handler)
 
         try:
             if await client.initialize():
-                await client.handle()
+                if client.spectating:
+                    self.connections.discard(client)
+                    client = None
+                    await self._spectate(reader, writer)
+                else:
+                    await client.handle()
         except Exception as e:
             logger.error(f"Error handling connection: {e}")
         finally:
-            if client in self.connections:
-                self.connections.remove(client)
-            await client.close()
+            self._handlers.discard(handler)
+            if client is None:
+                writer.close()
+            else:
+                self.connections.discard(client)
+                await client.close()
+            if self.capture and conn_id is not None:
+                self.capture.disconnect(conn_id)
             logger.info(f"Connection from {addr} closed")
 
+    async def _spectate(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ):
+        spectators = self.room.spectators
+        spectators.add(writer.transport)
+        try:
+            while await reader.read(4096):
+                pass
+        finally:
+            spectators.remove(writer.transport)
+
+    async def _reap_stalled_peers(self):
+        interval = min(self.write_stall_timeout / 2, 5.0)
+        while True:
+            await asyncio.sleep(interval)
+            now = time.monotonic()
+
+            for client in list(self.connections):
+                transport = client.writer.transport
+                if transport is None or transport.is_closing():
+                    continue
+
+                high_water = transport.get_write_buffer_limits()[1]
+                if transport.get_write_buffer_size() <= high_water:
+                    client.stalled_since = 0.0
+                elif not client.stalled_since:
+                    client.stalled_since = now
+                elif now - client.stalled_since >= self.write_stall_timeout:
+                    self._reap(client)
+
+    def _reap(self, client: Client):
+        logger.warning(
+            f"Dropping stalled peer {client.nickname or client.address} "
+            f"({client.write_buffer_size} bytes unsent)"
+        )
+        self.reaped_peers += 1
+        client.quitting = True
+        client.writer.transport.abort()
+
+    def reload_settings(self) -> bool:
+        try:
+            settings = reload_settings()
+            values = Settings.model_validate(
+                {**settings.model_dump(), **self.overrides}
+            ).model_dump()
+            self.room.apply_settings(**{key: values[key] for key in RELOADABLE})
+        except (ValidationError, ValueError) as e:
+            logger.error(f"Invalid settings, keeping current configuration: {e}")
+            return False
+
+        for key in RESTART_REQUIRED:
+            if values[key] != getattr(self, key):
+                logger.warning(f"Setting '{key}' changed but requires a restart")
+
+        for key in RELOADABLE:
+            setattr(self, key, values[key])
+
+        level = logging.getLevelName(values["log_level"].upper())
+        if isinstance(level, int):
+            logging.getLogger().setLevel(level)
+
+        logger.info(
+            f"Settings reloaded (max users: {self.max_users}, "
+            f"history size: {self.history_size}, "
+            f"rate limit: {self.rate_limit_max_messages}/"
+            f"{self.rate_limit_window_seconds}s)"
+        )
+        return True
+
+    def find_client(self, nickname: str) -> Client | None:
+        for client in self.connections:
+            if client.nickname == nickname:
+                return client
+        return None
+
+    async def kick(self, nickname: str, reason: str = "kicked") -> bool:
+        client = self.find_client(nickname)
+        if client is None:
+            return False
+
+        logger.info(f"Kicking {nickname} ({reason})")
+        client.quitting = True
+        await client.send_system_message(f"You have been {reason} by an operator.")
+        await client.close()
+        return True
+
+    async def ban(self, target: str) -> str | None:
+        client = self.find_client(target)
+        if client:
+            host = client.address.rpartition(":")[0]
+        else:
+            try:
+                host = str(ipaddress.ip_address(target))
+            except ValueError:
+                return None
+
+        self.banned_hosts.add(host)
+
+        for other in list(self.connections):
+            if other.address.rpartition(":")[0] == host:
+                await self.kick(other.nickname, reason="banned")
+
+        return host
+
     async def stop(self):
         logger.info("Stopping server...")
 
+        if self.admin:
+            await self.admin.stop()
+
+        if self.machine:
+            await self.machine.stop()
+
+        if self._reaper:
+            self._reaper.cancel()
+            self._reaper = None
+
         if self.server:
             self.server.close()
             await self.server.wait_closed()
 
+        self.room.spectators.close()
+
         close_tasks = [client.close() for client in self.connections]
         await asyncio.gather(*close_tasks, return_exceptions=True)
 
+        if self._handlers:
+            await asyncio.wait(set(self._handlers), timeout=5.0)
+
+        if self.mesh:
+            await self.mesh.stop()
+
+        if self.replication:
+            await self.replication.stop()
+
+        if self.overload:
+            await self.overload.stop()
+
         await self.room.stop()
 
+        if self.archiver:
+            await self.archiver.stop()
+
+        if self.capture:
+            self.capture.close()
+            logger.info(f"Captured {self.capture.records} records")
+
+        if self.monitor:
+            await self.monitor.stop()
+
         logger.info("Server stopped")
 
     async def run(self):
-        await self.start()
+        if self.standby:
+            replica = StandbyReplica(
+                self.room, self.replication_socket, self.failover_seconds
+            )
+            await replica.follow()
+            for key in RELOADABLE:
+                setattr(self, key, getattr(self.room, key))
+            await self.start()
+            replica.promote()
+        else:
+            await self.start()
 
         async with self.server:
             await self.server.serve_forever()
@@ -0,0 +1,55 @@
+import asyncio
+import logging
+import socket
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+KEEPIDLE_OPTION = getattr(
+    socket, "TCP_KEEPIDLE", getattr(socket, "TCP_KEEPALIVE", None)
+)
+
+
+@dataclass
+class SocketOptions:
+    nodelay: bool = True
+    keepalive: bool = True
+    keepidle: int = 60
+    keepintvl: int = 10
+    keepcnt: int = 5
+    sndbuf: int = 0
+    rcvbuf: int = 0
+    write_buffer_high: int = 0
+    write_buffer_low: int = 0
+
+    def apply(self, writer: asyncio.StreamWriter):
+        sock = writer.get_extra_info("socket")
+        if sock is not None and sock.family in (socket.AF_INET, socket.AF_INET6):
+            try:
+                self._apply_socket(sock)
+            except OSError as e:
+                logger.warning(f"Could not apply socket options: {e}")
+
+        if self.write_buffer_high:
+            writer.transport.set_write_buffer_limits(
+                high=self.write_buffer_high, low=self.write_buffer_low or None
+            )
+
+    def _apply_socket(self, sock: socket.socket):
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, int(self.nodelay))
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, int(self.keepalive))
+
+        if self.keepalive:
+            if KEEPIDLE_OPTION is not None:
+                sock.setsockopt(socket.IPPROTO_TCP, KEEPIDLE_OPTION, self.keepidle)
+            if hasattr(socket, "TCP_KEEPINTVL"):
+                sock.setsockopt(
+                    socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, self.keepintvl
+                )
+            if hasattr(socket, "TCP_KEEPCNT"):
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPCNT, self.keepcnt)
+
+        if self.sndbuf:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, self.sndbuf)
+        if self.rcvbuf:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, self.rcvbuf)
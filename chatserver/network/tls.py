@@ -0,0 +1,14 @@
+import ssl
+
+
+def create_server_context(
+    cert_file: str, key_file: str, session_tickets: int = 2
+) -> ssl.SSLContext:
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.minimum_version = ssl.TLSVersion.TLSv1_2
+    context.load_cert_chain(cert_file, key_file)
+
+    context.options &= ~ssl.OP_NO_TICKET
+    context.num_tickets = session_tickets
+
+    return context
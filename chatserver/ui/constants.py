@@ -13,6 +13,7 @@ RESET = "\033[0m"
 BOLD = "\033[1m"
 ITALIC = "\033[3m"
 DIM = "\033[2m"
+REVERSE = "\033[7m"
 
 SYSTEM_COLOR = "\033[38;5;77m"
 ACCENT_COLOR = "\033[38;5;141m"
@@ -23,3 +24,18 @@ CLEAR_LINE = "\033[2K"
 CURSOR_TO_START = "\033[0G"
 
 INPUT_PROMPT = "> "
+
+USER_COLORS_16 = [
+    "\033[94m",
+    "\033[95m",
+    "\033[92m",
+    "\033[33m",
+    "\033[35m",
+    "\033[96m",
+    "\033[93m",
+    "\033[91m",
+]
+
+SYSTEM_COLOR_16 = "\033[32m"
+ACCENT_COLOR_16 = "\033[35m"
+INFO_COLOR_16 = "\033[34m"
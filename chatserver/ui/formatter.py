@@ -1,83 +1,195 @@
+import functools
+import textwrap
+from enum import StrEnum
+from typing import TYPE_CHECKING
+
 from chatserver.ui.constants import (
     USER_COLORS,
+    USER_COLORS_16,
     RESET,
     BOLD,
     ITALIC,
     DIM,
+    REVERSE,
     SYSTEM_COLOR,
+    SYSTEM_COLOR_16,
     ACCENT_COLOR,
+    ACCENT_COLOR_16,
     INFO_COLOR,
+    INFO_COLOR_16,
 )
 
+if TYPE_CHECKING:
+    from chatserver.core.message import Message
+
+
+class TerminalProfile(StrEnum):
+    ANSI256 = "256"
+    ANSI16 = "16"
+    PLAIN = "plain"
+
+
+def user_color_index(username: str) -> int:
+    return sum(ord(c) * (i * 7 + 13) for i, c in enumerate(username))
+
 
 def get_user_color(username: str) -> str:
-    hash_val = sum(ord(c) * (i * 7 + 13) for i, c in enumerate(username))
-    return USER_COLORS[hash_val % len(USER_COLORS)]
+    return USER_COLORS[user_color_index(username) % len(USER_COLORS)]
+
+
+WELCOME_HINT = (
+    "Type a message and press Enter to send. Use /help to see available commands."
+)
+
+HELP_COMMANDS = (
+    ("/who [prefix]", "Show users in the room, optionally by nickname prefix"),
+    ("/me <action>", "Perform an action"),
+    ("/history [n]", "Show recent messages (/history before <seq> [n] for older)"),
+    ("/mentions [n]", "Show recent messages that mention you (/mentions bell on|off)"),
+    ("/mode <256|16|plain> [width]", "Choose colors and line wrapping"),
+    ("/digest <seconds|off>", "Receive new messages in one block per interval"),
+    ("/help", "Show this help message"),
+    ("/quit", "Leave the chat"),
+)
 
 
 class Formatter:
-    def __init__(self, plain_text: bool = False):
-        self.plain_text = plain_text
+    def __init__(
+        self,
+        plain_text: bool = False,
+        profile: TerminalProfile | None = None,
+        width: int = 0,
+    ):
+        if profile is None:
+            profile = TerminalProfile.PLAIN if plain_text else TerminalProfile.ANSI256
+
+        self.profile = profile
+        self.width = width
+        self.plain_text = profile == TerminalProfile.PLAIN
+
+        if profile == TerminalProfile.ANSI16:
+            self.user_colors = USER_COLORS_16
+            self.system_color = SYSTEM_COLOR_16
+            self.accent_color = ACCENT_COLOR_16
+            self.info_color = INFO_COLOR_16
+        else:
+            self.user_colors = USER_COLORS
+            self.system_color = SYSTEM_COLOR
+            self.accent_color = ACCENT_COLOR
+            self.info_color = INFO_COLOR
+
+    @property
+    def profile_key(self) -> tuple[TerminalProfile, int]:
+        return self.profile, self.width
+
+    def user_color(self, username: str) -> str:
+        return self.user_colors[user_color_index(username) % len(self.user_colors)]
+
+    def format_message(self, msg: "Message", mention: bool = False) -> str:
+        if msg.is_system:
+            return self.format_system_message(msg.content)
+        if msg.is_action:
+            line = self.format_action_message(msg.from_user, msg.content)
+        else:
+            time_str = msg.timestamp.strftime("%H:%M:%S")
+            line = self.format_user_message(msg.from_user, msg.content, time_str)
+
+        return self.format_mention(line) if mention else line
+
+    def format_mention(self, line: str) -> str:
+        if self.plain_text:
+            return f">> {line}"
+        return f"{self.accent_color}{REVERSE}{BOLD}@{RESET} {line}"
+
+    def _wrap(self, message: str, prefix_len: int) -> str:
+        if not self.width or prefix_len + len(message) <= self.width:
+            return message
+
+        lines = textwrap.wrap(message, max(self.width - prefix_len, 10))
+        return ("\r\n" + " " * prefix_len).join(lines)
 
     def format_system_message(self, message: str) -> str:
+        message = self._wrap(message, len("[System] "))
         if self.plain_text:
             return f"[System] {message}"
-        return f"{SYSTEM_COLOR}{BOLD}[System]{RESET} {SYSTEM_COLOR}{message}{RESET}"
+        return (
+            f"{self.system_color}{BOLD}[System]{RESET} "
+            f"{self.system_color}{message}{RESET}"
+        )
 
     def format_user_message(self, username: str, message: str, timestamp: str) -> str:
+        message = self._wrap(message, len(timestamp) + len(username) + 5)
         if self.plain_text:
             return f"[{timestamp}] {username}: {message}"
 
-        color = get_user_color(username)
+        color = self.user_color(username)
         return f"{DIM}[{timestamp}]{RESET} {color}{BOLD}{username}:{RESET} {message}"
 
     def format_action_message(self, username: str, action: str) -> str:
+        action = self._wrap(action, len(username) + 3)
         if self.plain_text:
             return f"* {username} {action}"
 
-        color = get_user_color(username)
+        color = self.user_color(username)
         return f"{color}{ITALIC}* {username} {action}{RESET}"
 
     def format_title(self, title: str) -> str:
         if self.plain_text:
             return f"=== {title} ==="
-        return f"{ACCENT_COLOR}{BOLD}=== {title} ==={RESET}"
+        return f"{self.accent_color}{BOLD}=== {title} ==={RESET}"
 
     def format_banner(self, banner: str) -> str:
         if self.plain_text:
             return banner
-        return f"{SYSTEM_COLOR}{BOLD}{banner}{RESET}"
+        return f"{self.system_color}{BOLD}{banner}{RESET}"
 
     def format_welcome_message(self, room_name: str, nickname: str) -> str:
         if self.plain_text:
-            return f"Welcome to {room_name}, {nickname}!\n\nType a message and press Enter to send. Use /help to see available commands."
+            return f"Welcome to {room_name}, {nickname}!\n\n{WELCOME_HINT}"
 
-        return f"{ACCENT_COLOR}{BOLD}Welcome to {INFO_COLOR}{room_name}{ACCENT_COLOR}, {nickname}!{RESET}\n\nType a message and press Enter to send. Use /help to see available commands."
+        return (
+            f"{self.accent_color}{BOLD}Welcome to {self.info_color}{room_name}"
+            f"{self.accent_color}, {nickname}!{RESET}\n\n{WELCOME_HINT}"
+        )
 
     def format_help(self) -> str:
         if self.plain_text:
-            return """Available Commands:
-/who - Show all users in the room
-/me <action> - Perform an action
-/help - Show this help message
-/quit - Leave the chat"""
-
-        return f"""{ACCENT_COLOR}{BOLD}Available Commands:{RESET}
-{INFO_COLOR}{BOLD}/who{RESET} - Show all users in the room
-{INFO_COLOR}{BOLD}/me <action>{RESET} - Perform an action
-{INFO_COLOR}{BOLD}/help{RESET} - Show this help message
-{INFO_COLOR}{BOLD}/quit{RESET} - Leave the chat"""
-
-    def format_user_list(self, room_name: str, users: list[str], max_users: int) -> str:
-        if self.plain_text:
-            result = f"Users in {room_name} ({len(users)}/{max_users}):\n"
-            for user in users:
-                result += f"- {user}\n"
-            return result.rstrip()
+            lines = ["Available Commands:"]
+            lines.extend(f"{command} - {text}" for command, text in HELP_COMMANDS)
+            return "\n".join(lines)
+
+        lines = [f"{self.accent_color}{BOLD}Available Commands:{RESET}"]
+        lines.extend(
+            f"{self.info_color}{BOLD}{command}{RESET} - {text}"
+            for command, text in HELP_COMMANDS
+        )
+        return "\n".join(lines)
+
+    def format_user_list(
+        self, room_name: str, users: list[str], max_users: int, match: str = ""
+    ) -> str:
+        title = f"Users in {room_name}"
+        if match:
+            title += f" matching '{match}'"
 
-        result = f"{ACCENT_COLOR}{BOLD}Users in {room_name} {INFO_COLOR}({len(users)}/{max_users}):{RESET}\n"
-        for user in users:
-            color = get_user_color(user)
-            result += f"{DIM}- {RESET}{color}{BOLD}{user}{RESET}\n"
-
-        return result.rstrip()
+        if self.plain_text:
+            lines = [f"{title} ({len(users)}/{max_users}):"]
+            lines.extend(f"- {user}" for user in users)
+            return "\n".join(lines)
+
+        lines = [
+            f"{self.accent_color}{BOLD}{title} "
+            f"{self.info_color}({len(users)}/{max_users}):{RESET}"
+        ]
+        lines.extend(
+            f"{DIM}- {RESET}{self.user_color(user)}{BOLD}{user}{RESET}"
+            for user in users
+        )
+        return "\n".join(lines)
+
+
+@functools.lru_cache(maxsize=64)
+def shared_formatter(
+    profile: TerminalProfile = TerminalProfile.ANSI256, width: int = 0
+) -> Formatter:
+    return Formatter(profile=profile, width=width)
@@ -0,0 +1,60 @@
+from chatserver.core.message import Message
+from chatserver.ui.formatter import Formatter
+
+
+class RenderCache:
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self._entries: dict[tuple, bytes] = {}
+        self._groups: dict[int, list[tuple]] = {}
+        self._seq = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def render(
+        self, msg: Message, formatter: Formatter, mention: bool = False
+    ) -> bytes:
+        if not msg.seq:
+            return f"{formatter.format_message(msg, mention)}\r\n".encode("utf-8")
+
+        key = (msg.seq, formatter.profile_key, mention)
+        data = self._entries.get(key)
+        if data is not None:
+            self.hits += 1
+            if msg.seq != self._seq:
+                self._groups[msg.seq] = self._groups.pop(msg.seq)
+                self._seq = msg.seq
+            return data
+
+        self.misses += 1
+        data = f"{formatter.format_message(msg, mention)}\r\n".encode("utf-8")
+        self._store(msg.seq, key, data)
+        return data
+
+    def resize(self, capacity: int):
+        self.capacity = capacity
+        self._evict()
+
+    def clear(self):
+        self._entries.clear()
+        self._groups.clear()
+
+    def _store(self, seq: int, key: tuple, data: bytes):
+        self._entries[key] = data
+
+        group = self._groups.pop(seq, None)
+        if group is None:
+            group = []
+        group.append(key)
+        self._groups[seq] = group
+        self._seq = seq
+        self._evict()
+
+    def _evict(self):
+        while len(self._groups) > self.capacity:
+            oldest = next(iter(self._groups))
+            for key in self._groups.pop(oldest):
+                self._entries.pop(key, None)
@@ -0,0 +1,60 @@
+import asyncio
+import re
+
+import pytest
+
+from chatserver.network.server import Server
+
+
+@pytest.fixture
+def make_server():
+    def factory(**kwargs) -> Server:
+        options = {
+            "host": "127.0.0.1",
+            "port": 0,
+            "room_name": "Test",
+            "max_users": 10,
+            "enable_history": True,
+            "history_size": 50,
+            "plain_text": True,
+        }
+        options.update(kwargs)
+        return Server(**options)
+
+    return factory
+
+
+async def wait_for(predicate, timeout=2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        if asyncio.get_running_loop().time() > deadline:
+            raise AssertionError("condition not met in time")
+        await asyncio.sleep(0.01)
+
+
+async def connect(server: Server):
+    port = server.server.sockets[0].getsockname()[1]
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    await reader.readuntil(b"nickname: ")
+    return reader, writer
+
+
+async def send_line(writer: asyncio.StreamWriter, line: str):
+    writer.write(f"{line}\n".encode())
+    await writer.drain()
+
+
+async def join(server: Server, nickname: str):
+    reader, writer = await connect(server)
+    await send_line(writer, nickname)
+    data = await reader.readuntil(b"> ")
+    return reader, writer, data.decode()
+
+
+async def read_until(reader: asyncio.StreamReader, text: str) -> str:
+    data = await asyncio.wait_for(reader.readuntil(text.encode()), timeout=2.0)
+    return data.decode()
+
+
+def resume_token(output: str) -> str:
+    return re.search(r"Resume token: (\S+)", output).group(1)
@@ -0,0 +1,144 @@
+import asyncio
+import json
+import logging
+
+import pytest
+
+from chatserver.config import reload_settings
+from chatserver.network.admin import AdminServer
+from test.conftest import join
+
+
+async def admin_request(path: str, command: str) -> dict:
+    reader, writer = await asyncio.open_unix_connection(path)
+    writer.write(f"{command}\n".encode())
+    await writer.drain()
+    response = json.loads(await reader.readline())
+    writer.close()
+    return response
+
+
+@pytest.mark.asyncio
+async def test_admin_stats_and_connections(tmp_path, make_server):
+    path = str(tmp_path / "admin.sock")
+    server = make_server(admin_socket=path)
+    await server.start()
+
+    _, writer, _ = await join(server, "Alice")
+
+    stats = await admin_request(path, "stats")
+    assert stats["ok"]
+    assert stats["data"]["users"] == 1
+    assert stats["data"]["history_capacity"] == 50
+
+    connections = await admin_request(path, "connections")
+    assert connections["data"][0]["nickname"] == "Alice"
+    assert "idle_seconds" in connections["data"][0]
+
+    writer.close()
+    await server.stop()
+
+
+@pytest.mark.asyncio
+async def test_admin_kick_and_ban(tmp_path, make_server):
+    path = str(tmp_path / "admin.sock")
+    server = make_server(admin_socket=path)
+    await server.start()
+    port = server.server.sockets[0].getsockname()[1]
+
+    reader, alice, _ = await join(server, "Alice")
+
+    response = await admin_request(path, "ban Alice")
+    assert response["data"] == {"banned": "127.0.0.1"}
+
+    data = await reader.read()
+    assert b"banned" in data
+
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    assert await reader.read() == b""
+    writer.close()
+    alice.close()
+
+    response = await admin_request(path, "kick Nobody")
+    assert not response["ok"]
+
+    response = await admin_request(path, "ban Nobody")
+    assert not response["ok"]
+    assert "Nobody" not in server.banned_hosts
+
+    response = await admin_request(path, "ban 10.0.0.7")
+    assert response["data"] == {"banned": "10.0.0.7"}
+
+    await server.stop()
+
+
+@pytest.mark.asyncio
+async def test_admin_ratelimit_and_debug(make_server):
+    server = make_server()
+    admin = AdminServer("unused", server)
+
+    notices = []
+    server.room.add_state_listener(lambda kind, data: notices.append((kind, data)))
+
+    response = await admin.execute("ratelimit 20 10")
+    assert response["data"] == {"max_messages": 20, "window_seconds": 10}
+    assert server.room.rate_limit_max_messages == 20
+    assert notices == [("settings", server.room.settings())]
+    assert notices[0][1]["rate_limit_window_seconds"] == 10
+
+    response = await admin.execute("ratelimit zero")
+    assert not response["ok"]
+
+    response = await admin.execute("ratelimit 0")
+    assert not response["ok"]
+    assert server.room.rate_limit_max_messages == 20
+    assert len(notices) == 1
+
+    response = await admin.execute("debug on")
+    assert response["data"]["debug"]
+    await admin.execute("debug off")
+    logging.getLogger("chatserver").setLevel(logging.NOTSET)
+
+    response = await admin.execute("bogus")
+    assert not response["ok"]
+
+
+@pytest.mark.asyncio
+async def test_admin_reload(monkeypatch, make_server):
+    server = make_server()
+    server.overrides = {"max_users": 10}
+    admin = AdminServer("unused", server)
+
+    monkeypatch.setenv("MESHCHAT_MAX_USERS", "99")
+    monkeypatch.setenv("MESHCHAT_HISTORY_SIZE", "5")
+    monkeypatch.setenv("MESHCHAT_RATE_LIMIT_MAX_MESSAGES", "50")
+
+    response = await admin.execute("reload")
+    assert response["data"]["max_users"] == 10
+    assert response["data"]["history_size"] == 5
+    assert server.room.history.maxlen == 5
+    assert server.room.rate_limit_max_messages == 50
+
+    monkeypatch.setenv("MESHCHAT_MAX_USERS", "many")
+    response = await admin.execute("reload")
+    assert not response["ok"]
+    assert server.room.rate_limit_max_messages == 50
+
+    before = server.room.settings()
+    monkeypatch.setenv("MESHCHAT_MAX_USERS", "20")
+    monkeypatch.setenv("MESHCHAT_RATE_LIMIT_MAX_MESSAGES", "7")
+    monkeypatch.setenv("MESHCHAT_HISTORY_SIZE", "-1")
+    response = await admin.execute("reload")
+    assert not response["ok"]
+    assert server.room.settings() == before
+    assert server.room.history.maxlen == 5
+
+    monkeypatch.setenv("MESHCHAT_HISTORY_SIZE", "5")
+    server.overrides["max_users"] = 0
+    response = await admin.execute("reload")
+    assert not response["ok"]
+    assert server.room.settings() == before
+    assert server.max_users == 10
+
+    monkeypatch.undo()
+    reload_settings()
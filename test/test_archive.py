@@ -0,0 +1,110 @@
+import asyncio
+import os
+from datetime import datetime, timedelta
+
+import pytest
+
+from chatserver.core.archive import Archiver, export_range, read_index
+from chatserver.core.message import Message
+from chatserver.core.room import Room
+
+START = datetime(2024, 5, 1, 12, 0, 0)
+
+
+async def archive_messages(directory: str, count: int, **kwargs) -> Archiver:
+    room = Room("Test", 10, False, 50, True)
+    room.start()
+    archiver = Archiver(room, directory, **kwargs)
+    await archiver.start()
+
+    for i in range(count):
+        msg = Message("Alice", f"line {i}", START + timedelta(minutes=i))
+        await room.broadcast(msg)
+        await asyncio.sleep(0)
+
+    while room.queue_depth:
+        await asyncio.sleep(0.01)
+    await archiver.stop()
+    await room.stop()
+    return archiver
+
+
+@pytest.mark.asyncio
+async def test_archiver_batches_into_gzip_members(tmp_path):
+    archiver = await archive_messages(str(tmp_path), 25, batch_size=10)
+
+    assert archiver.archived == 25
+    segments = [n for n in os.listdir(tmp_path) if n.endswith(".jsonl.gz")]
+    assert len(segments) == 1
+
+    index = read_index(str(tmp_path / segments[0].replace(".jsonl.gz", ".idx")))
+    assert len(index) >= 3
+    assert index[0].first_seq == 1
+    assert index[-1].last_seq == 25
+
+    records = list(export_range(str(tmp_path)))
+    assert [r["content"] for r in records] == [f"line {i}" for i in range(25)]
+    assert records[0]["seq"] == 1
+
+
+@pytest.mark.asyncio
+async def test_export_skips_unrelated_segments(tmp_path):
+    await archive_messages(str(tmp_path), 30, batch_size=5, segment_bytes=1)
+
+    segments = sorted(n for n in os.listdir(tmp_path) if n.endswith(".jsonl.gz"))
+    assert len(segments) > 2
+    (tmp_path / segments[0]).write_bytes(b"corrupt")
+
+    since = START + timedelta(minutes=20)
+    until = START + timedelta(minutes=22)
+    records = list(export_range(str(tmp_path), since, until))
+
+    assert [r["content"] for r in records] == ["line 20", "line 21", "line 22"]
+
+
+async def _settle(archiver: Archiver, archived: int):
+    for _ in range(200):
+        if archiver.archived >= archived:
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("archiver did not catch up")
+
+
+@pytest.mark.asyncio
+async def test_archiver_retries_failed_batches_and_survives_rotation(tmp_path):
+    room = Room("Test", 10, False, 50, True)
+    room.start()
+    archiver = Archiver(room, str(tmp_path), flush_interval=0.02, batch_size=5)
+    await archiver.start()
+
+    write_batch = archiver._write_batch
+    calls = []
+
+    def flaky_write(batch):
+        calls.append(len(batch))
+        if len(calls) == 1:
+            raise OSError("disk full")
+        if len(calls) == 2:
+            raise ValueError("unexpected")
+        write_batch(batch)
+
+    archiver._write_batch = flaky_write
+    for i in range(5):
+        await room.broadcast(
+            Message("Alice", f"line {i}", START + timedelta(minutes=i))
+        )
+    await _settle(archiver, 5)
+    assert archiver.failures == 2
+
+    os.remove(tmp_path / archiver.segment)
+    for i in range(5, 10):
+        await room.broadcast(
+            Message("Alice", f"line {i}", START + timedelta(minutes=i))
+        )
+    await _settle(archiver, 10)
+
+    await archiver.stop()
+    await room.stop()
+
+    records = list(export_range(str(tmp_path)))
+    assert [r["content"] for r in records] == [f"line {i}" for i in range(5, 10)]
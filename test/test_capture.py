@@ -0,0 +1,92 @@
+import asyncio
+
+import pytest
+
+from chatserver.network.capture import (
+    CaptureWriter,
+    RecordKind,
+    anonymize_capture,
+    read_capture,
+    scrub_line,
+)
+from chatserver.network.replay import replay
+from test.conftest import connect, read_until, send_line
+
+
+def test_capture_round_trip(tmp_path):
+    path = tmp_path / "traffic.mcap"
+    capture = CaptureWriter(str(path))
+    conn_id = capture.connect()
+    capture.line(conn_id, b"Alice\n")
+    capture.line(conn_id, b"hello\n")
+    capture.disconnect(conn_id)
+    capture.close()
+
+    records = list(read_capture(str(path)))
+    assert [r.kind for r in records] == [
+        RecordKind.CONNECT,
+        RecordKind.LINE,
+        RecordKind.LINE,
+        RecordKind.DISCONNECT,
+    ]
+    assert {r.conn_id for r in records} == {conn_id}
+    assert records[2].payload == b"hello\n"
+
+
+def test_read_capture_rejects_other_files(tmp_path):
+    path = tmp_path / "junk"
+    path.write_bytes(b"not a capture")
+
+    with pytest.raises(ValueError):
+        list(read_capture(str(path)))
+
+
+def test_scrub_line_keeps_shape():
+    assert scrub_line(b"hi Bob, lunch?\n") == b"xx xxx, xxxxx?\n"
+    assert scrub_line(b"/me waves at Bob\n") == b"/me xxxxx xx xxx\n"
+    assert scrub_line(b"/who\n") == b"/who\n"
+
+
+def test_anonymize_capture(tmp_path):
+    source = tmp_path / "raw.mcap"
+    capture = CaptureWriter(str(source))
+    conn_id = capture.connect()
+    capture.line(conn_id, b"Alice\n")
+    capture.line(conn_id, b"secret plans\n")
+    capture.close()
+
+    destination = tmp_path / "anon.mcap"
+    assert anonymize_capture(str(source), str(destination)) == 3
+
+    payloads = [r.payload for r in read_capture(str(destination))]
+    assert payloads == [b"", f"user{conn_id}\n".encode(), b"xxxxxx xxxxx\n"]
+
+
+@pytest.mark.asyncio
+async def test_capture_and_replay(tmp_path, make_server):
+    path = tmp_path / "traffic.mcap"
+    server = make_server(capture_file=str(path), rate_limit_max_messages=100)
+    await server.start()
+
+    reader, writer = await connect(server)
+    for line in ("Alice", "first", "second"):
+        await send_line(writer, line)
+    await read_until(reader, "second")
+    writer.close()
+    await asyncio.sleep(0.1)
+    await server.stop()
+
+    lines = [r.payload for r in read_capture(str(path)) if r.kind == RecordKind.LINE]
+    assert lines == [b"Alice\n", b"first\n", b"second\n"]
+
+    target = make_server(rate_limit_max_messages=100)
+    await target.start()
+    report = await replay(str(path), target, speed=0)
+    await target.stop()
+
+    summary = report.summary()
+    assert summary["connections"] == 1
+    assert summary["lines"] == 3
+    assert summary["fanout"]["broadcasts"] == 3
+    assert target.room.message_counts["Alice"] == 2
+    assert report.bytes_received > 0
@@ -0,0 +1,424 @@
+import asyncio
+import re
+import tracemalloc
+from datetime import datetime
+
+import pytest
+
+from chatserver.core import client as client_module
+from chatserver.core.client import Client
+from chatserver.core.message import Message
+from test.conftest import connect, join, read_until, resume_token, send_line, wait_for
+
+
+@pytest.mark.asyncio
+async def test_resume_catches_up_missed_messages(make_server):
+    server = make_server()
+    await server.start()
+
+    alice_reader, alice_writer, alice_output = await join(server, "Alice")
+    bob_reader, bob_writer, _ = await join(server, "Bob")
+    await read_until(alice_reader, "Bob has joined")
+    token = resume_token(alice_output)
+
+    alice_writer.close()
+    await asyncio.sleep(0.1)
+    assert server.room.clients["Alice"] is None
+
+    await send_line(bob_writer, "while you were away")
+    await read_until(bob_reader, "while you were away")
+
+    reader, writer = await connect(server)
+    await send_line(writer, f"/resume {token}")
+    output = await read_until(reader, "Resume token")
+
+    assert "Welcome back, Alice!" in output
+    assert "while you were away" in output
+    assert "Bob has joined" not in output
+    assert "MeshChat" not in output
+    assert server.room.clients["Alice"] is not None
+
+    await send_line(bob_writer, "/who")
+    roster = await read_until(bob_reader, "> ")
+    assert "has left" not in roster
+    assert "has joined" not in roster
+
+    writer.close()
+    bob_writer.close()
+    await server.stop()
+
+
+@pytest.mark.asyncio
+async def test_resume_takes_over_connection_that_still_looks_open(make_server):
+    server = make_server()
+    await server.start()
+
+    old_reader, old_writer, old_output = await join(server, "Alice")
+    bob_reader, bob_writer, _ = await join(server, "Bob")
+    await read_until(old_reader, "Bob has joined")
+    token = resume_token(old_output)
+
+    reader, writer = await connect(server)
+    await send_line(writer, f"/resume {token}")
+    output = await read_until(reader, "Resume token")
+
+    assert "Welcome back, Alice!" in output
+    assert await asyncio.wait_for(old_reader.read(), timeout=2.0) is not None
+    assert old_reader.at_eof()
+
+    await send_line(bob_writer, "still here?")
+    assert "still here?" in await read_until(reader, "still here?")
+
+    await send_line(bob_writer, "/who")
+    roster = await read_until(bob_reader, "> ")
+    assert "Alice has" not in roster
+    assert server.room.clients["Alice"] is not None
+    assert server.room.active_count == 2
+
+    old_writer.close()
+    writer.close()
+    bob_writer.close()
+    await server.stop()
+
+
+@pytest.mark.asyncio
+async def test_resume_during_broadcasts_delivers_each_message_once(make_server):
+    server = make_server(history_size=500)
+    await server.start()
+
+    _, writer, output = await join(server, "Alice")
+    token = resume_token(output)
+    writer.close()
+    await wait_for(lambda: server.room.clients["Alice"] is None)
+
+    async def chatter():
+        for i in range(300):
+            await server.room.broadcast(Message("Bob", f"burst {i}", datetime.now()))
+            await asyncio.sleep(0)
+
+    sender = asyncio.create_task(chatter())
+    reader, writer = await connect(server)
+    await send_line(writer, f"/resume {token}")
+    output = await read_until(reader, "burst 299\r\n")
+    await sender
+
+    assert re.findall(r"burst (\d+)", output) == [str(i) for i in range(300)]
+
+    writer.close()
+    await server.stop()
+
+
+class StuckTransport:
+    def __init__(self):
+        self.stuck = False
+        self.buffered = 0
+
+    def get_write_buffer_size(self) -> int:
+        return self.buffered
+
+    def get_write_buffer_limits(self) -> tuple[int, int]:
+        return 0, 65536
+
+    def abort(self):
+        pass
+
+
+class StuckWriter:
+    def __init__(self):
+        self.transport = StuckTransport()
+
+    def is_closing(self) -> bool:
+        return False
+
+    def write(self, data: bytes):
+        if self.transport.stuck:
+            self.transport.buffered += len(data)
+
+
+@pytest.mark.asyncio
+async def test_take_over_replays_messages_that_never_left_the_socket(make_server):
+    server = make_server()
+    room = server.room
+    client = Client(asyncio.StreamReader(), StuckWriter(), room, nickname="Alice")
+    client.resume_token = "token"
+    await room.join(client)
+
+    for seq in range(1, 4):
+        if seq == 2:
+            client.writer.transport.stuck = True
+        client.deliver(Message("Bob", f"line {seq}", datetime.now(), seq=seq))
+
+    assert client.last_seq == 1
+    assert room.resume("token").last_seq == 1
+    await room.stop()
+
+
+@pytest.mark.asyncio
+async def test_resume_token_expires(make_server):
+    server = make_server(resume_grace_seconds=0.1)
+    await server.start()
+
+    _, writer, output = await join(server, "Alice")
+    token = resume_token(output)
+    writer.close()
+
+    await asyncio.sleep(0.3)
+    assert "Alice" not in server.room.clients
+
+    reader, writer = await connect(server)
+    await send_line(writer, f"/resume {token}")
+    assert "invalid or has expired" in await read_until(reader, "nickname: ")
+
+    writer.close()
+    await server.stop()
+
+
+@pytest.mark.asyncio
+async def test_quit_releases_nickname_immediately(make_server):
+    server = make_server()
+    await server.start()
+
+    reader, writer, _ = await join(server, "Alice")
+    await send_line(writer, "/quit")
+    await reader.read()
+    await asyncio.sleep(0.1)
+
+    assert "Alice" not in server.room.clients
+
+    await server.stop()
+
+
+@pytest.mark.asyncio
+async def test_history_command_pages_by_sequence(make_server):
+    server = make_server(history_join_tail=2, rate_limit_max_messages=100)
+    await server.start()
+
+    reader, writer, _ = await join(server, "Alice")
+    for i in range(5):
+        await send_line(writer, f"line {i}")
+        await read_until(reader, f"line {i}")
+
+    _, late_writer, late_output = await join(server, "Bob")
+    assert "line 3" in late_output
+    assert "line 2" not in late_output
+    await read_until(reader, "Bob has joined")
+
+    await send_line(writer, "/history 2")
+    output = await read_until(reader, "> ")
+    assert "line 4" in output and "Bob has joined" in output
+    assert "line 3" not in output
+
+    seq = server.room.history[-1].seq
+    await send_line(writer, f"/history before {seq - 1} 2")
+    output = await read_until(reader, "> ")
+    assert f"#{seq - 3} " in output and f"#{seq - 2} " in output
+    assert "line 4" not in output
+
+    await send_line(writer, "/history before")
+    assert "Usage: /history" in await read_until(reader, "> ")
+
+    writer.close()
+    late_writer.close()
+    await server.stop()
+
+
+@pytest.mark.asyncio
+async def test_history_command_caps_page_at_newest_messages(make_server):
+    server = make_server(history_size=500, history_join_tail=0)
+    await server.start()
+    for i in range(500):
+        await server.room.broadcast(Message("Bob", f"old {i}", datetime.now()))
+    await wait_for(lambda: server.room.last_seq == 500)
+
+    reader, writer, _ = await join(server, "Alice")
+
+    await send_line(writer, "/history 1000")
+    seqs = [int(n) for n in re.findall(r"#(\d+) ", await read_until(reader, "> "))]
+    assert seqs == list(range(302, 502))
+
+    await send_line(writer, "/history before 401 1000")
+    seqs = [int(n) for n in re.findall(r"#(\d+) ", await read_until(reader, "> "))]
+    assert seqs == list(range(201, 401))
+
+    writer.close()
+    await server.stop()
+
+
+@pytest.mark.asyncio
+async def test_mode_command_switches_profile(make_server):
+    server = make_server(plain_text=False)
+    await server.start()
+
+    reader, writer, _ = await join(server, "Alice")
+
+    await send_line(writer, "/mode plain 80")
+    output = await read_until(reader, "> ")
+    assert "Display mode set to plain, wrapped at 80 columns." in output
+
+    await send_line(writer, "hello")
+    assert "\033[" not in await read_until(reader, "> ")
+
+    await send_line(writer, "/mode sepia")
+    assert "Usage: /mode" in await read_until(reader, "> ")
+
+    writer.close()
+    await server.stop()
+
+
+@pytest.mark.asyncio
+async def test_who_lists_active_users_by_prefix(make_server):
+    server = make_server()
+    await server.start()
+
+    reader, writer, _ = await join(server, "alice")
+    _, bob_writer, _ = await join(server, "Bob")
+    _, albert_writer, _ = await join(server, "Albert")
+    await read_until(reader, "Albert has joined")
+
+    pending_reader, pending_writer = await connect(server)
+    await send_line(writer, "/who")
+    output = await read_until(reader, "> ")
+    assert "(3/10)" in output
+    assert output.index("Albert") < output.index("alice") < output.index("Bob")
+
+    await send_line(writer, "/who AL")
+    output = await read_until(reader, "> ")
+    assert "matching 'AL' (2/10)" in output
+    assert "Bob" not in output
+
+    renders = server.room.roster.renders
+    await send_line(writer, "/who")
+    await read_until(reader, "> ")
+    assert server.room.roster.renders == renders
+
+    for other in (writer, bob_writer, albert_writer, pending_writer):
+        other.close()
+    await server.stop()
+
+
+@pytest.mark.asyncio
+async def test_spectator_receives_broadcasts_without_joining(make_server):
+    server = make_server(max_users=1)
+    await server.start()
+
+    spectator_reader, spectator_writer = await connect(server)
+    await send_line(spectator_writer, "/spectate")
+    await read_until(spectator_reader, "You are spectating")
+    await asyncio.sleep(0.05)
+
+    assert len(server.room.spectators) == 1
+    assert server.connections == set()
+
+    reader, writer, _ = await join(server, "Alice")
+    await send_line(writer, "hello watchers")
+    output = await read_until(spectator_reader, "hello watchers")
+    assert "Alice has joined" in output
+
+    await send_line(spectator_writer, "ignored")
+    await read_until(reader, "hello watchers")
+    assert "ignored" not in server.room.get_user_list()
+    assert server.room.message_counts["Alice"] == 1
+
+    spectator_writer.close()
+    await asyncio.sleep(0.05)
+    assert len(server.room.spectators) == 0
+
+    writer.close()
+    await server.stop()
+
+
+@pytest.mark.asyncio
+async def test_mentions_are_highlighted_and_indexed(make_server):
+    server = make_server()
+    await server.start()
+
+    alice_reader, alice_writer, _ = await join(server, "Alice")
+    bob_reader, bob_writer, _ = await join(server, "Bob")
+    await read_until(alice_reader, "Bob has joined")
+
+    await send_line(alice_writer, "/mentions bell on")
+    await read_until(alice_reader, "Mention bell is on")
+
+    await send_line(bob_writer, "hi @alice, see @nobody")
+    output = await read_until(alice_reader, "@nobody\r\n")
+    assert ">> [" in output
+    assert (await alice_reader.readexactly(1)) == b"\a"
+
+    output = await read_until(bob_reader, "@nobody\r\n")
+    assert ">>" not in output
+
+    await send_line(alice_writer, "/mentions")
+    output = await read_until(alice_reader, "> ")
+    assert "#3 [" in output
+    assert "Bob: hi @alice" in output
+
+    await send_line(bob_writer, "/mentions")
+    output = await read_until(bob_reader, "> ")
+    assert "Nobody has mentioned you yet." in output
+
+    alice_writer.close()
+    bob_writer.close()
+    await server.stop()
+
+
+@pytest.mark.asyncio
+async def test_digest_mode_batches_messages(monkeypatch, make_server):
+    monkeypatch.setattr(client_module, "MIN_DIGEST_SECONDS", 0.1)
+    server = make_server(digest_max_lines=2)
+    await server.start()
+
+    alice_reader, alice_writer, _ = await join(server, "Alice")
+    bob_reader, bob_writer, _ = await join(server, "Bob")
+    await read_until(alice_reader, "Bob has joined")
+
+    await send_line(alice_writer, "/digest 0.3")
+    await read_until(alice_reader, "in one block.\r\n")
+    await send_line(alice_writer, "/digest")
+    await read_until(alice_reader, "(currently every 0.3s)")
+
+    for i in range(3):
+        await send_line(bob_writer, f"update {i}")
+        await read_until(bob_reader, f"update {i}")
+
+    output = await read_until(alice_reader, "update 2\r\n")
+    block = output[output.index("--- 3 new messages ---") :]
+    assert block.splitlines()[1] == "(1 older messages skipped, see /history)"
+    assert "update 0" not in block
+    assert "Bob: update 1\r\n[" in block
+    assert "> " not in output
+
+    await send_line(alice_writer, "/digest off")
+    await read_until(alice_reader, "Digest mode off.")
+    await read_until(alice_reader, "> ")
+
+    alice_writer.close()
+    bob_writer.close()
+    await server.stop()
+
+
+class IdleWriter:
+    __slots__ = ("transport",)
+
+    def __init__(self):
+        self.transport = None
+
+
+@pytest.mark.asyncio
+async def test_idle_connections_fit_memory_budget(make_server):
+    count = 100_000
+    server = make_server(max_users=count)
+
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        for _ in range(count):
+            client = Client(asyncio.StreamReader(), IdleWriter(), server.room)
+            server.connections.add(client)
+        per_connection = (tracemalloc.get_traced_memory()[0] - before) / count
+    finally:
+        tracemalloc.stop()
+
+    assert per_connection < 600
+    assert len({id(client.formatter) for client in server.connections}) == 1
+    assert all(client._write_lock is None for client in server.connections)
+    await server.room.stop()
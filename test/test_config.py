@@ -1,4 +1,7 @@
-from chatserver.config import get_settings
+import pytest
+from pydantic import ValidationError
+
+from chatserver.config import get_settings, reload_settings
 
 
 def test_config_settings():
@@ -20,3 +23,37 @@ def test_config_immutable():
     settings2 = get_settings()
 
     assert settings1 is settings2
+
+
+def test_reload_settings(monkeypatch):
+    original = get_settings()
+
+    monkeypatch.setenv("MESHCHAT_RATE_LIMIT_MAX_MESSAGES", "42")
+    reloaded = reload_settings()
+
+    assert reloaded is not original
+    assert reloaded.rate_limit_max_messages == 42
+    assert get_settings() is reloaded
+
+    monkeypatch.undo()
+    reload_settings()
+
+
+def test_reload_settings_invalid(monkeypatch):
+    original = get_settings()
+
+    monkeypatch.setenv("MESHCHAT_MAX_USERS", "not-a-number")
+    with pytest.raises(ValidationError):
+        reload_settings()
+
+    assert get_settings() is original
+
+
+def test_reload_settings_out_of_range(monkeypatch):
+    original = get_settings()
+
+    monkeypatch.setenv("MESHCHAT_HISTORY_SIZE", "-1")
+    with pytest.raises(ValidationError):
+        reload_settings()
+
+    assert get_settings() is original
@@ -0,0 +1,60 @@
+import asyncio
+import os
+import signal
+import sys
+
+from chatserver.network.eventloop import (
+    EAGER_TASKS_AVAILABLE,
+    LoopBackend,
+    install_signal_handlers,
+    loop_backend,
+    new_event_loop,
+    remove_signal_handlers,
+)
+
+
+def test_uvloop_falls_back_to_asyncio_when_missing(monkeypatch):
+    monkeypatch.setitem(sys.modules, "uvloop", None)
+
+    loop = new_event_loop("uvloop")
+    try:
+        assert isinstance(loop, asyncio.BaseEventLoop)
+        assert loop_backend(loop) == LoopBackend.ASYNCIO
+    finally:
+        loop.close()
+
+
+def test_eager_tasks_only_on_supported_pythons():
+    loop = new_event_loop(LoopBackend.ASYNCIO, eager_tasks=True)
+    try:
+        factory = loop.get_task_factory()
+        if EAGER_TASKS_AVAILABLE:
+            assert factory is asyncio.eager_task_factory
+        else:
+            assert factory is None
+    finally:
+        loop.close()
+
+
+def test_signals_are_dispatched_through_the_loop():
+    loop = new_event_loop()
+    events = []
+
+    async def main():
+        install_signal_handlers(
+            loop, lambda: events.append("shutdown"), lambda: events.append("reload")
+        )
+        os.kill(os.getpid(), signal.SIGHUP)
+        os.kill(os.getpid(), signal.SIGTERM)
+        for _ in range(10):
+            await asyncio.sleep(0.01)
+            if len(events) == 2:
+                break
+
+    try:
+        loop.run_until_complete(main())
+    finally:
+        remove_signal_handlers(loop)
+        loop.close()
+
+    assert events == ["reload", "shutdown"]
@@ -0,0 +1,113 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from chatserver.core.fanout import Delivery, DeliveryShard
+from chatserver.core.message import Message
+from chatserver.core.room import Room
+
+
+class FakeClient:
+    def __init__(self, nickname: str, backlogged: bool = False):
+        self.nickname = nickname
+        self.full_room_rejection = False
+        self.backlogged = backlogged
+        self.received: list[str] = []
+        self.drains = 0
+
+    def deliver(self, msg: Message) -> bool:
+        self.received.append(msg.content)
+        return self.backlogged
+
+    async def drain(self):
+        self.drains += 1
+
+
+def test_shard_membership():
+    shard = DeliveryShard(0, lambda delivery, count: None)
+    alice, bob = FakeClient("Alice"), FakeClient("Bob")
+
+    shard.add(alice)
+    shard.add(alice)
+    shard.add(bob)
+    assert shard.clients == (alice, bob)
+
+    assert shard.remove(alice)
+    assert not shard.remove(alice)
+    assert shard.clients == (bob,)
+
+
+@pytest.mark.asyncio
+async def test_shard_drains_only_backlogged_clients():
+    done = []
+    shard = DeliveryShard(0, lambda delivery, count: done.append(count))
+    fast, slow = FakeClient("Fast"), FakeClient("Slow", backlogged=True)
+    shard.add(fast)
+    shard.add(slow)
+    shard.start()
+
+    await shard.submit(Delivery(Message("Alice", "hi", datetime.now()), 0.0, 1))
+    await asyncio.sleep(0.05)
+
+    assert fast.received == slow.received == ["hi"]
+    assert (fast.drains, slow.drains) == (0, 1)
+    assert done == [2]
+    await shard.stop()
+
+
+class StuckClient(FakeClient):
+    async def drain(self):
+        self.drains += 1
+        await asyncio.Event().wait()
+
+
+@pytest.mark.asyncio
+async def test_stuck_client_does_not_hold_up_its_shard():
+    done = []
+    shard = DeliveryShard(
+        0, lambda delivery, count: done.append(count), drain_timeout=0.05
+    )
+    stuck = StuckClient("Stuck", backlogged=True)
+    slow = FakeClient("Slow", backlogged=True)
+    shard.add(stuck)
+    shard.add(slow)
+    shard.start()
+
+    for i in range(5):
+        await shard.submit(Delivery(Message("Alice", f"m{i}", datetime.now()), 0.0, 1))
+    await asyncio.sleep(0.2)
+
+    assert len(done) == 5
+    assert (stuck.drains, slow.drains) == (1, 5)
+    assert shard.lagging == {stuck}
+
+    stuck.backlogged = False
+    await shard.submit(Delivery(Message("Alice", "m5", datetime.now()), 0.0, 1))
+    await asyncio.sleep(0.05)
+    assert not shard.lagging
+    await shard.stop()
+
+
+@pytest.mark.asyncio
+async def test_room_spreads_clients_across_shards():
+    room = Room("Test", 10, False, 50, True, fanout_shards=3, presence_window=0)
+    room.start()
+
+    clients = [FakeClient(f"user{i}") for i in range(6)]
+    for client in clients:
+        await room.join(client)
+    assert [len(shard) for shard in room.shards] == [2, 2, 2]
+
+    await room.leave(clients[0])
+    assert sum(len(shard) for shard in room.shards) == 5
+
+    await room.broadcast(Message("user1", "hello", datetime.now()))
+    await asyncio.sleep(0.05)
+
+    assert all(c.received[-1] == "hello" for c in clients[1:])
+    assert "hello" not in clients[0].received
+    assert room.queue_depth == 0
+    assert room.fanout_stats()["broadcasts"] == 8
+
+    await room.stop()
@@ -1,5 +1,5 @@
 from chatserver.ui.banner import BANNER
-from chatserver.ui.formatter import Formatter, get_user_color
+from chatserver.ui.formatter import Formatter, TerminalProfile, get_user_color
 
 
 def test_formatter_plain_text():
@@ -142,3 +142,24 @@ def test_banner_format():
     assert "╔" in BANNER
     assert "║" in BANNER
     assert "╚" in BANNER
+
+
+def test_formatter_profiles():
+    ansi16 = Formatter(profile=TerminalProfile.ANSI16)
+    msg = ansi16.format_system_message("Test")
+    assert "\033[32m" in msg
+    assert "38;5" not in msg
+
+    plain = Formatter(profile=TerminalProfile.PLAIN)
+    assert plain.plain_text
+    assert plain.format_system_message("Test") == "[System] Test"
+
+
+def test_formatter_width_wrapping():
+    formatter = Formatter(profile=TerminalProfile.PLAIN, width=30)
+    wrapped = formatter.format_user_message("Alice", "word " * 10, "12:00:00")
+
+    lines = wrapped.split("\r\n")
+    assert len(lines) > 1
+    assert all(len(line) <= 30 for line in lines)
+    assert lines[1].startswith(" " * len("[12:00:00] Alice: "))
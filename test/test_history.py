@@ -0,0 +1,81 @@
+from datetime import datetime
+
+import pytest
+
+from chatserver.core.history import History
+from chatserver.core.message import Message
+
+
+def make_history(maxlen: int, count: int) -> History:
+    history = History(maxlen)
+    for seq in range(1, count + 1):
+        history.append(Message("Alice", f"Message {seq}", datetime.now(), seq=seq))
+    return history
+
+
+def seqs(messages) -> list[int]:
+    return [msg.seq for msg in messages]
+
+
+def test_history_ring_buffer():
+    history = make_history(3, 5)
+
+    assert len(history) == 3
+    assert seqs(history) == [3, 4, 5]
+    assert history[0].seq == 3
+    assert history[-1].seq == 5
+    assert history.first_seq == 3
+    assert history.last_seq == 5
+
+    with pytest.raises(IndexError):
+        history[3]
+
+
+def test_history_tail():
+    history = make_history(10, 15)
+
+    assert seqs(history.tail(3)) == [13, 14, 15]
+    assert seqs(history.tail(50)) == list(range(6, 16))
+    assert seqs(history.tail(0)) == []
+
+
+def test_history_since_and_before():
+    history = make_history(10, 15)
+
+    assert seqs(history.since(12)) == [13, 14, 15]
+    assert seqs(history.since(0)) == list(range(6, 16))
+    assert seqs(history.before(9, 2)) == [7, 8]
+    assert seqs(history.before(7, 5)) == [6]
+    assert seqs(history.before(3, 5)) == []
+
+
+def test_history_iterator_skips_evicted_messages():
+    history = make_history(3, 3)
+    messages = history.since(0)
+
+    assert next(messages).seq == 1
+    history.append(Message("Bob", "Late", datetime.now(), seq=4))
+    history.append(Message("Bob", "Later", datetime.now(), seq=5))
+
+    assert seqs(messages) == [3]
+
+
+def test_history_resize():
+    history = make_history(5, 7)
+
+    history.resize(2)
+    assert seqs(history) == [6, 7]
+
+    history.resize(4)
+    history.append(Message("Alice", "Next", datetime.now(), seq=8))
+    assert seqs(history) == [6, 7, 8]
+    assert history.maxlen == 4
+
+
+def test_history_empty():
+    history = History(0)
+    history.append(Message("Alice", "Dropped", datetime.now(), seq=1))
+
+    assert not history
+    assert history.first_seq is None
+    assert list(history.since(0)) == []
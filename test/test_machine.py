@@ -0,0 +1,210 @@
+import asyncio
+import json
+
+import pytest
+
+from chatserver.core.overload import LoadLevel
+from chatserver.core.room import Room
+from chatserver.network.machine import MachineServer, MachineSession, TokenBucket
+
+
+def test_token_bucket():
+    bucket = TokenBucket(rate=10, burst=5)
+    start = bucket.updated
+
+    assert bucket.take(8, now=start) == 5
+    assert bucket.take(1, now=start) == 0
+    assert bucket.retry_after() == pytest.approx(0.1)
+    assert bucket.take(8, now=start + 0.3) == 3
+
+
+async def open_bot(server: MachineServer, token: str, name: str = "ci-bot", **extra):
+    reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+    auth = {"type": "auth", "token": token, "name": name, **extra}
+    writer.write(json.dumps(auth).encode() + b"\n")
+    await writer.drain()
+    return reader, writer, json.loads(await reader.readline())
+
+
+async def next_event(reader: asyncio.StreamReader, event_type: str) -> dict:
+    while True:
+        line = await asyncio.wait_for(reader.readline(), timeout=2.0)
+        event = json.loads(line)
+        if event["type"] == event_type:
+            return event
+
+
+async def start_machine(**kwargs) -> MachineServer:
+    room = Room("Test", 10, True, 50, True)
+    room.start()
+    server = MachineServer(room, "127.0.0.1", 0, tokens=["secret"], **kwargs)
+    await server.start()
+    return server
+
+
+@pytest.mark.asyncio
+async def test_machine_rejects_bad_token():
+    server = await start_machine()
+
+    reader, writer, reply = await open_bot(server, "wrong")
+    assert reply == {"type": "error", "error": "unauthorized"}
+    assert await reader.read() == b""
+
+    writer.close()
+    await server.stop()
+    await server.room.stop()
+
+
+@pytest.mark.asyncio
+async def test_machine_batch_post_and_event_stream():
+    server = await start_machine()
+
+    reader, writer, reply = await open_bot(server, "secret")
+    assert reply == {"type": "ready", "name": "ci-bot"}
+
+    batch = {
+        "type": "post",
+        "messages": [{"content": "build 1 passed"}, {"content": "build 2 failed"}],
+    }
+    writer.write(json.dumps(batch).encode() + b"\n")
+    await writer.drain()
+
+    ack = await next_event(reader, "ack")
+    assert ack == {"type": "ack", "accepted": 2, "rejected": 0}
+
+    event = await next_event(reader, "message")
+    assert event["from"] == "ci-bot"
+    assert event["content"] == "build 1 passed"
+    assert "\033[" not in json.dumps(event)
+
+    await asyncio.sleep(0.05)
+    assert [m.content for m in server.room.history] == [
+        "build 1 passed",
+        "build 2 failed",
+    ]
+
+    writer.close()
+    await server.stop()
+    await server.room.stop()
+
+
+@pytest.mark.asyncio
+async def test_machine_quota_limits_batches():
+    server = await start_machine(rate_per_second=1, burst=3)
+
+    reader, writer, _ = await open_bot(server, "secret", subscribe=False)
+
+    batch = {"type": "post", "messages": [{"content": f"m{i}"} for i in range(5)]}
+    writer.write(json.dumps(batch).encode() + b"\n")
+    await writer.drain()
+
+    ack = await next_event(reader, "ack")
+    assert ack["accepted"] == 3
+    assert ack["rejected"] == 2
+    assert ack["retry_after"] > 0
+
+    writer.close()
+    await server.stop()
+    await server.room.stop()
+
+
+@pytest.mark.asyncio
+async def test_machine_name_is_reserved_while_connected():
+    server = await start_machine()
+    assert server.room.reserve_nickname("Alice")
+
+    reader, writer, reply = await open_bot(server, "secret", name="Alice")
+    assert reply["type"] == "error"
+    assert "already taken" in reply["error"]
+    writer.close()
+
+    reader, writer, reply = await open_bot(server, "secret")
+    assert reply["type"] == "ready"
+    assert not server.room.reserve_nickname("ci-bot")
+
+    writer.close()
+    for _ in range(50):
+        await asyncio.sleep(0.01)
+        if "ci-bot" not in server.room.clients:
+            break
+    assert server.room.reserve_nickname("ci-bot")
+
+    await server.stop()
+    await server.room.stop()
+
+
+@pytest.mark.asyncio
+async def test_machine_quota_follows_overload_level():
+    server = await start_machine(rate_per_second=1, burst=8)
+    server.room.rate_limit_max_messages = 8
+    server.room.load_level = LoadLevel.SHED
+
+    reader, writer, _ = await open_bot(server, "secret", subscribe=False)
+
+    batch = {"type": "post", "messages": [{"content": f"m{i}"} for i in range(8)]}
+    writer.write(json.dumps(batch).encode() + b"\n")
+    await writer.drain()
+
+    ack = await next_event(reader, "ack")
+    assert ack["accepted"] == 2
+    assert ack["rejected"] == 6
+
+    writer.close()
+    await server.stop()
+    await server.room.stop()
+
+
+@pytest.mark.asyncio
+async def test_machine_replies_to_requests_that_are_not_objects():
+    server = await start_machine()
+
+    reader, writer, reply = await open_bot(server, "secret")
+    for line in (b"[]\n", b"1\n", b'"post"\n'):
+        writer.write(line)
+        await writer.drain()
+        reply = await next_event(reader, "error")
+        assert reply["error"] == "request must be an object"
+
+    writer.write(b'{"type": "post", "messages": [{"content": "still here"}]}\n')
+    await writer.drain()
+    assert (await next_event(reader, "ack"))["accepted"] == 1
+    writer.close()
+
+    reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+    writer.write(b"[]\n")
+    await writer.drain()
+    assert json.loads(await reader.readline()) == {
+        "type": "error",
+        "error": "unauthorized",
+    }
+
+    writer.close()
+    await server.stop()
+    await server.room.stop()
+
+
+@pytest.mark.asyncio
+async def test_machine_ack_survives_full_event_queue(monkeypatch):
+    async def stalled_pump(session):
+        await asyncio.Event().wait()
+
+    monkeypatch.setattr(MachineSession, "pump", stalled_pump)
+    server = await start_machine(queue_size=1)
+
+    reader, writer, _ = await open_bot(server, "secret")
+
+    batch = {"type": "post", "messages": [{"content": f"m{i}"} for i in range(3)]}
+    writer.write(json.dumps(batch).encode() + b"\n")
+    await writer.drain()
+    ack = await next_event(reader, "ack")
+    assert ack["accepted"] == 3
+
+    writer.write(b"[]\n")
+    await writer.drain()
+    await asyncio.sleep(0.05)
+    assert server.sessions[0].dropped >= 2
+    assert (await next_event(reader, "error"))["error"] == "request must be an object"
+
+    writer.close()
+    await server.stop()
+    await server.room.stop()
@@ -0,0 +1,69 @@
+from datetime import datetime
+
+from chatserver.core.mentions import MentionIndex, MentionTrie
+from chatserver.core.message import Message
+
+
+def make_trie(*nicknames: str) -> MentionTrie:
+    trie = MentionTrie()
+    for nickname in nicknames:
+        trie.add(nickname)
+    return trie
+
+
+def test_find_matches_whole_nicknames_case_insensitively():
+    trie = make_trie("Al", "Alice", "bob_2", "Carol")
+
+    assert trie.find("hey @alice and @Al, ping @BOB_2!") == {"Alice", "Al", "bob_2"}
+    assert trie.find("@Alicia @Car email@Carol") == frozenset()
+    assert trie.find("@Carol@Al") == {"Carol"}
+    assert trie.find("no mentions here") == frozenset()
+
+
+def test_remove_prunes_only_the_given_nickname():
+    trie = make_trie("Al", "Alice")
+
+    trie.remove("Alice")
+    assert "Alice" not in trie
+    assert "Al" in trie
+    assert trie.find("@Alice @Al") == {"Al"}
+
+    trie.remove("al")
+    assert len(trie) == 1
+    trie.remove("Al")
+    assert len(trie) == 0
+    assert trie._root == {}
+
+
+def test_nicknames_differing_only_by_case_share_a_node():
+    trie = make_trie("Alice", "alice")
+
+    assert len(trie) == 2
+    assert trie.find("hi @ALICE") == {"Alice", "alice"}
+
+    trie.remove("alice")
+    assert "Alice" in trie
+    assert "alice" not in trie
+    assert trie.find("@alice") == {"Alice"}
+
+    trie.remove("Alice")
+    assert len(trie) == 0
+    assert trie._root == {}
+
+
+def test_index_keeps_recent_mentions_per_user():
+    index = MentionIndex(limit=3)
+    for i in range(5):
+        index.record("Alice", Message("Bob", f"@Alice {i}", datetime.now()))
+
+    assert [m.content for m in index.recent("Alice")] == [
+        "@Alice 2",
+        "@Alice 3",
+        "@Alice 4",
+    ]
+    assert [m.content for m in index.recent("Alice", 1)] == ["@Alice 4"]
+    assert index.recent("Bob") == []
+
+    index.forget("Alice")
+    assert len(index) == 0
+    assert index.recorded == 5
@@ -0,0 +1,144 @@
+import asyncio
+import json
+from datetime import datetime
+
+import pytest
+
+from chatserver.core.message import Message
+from chatserver.core.room import Room
+from chatserver.network.mesh import LamportClock, Mesh, SeenSet, parse_peer
+from test.conftest import wait_for
+
+
+def test_parse_peer():
+    assert parse_peer("10.0.0.1:2424") == ("10.0.0.1", 2424)
+    assert parse_peer(":2424") == ("127.0.0.1", 2424)
+
+
+def test_seen_set_bounded():
+    seen = SeenSet(max_size=3)
+
+    assert seen.add("a")
+    assert not seen.add("a")
+
+    for msg_id in ("b", "c", "d"):
+        seen.add(msg_id)
+
+    assert len(seen) == 3
+    assert "a" not in seen
+    assert "d" in seen
+
+
+def test_lamport_clock():
+    clock = LamportClock()
+    assert clock.tick() == 1
+    assert clock.observe(10) == 11
+    assert clock.observe(3) == 12
+
+
+def test_message_roundtrip():
+    msg = Message("Alice", "Hello", datetime.now(), origin="a", lamport=7)
+    restored = Message.from_dict(msg.to_dict())
+
+    assert restored == msg
+
+
+@pytest.mark.asyncio
+async def test_mesh_replicates_without_duplicates():
+    nodes = []
+    for name in ("a", "b", "c"):
+        room = Room(name, 10, True, 50, True)
+        room.start()
+        mesh = Mesh(node_id=name, room=room, host="127.0.0.1")
+        await mesh.start()
+        nodes.append(mesh)
+
+    for mesh in nodes:
+        for other in nodes:
+            if other is not mesh:
+                mesh.connect(f"127.0.0.1:{other.port}")
+
+    await wait_for(
+        lambda: all(link.connected for m in nodes for link in m.links.values())
+    )
+
+    msg = Message("Alice", "Hello mesh", datetime.now())
+    await nodes[0].room.broadcast(msg)
+
+    await wait_for(lambda: all(len(m.room.history) == 1 for m in nodes))
+    await asyncio.sleep(0.1)
+
+    for mesh in nodes:
+        assert len(mesh.room.history) == 1
+        assert mesh.room.history[0].id == msg.id
+        assert mesh.room.history[0].origin == "a"
+
+    assert sum(m.duplicates for m in nodes) > 0
+
+    for mesh in nodes:
+        await mesh.stop()
+        await mesh.room.stop()
+
+
+@pytest.mark.asyncio
+async def test_mesh_slow_peer_does_not_block_local_fanout():
+    room = Room("Test", 10, True, 50, True)
+    room.start()
+    mesh = Mesh(node_id="a", room=room, host="127.0.0.1", queue_size=2)
+    await mesh.start()
+    mesh.connect("127.0.0.1:1")
+
+    for i in range(10):
+        await room.broadcast(Message("Alice", f"Message {i}", datetime.now()))
+
+    await wait_for(lambda: len(room.history) == 10)
+
+    link = next(iter(mesh.links.values()))
+    assert link.pending <= 2
+    assert link.dropped > 0
+
+    await mesh.stop()
+    await room.stop()
+
+
+@pytest.mark.asyncio
+async def test_mesh_rejects_peers_without_the_secret():
+    room = Room("Test", 10, True, 50, True)
+    room.start()
+    mesh = Mesh(node_id="a", room=room, secret="s3cret")
+    await mesh.start()
+    assert mesh.host == "127.0.0.1"
+
+    async def send(*frames) -> bytes:
+        reader, writer = await asyncio.open_connection("127.0.0.1", mesh.port)
+        for frame in frames:
+            writer.write(json.dumps(frame).encode() + b"\n")
+        await writer.drain()
+        data = await asyncio.wait_for(reader.read(), timeout=2.0)
+        writer.close()
+        return data
+
+    forged = {
+        "type": "message",
+        "message": Message("Mallory", "forged", datetime.now()).to_dict(),
+    }
+    await send(forged)
+    await send({"type": "hello", "node": "x", "secret": "wrong"}, forged)
+    assert mesh.rejected == 2
+
+    reader, writer = await asyncio.open_connection("127.0.0.1", mesh.port)
+    hello = {"type": "hello", "node": "b", "secret": "s3cret"}
+    message = {
+        "type": "message",
+        "message": Message("Bob", "trusted", datetime.now()).to_dict(),
+    }
+    for frame in (hello, message):
+        writer.write(json.dumps(frame).encode() + b"\n")
+    await writer.drain()
+
+    await wait_for(lambda: len(room.history) == 1)
+    assert room.history[0].content == "trusted"
+
+    writer.close()
+    await mesh.stop()
+    await room.stop()
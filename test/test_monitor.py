@@ -0,0 +1,100 @@
+import asyncio
+import gc
+import time
+
+import pytest
+
+from chatserver.core.monitor import (
+    LoopMonitor,
+    describe_callback,
+    tracemalloc_snapshot,
+    tracemalloc_stop,
+)
+
+
+class Blocker:
+    async def run(self):
+        await asyncio.sleep(0)
+        time.sleep(0.05)
+
+
+@pytest.mark.asyncio
+async def test_slow_callback_is_attributed_to_coroutine():
+    monitor = LoopMonitor(
+        interval=0.01, slow_callback_seconds=0.02, time_callbacks=True
+    )
+    monitor.start()
+
+    await asyncio.create_task(Blocker().run())
+    await asyncio.sleep(0.05)
+    await monitor.stop()
+
+    names = list(monitor.slow_callbacks)
+    assert any("Blocker.run" in name for name in names)
+    assert monitor.max_lag >= 0.02
+    assert monitor.stats()["lag_ms"]["max"] >= 20
+
+
+@pytest.mark.asyncio
+async def test_callback_timing_is_opt_in():
+    original = asyncio.events.Handle._run
+    monitor = LoopMonitor()
+    monitor.start()
+
+    assert asyncio.events.Handle._run is original
+    assert not monitor.stats()["callback_timing"]
+    await monitor.stop()
+
+
+@pytest.mark.asyncio
+async def test_stop_restores_event_loop_handles_once():
+    original = asyncio.events.Handle._run
+    monitor = LoopMonitor(time_callbacks=True)
+    monitor.start()
+    assert asyncio.events.Handle._run is not original
+
+    await monitor.stop()
+    assert asyncio.events.Handle._run is original
+    assert monitor._on_gc not in gc.callbacks
+
+    def other_patch(handle):
+        return original(handle)
+
+    asyncio.events.Handle._run = other_patch
+    try:
+        await monitor.stop()
+        assert asyncio.events.Handle._run is other_patch
+    finally:
+        asyncio.events.Handle._run = original
+
+
+@pytest.mark.asyncio
+async def test_gc_pauses_are_tracked():
+    monitor = LoopMonitor()
+    monitor.start()
+    gc.collect()
+    await monitor.stop()
+
+    assert monitor.gc_collections[2] >= 1
+    assert monitor.stats()["gc"]["collections"]["2"] >= 1
+
+
+def test_describe_plain_callback():
+    def on_timer():
+        pass
+
+    assert describe_callback(on_timer).endswith("on_timer")
+
+
+def test_tracemalloc_snapshot():
+    assert tracemalloc_snapshot()["started"]
+
+    data = [bytearray(1024) for _ in range(100)]
+    snapshot = tracemalloc_snapshot(limit=5)
+
+    assert not snapshot["started"]
+    assert snapshot["current_bytes"] > 0
+    assert len(snapshot["top"]) <= 5
+
+    assert not tracemalloc_stop()["tracing"]
+    del data
@@ -0,0 +1,97 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from chatserver.core.message import Message
+from chatserver.core.overload import LoadLevel, LoadSample, OverloadController
+from chatserver.core.room import Room
+
+
+class SlowClient:
+    def __init__(self, nickname: str, delay: float):
+        self.nickname = nickname
+        self.full_room_rejection = False
+        self.delay = delay
+        self.received: list[Message] = []
+
+    def deliver(self, msg: Message) -> bool:
+        self.received.append(msg)
+        return True
+
+    async def drain(self):
+        await asyncio.sleep(self.delay)
+
+
+async def drive_load(room: Room, messages: int):
+    for i in range(messages):
+        await room.broadcast(Message("Loadgen", f"load {i}", datetime.now()))
+
+
+def make_controller(room: Room, **kwargs) -> OverloadController:
+    options = {
+        "queue_slow": 10,
+        "queue_shed": 50,
+        "latency_slow_ms": 10_000,
+        "latency_shed_ms": 20_000,
+        "recover_intervals": 2,
+    }
+    options.update(kwargs)
+    return OverloadController(room, **options)
+
+
+@pytest.mark.asyncio
+async def test_controller_escalates_immediately_and_relaxes_gradually():
+    room = Room("Test", 10, False, 50, True, rate_limit_max_messages=8)
+    controller = make_controller(room)
+
+    assert await controller.update(LoadSample(60, 0.0, 0.0)) == LoadLevel.SHED
+    assert room.effective_rate_limit == 2
+
+    assert await controller.update(LoadSample(0, 0.0, 0.0)) == LoadLevel.SHED
+    assert await controller.update(LoadSample(0, 0.0, 0.0)) == LoadLevel.SLOW
+    assert room.effective_rate_limit == 4
+
+    assert await controller.update(LoadSample(0, 0.0, 0.0)) == LoadLevel.SLOW
+    assert await controller.update(LoadSample(20, 0.0, 0.0)) == LoadLevel.SLOW
+    assert await controller.update(LoadSample(0, 0.0, 0.0)) == LoadLevel.SLOW
+    assert await controller.update(LoadSample(0, 0.0, 0.0)) == LoadLevel.NORMAL
+    assert room.effective_rate_limit == 8
+    assert controller.transitions == 3
+
+    announcements = []
+    while room.queue_depth:
+        msg, _ = room._broadcast_queue.get_nowait()
+        announcements.append(msg.content)
+    assert "overloaded" in announcements[0]
+    assert "back to normal" in announcements[-1]
+
+
+@pytest.mark.asyncio
+async def test_controller_sheds_presence_under_synthetic_load():
+    room = Room("Test", 10, False, 50, True, fanout_shards=1)
+    room.start()
+    controller = make_controller(room)
+
+    viewer = SlowClient("Viewer", delay=0.002)
+    await room.join(viewer)
+    await drive_load(room, 200)
+
+    assert await controller.update(controller.sample()) == LoadLevel.SHED
+
+    await room.join(SlowClient("Latecomer", delay=0.0))
+    assert room.shed_notices == 1
+
+    while room.queue_depth:
+        await asyncio.sleep(0.05)
+    for _ in range(4):
+        await controller.update(controller.sample())
+    while room.queue_depth:
+        await asyncio.sleep(0.01)
+
+    assert controller.level == LoadLevel.NORMAL
+    contents = [m.content for m in viewer.received]
+    assert "Latecomer has joined the room" not in contents
+    assert any("back to normal" in c for c in contents)
+
+    await room.stop()
@@ -0,0 +1,86 @@
+import asyncio
+
+import pytest
+
+from chatserver.core.presence import PresenceCoalescer, presence_digest
+
+
+def test_presence_digest_wording():
+    assert presence_digest(["Alice"], []) == "Alice has joined the room"
+    assert presence_digest([], ["Bob"]) == "Bob has left the room"
+    assert (
+        presence_digest(["Alice", "Carol"], ["Bob"])
+        == "Alice, Carol have joined the room; Bob has left the room"
+    )
+    assert presence_digest([f"u{i}" for i in range(37)], ["x"] * 12) == (
+        "37 users joined, 12 left"
+    )
+
+
+def make_coalescer(**kwargs) -> tuple[PresenceCoalescer, list[str]]:
+    announced = []
+
+    async def announce(content: str):
+        announced.append(content)
+
+    return PresenceCoalescer(announce, **kwargs), announced
+
+
+@pytest.mark.asyncio
+async def test_storm_collapses_into_one_digest():
+    coalescer, announced = make_coalescer(window=0.1, burst=2)
+
+    for i in range(50):
+        await coalescer.joined(f"user{i}")
+    for i in range(40):
+        await coalescer.left(f"user{i}")
+
+    assert announced == ["user0 has joined the room", "user1 has joined the room"]
+
+    await asyncio.sleep(0.15)
+    assert announced[2:] == ["10 users joined, 2 left"]
+    assert coalescer.suppressed == 38
+    assert coalescer.digests == 1
+
+
+@pytest.mark.asyncio
+async def test_quick_leave_and_rejoin_cancel_out_with_default_burst():
+    coalescer, announced = make_coalescer(window=0.1)
+
+    await coalescer.joined("Alice")
+    await coalescer.left("Alice")
+    await coalescer.joined("Alice")
+    assert announced == ["Alice has joined the room"]
+
+    await asyncio.sleep(0.15)
+    assert announced == ["Alice has joined the room"]
+    assert coalescer.suppressed == 1
+
+    await coalescer.left("Bob")
+    await coalescer.joined("Carol")
+    assert announced[1:] == ["Carol has joined the room"]
+    await asyncio.sleep(0.15)
+    assert announced[2:] == ["Bob has left the room"]
+
+
+@pytest.mark.asyncio
+async def test_quick_join_and_leave_cancel_out():
+    coalescer, announced = make_coalescer(window=0.1, burst=0)
+
+    await coalescer.joined("Flaky")
+    await coalescer.left("Flaky")
+    await coalescer.joined("Alice")
+    await asyncio.sleep(0.15)
+
+    assert announced == ["Alice has joined the room"]
+
+
+@pytest.mark.asyncio
+async def test_zero_window_announces_every_event():
+    coalescer, announced = make_coalescer(window=0)
+
+    for nickname in ("Alice", "Bob", "Carol", "Dave"):
+        await coalescer.joined(nickname)
+
+    assert len(announced) == 4
+    assert coalescer.pending == 0
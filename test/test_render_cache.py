@@ -0,0 +1,72 @@
+from datetime import datetime
+
+from chatserver.core.message import Message
+from chatserver.ui.formatter import Formatter, TerminalProfile
+from chatserver.ui.render_cache import RenderCache
+
+
+def make_message(seq: int) -> Message:
+    return Message("Alice", f"Message {seq}", datetime.now(), seq=seq)
+
+
+def test_render_once_per_profile():
+    cache = RenderCache(capacity=10)
+    msg = make_message(1)
+
+    formatters = [
+        Formatter(profile=TerminalProfile.ANSI256),
+        Formatter(profile=TerminalProfile.ANSI256),
+        Formatter(profile=TerminalProfile.PLAIN),
+        Formatter(profile=TerminalProfile.PLAIN, width=40),
+    ]
+    rendered = [cache.render(msg, formatter) for formatter in formatters]
+
+    assert cache.misses == 3
+    assert cache.hits == 1
+    assert rendered[0] is rendered[1]
+    assert rendered[2].endswith(b"Alice: Message 1\r\n")
+
+
+def test_cache_evicts_oldest_messages():
+    cache = RenderCache(capacity=2)
+    plain = Formatter(profile=TerminalProfile.PLAIN)
+    ansi = Formatter(profile=TerminalProfile.ANSI256)
+
+    for seq in (1, 2, 3):
+        cache.render(make_message(seq), plain)
+        cache.render(make_message(seq), ansi)
+
+    assert len(cache) == 4
+
+    cache.render(make_message(1), plain)
+    assert cache.misses == 7
+
+    cache.resize(1)
+    assert len(cache) == 1
+
+
+def test_unsequenced_messages_bypass_cache():
+    cache = RenderCache(capacity=2)
+    plain = Formatter(profile=TerminalProfile.PLAIN)
+
+    cache.render(Message("System", "Hi", datetime.now(), is_system=True), plain)
+
+    assert len(cache) == 0
+    assert cache.misses == 0
+
+
+def test_replaying_old_messages_keeps_live_entries():
+    cache = RenderCache(capacity=2)
+    plain = Formatter(profile=TerminalProfile.PLAIN)
+    ansi = Formatter(profile=TerminalProfile.ANSI256)
+    live, old = make_message(10), make_message(5)
+
+    for formatter in (plain, ansi):
+        cache.render(live, formatter)
+        cache.render(old, formatter)
+    cache.render(live, plain)
+    cache.render(old, ansi)
+
+    assert cache.misses == 4
+    assert cache.hits == 2
+    assert len(cache) == 4
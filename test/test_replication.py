@@ -0,0 +1,91 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from chatserver.core.message import Message
+from chatserver.core.room import Room
+from chatserver.network.replication import (
+    StandbyReplica,
+    decode_message,
+    encode_message,
+)
+from test.conftest import connect, join, read_until, resume_token, send_line, wait_for
+
+
+def test_message_encoding_keeps_sequence():
+    msg = Message("Alice", "hi", datetime.now(), seq=42)
+    restored = decode_message(encode_message(msg))
+
+    assert restored.seq == 42
+    assert restored.id == msg.id
+
+
+@pytest.mark.asyncio
+async def test_replica_applies_frames_and_promotes_sessions():
+    room = Room("Test", 10, True, 50, True)
+    replica = StandbyReplica(room, "/unused")
+
+    history = [encode_message(Message("Alice", "one", datetime.now(), seq=7))]
+    replica.apply(
+        {
+            "type": "snapshot",
+            "seq": 7,
+            "settings": {**room.settings(), "max_users": 25},
+            "sessions": {"Alice": "token-a"},
+            "history": history,
+        }
+    )
+    message = Message("Bob", "two", datetime.now(), seq=8)
+    replica.apply({"type": "message", "message": encode_message(message)})
+    replica.apply({"type": "session", "nickname": "Bob", "token": "token-b"})
+    replica.apply({"type": "session", "nickname": "Carol", "token": "token-c"})
+    replica.apply({"type": "leave", "nickname": "Carol"})
+
+    assert room.max_users == 25
+    assert room.last_seq == 8
+    assert [m.content for m in room.get_history()] == ["one", "two"]
+
+    replica.promote()
+    assert not room.reserve_nickname("Alice")
+    assert room.reserve_nickname("Carol")
+
+    session = room.resume("token-b")
+    assert session.nickname == "Bob"
+    assert session.last_seq == 8
+    await room.stop()
+
+
+@pytest.mark.asyncio
+async def test_standby_takes_over_with_history_and_sessions(tmp_path, make_server):
+    path = str(tmp_path / "replication.sock")
+    primary = make_server(replication_socket=path)
+    await primary.start()
+
+    reader, writer, output = await join(primary, "Alice")
+    token = resume_token(output)
+    await send_line(writer, "before failover")
+    await read_until(reader, "before failover")
+
+    standby = make_server(replication_socket=path, standby=True, failover_seconds=0.2)
+    standby_task = asyncio.create_task(standby.run())
+    await wait_for(lambda: len(standby.room.history) == 2, timeout=3.0)
+    assert standby.server is None
+
+    writer.close()
+    await primary.stop()
+    await wait_for(lambda: standby.server is not None, timeout=3.0)
+
+    reader, writer = await connect(standby)
+    await send_line(writer, f"/resume {token}")
+    await read_until(reader, "Welcome back, Alice!")
+
+    await send_line(writer, "/history")
+    output = await read_until(reader, "before failover")
+    assert "#2" in output
+
+    assert standby.replication is not None
+    writer.close()
+    standby_task.cancel()
+    await asyncio.gather(standby_task, return_exceptions=True)
+    await standby.stop()
@@ -147,3 +147,41 @@ async def test_room_max_users():
     assert client3.full_room_rejection
 
     await room.stop()
+
+
+def test_room_apply_settings_resizes_history():
+    room = Room("Test", 10, True, 5, False)
+
+    for i in range(5):
+        room.history.append(Message("Alice", f"Message {i}", datetime.now()))
+
+    room.apply_settings(
+        max_users=20,
+        history_size=3,
+        rate_limit_max_messages=8,
+        rate_limit_window_seconds=2,
+        max_message_length=200,
+    )
+
+    assert room.max_users == 20
+    assert room.history.maxlen == 3
+    assert [m.content for m in room.history] == ["Message 2", "Message 3", "Message 4"]
+    assert room.rate_limit_max_messages == 8
+    assert room.max_message_length == 200
+
+
+def test_apply_settings_rejects_out_of_range_values():
+    room = Room("Test", 10, True, 5, False)
+    before = room.settings()
+
+    with pytest.raises(ValueError):
+        room.apply_settings(
+            max_users=20,
+            history_size=-1,
+            rate_limit_max_messages=7,
+            rate_limit_window_seconds=5,
+            max_message_length=100,
+        )
+
+    assert room.settings() == before
+    assert room.history.maxlen == 5
@@ -0,0 +1,45 @@
+from chatserver.core.roster import Roster
+from chatserver.ui.formatter import Formatter, TerminalProfile
+
+
+def test_roster_keeps_names_sorted():
+    roster = Roster()
+    for nickname in ("carol", "Alice", "bob", "Alice"):
+        roster.add(nickname)
+
+    assert roster.names() == ["Alice", "bob", "carol"]
+    assert "bob" in roster
+    assert "Bob" not in roster
+
+    roster.remove("bob")
+    roster.remove("nobody")
+    assert list(roster) == ["Alice", "carol"]
+    assert len(roster) == 2
+
+
+def test_roster_prefix_lookup():
+    roster = Roster()
+    for nickname in ("Alice", "albert", "Alfred", "Bob", "alan"):
+        roster.add(nickname)
+
+    assert roster.prefix("al") == ["alan", "albert", "Alfred", "Alice"]
+    assert roster.prefix("ALF") == ["Alfred"]
+    assert roster.prefix("al", limit=2) == ["alan", "albert"]
+    assert roster.prefix("z") == []
+
+
+def test_roster_render_is_cached_per_profile():
+    roster = Roster()
+    roster.add("Alice")
+    plain = Formatter(plain_text=True)
+    ansi = Formatter(profile=TerminalProfile.ANSI16)
+
+    first = roster.render(plain, "Test", 10)
+    assert roster.render(plain, "Test", 10) is first
+    assert b"- Alice" in first
+    assert b"\033[" in roster.render(ansi, "Test", 10)
+    assert roster.renders == 2
+
+    roster.add("Bob")
+    assert b"(2/10)" in roster.render(plain, "Test", 10)
+    assert roster.renders == 3
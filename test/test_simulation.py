@@ -0,0 +1,44 @@
+import math
+
+from benchmarks.simulation import LinkProfile, SimulationConfig, run_simulation
+
+
+def test_virtual_time_reports_link_latency():
+    config = SimulationConfig(
+        clients=200,
+        messages=20,
+        rate=10,
+        links=[(1.0, LinkProfile(latency=0.05))],
+        probe_every=10,
+        virtual_time=True,
+    )
+    report = run_simulation(config)
+
+    assert report.clients == 200
+    assert report.deliveries >= 200 * 20
+    assert report.sim_seconds >= 1.9
+    assert report.wall_seconds < report.sim_seconds
+    assert len(report.arrivals) == 20 * 20
+    assert math.isclose(report.arrival_ms()["p50"], 50.0, abs_tol=0.5)
+    assert report.dropped == 0
+
+
+def test_stalled_consumers_are_dropped():
+    config = SimulationConfig(
+        clients=100,
+        messages=300,
+        rate=100,
+        message_size=512,
+        links=[
+            (0.9, LinkProfile()),
+            (0.1, LinkProfile(stall_at=0.5)),
+        ],
+        probe_every=1,
+        stall_timeout=0.5,
+        virtual_time=True,
+    )
+    report = run_simulation(config)
+
+    assert report.dropped == 10
+    assert report.undelivered > 0
+    assert report.summary()["fanout_ms"]["p99"] >= 0.0
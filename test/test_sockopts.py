@@ -0,0 +1,80 @@
+import asyncio
+import socket
+from datetime import datetime
+
+import pytest
+
+from chatserver.core.message import Message
+
+
+async def join(port: int, nickname: str, rcvbuf: int = 0):
+    sock = socket.socket()
+    if rcvbuf:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, rcvbuf)
+    sock.connect(("127.0.0.1", port))
+    sock.setblocking(False)
+
+    reader, writer = await asyncio.open_connection(sock=sock)
+    await reader.readuntil(b"nickname: ")
+    writer.write(f"{nickname}\n".encode())
+    await writer.drain()
+    await reader.readuntil(b"> ")
+    return reader, writer
+
+
+@pytest.mark.asyncio
+async def test_socket_options_applied_per_connection(make_server):
+    server = make_server(
+        enable_history=False,
+        tcp_keepidle=30,
+        tcp_keepcnt=4,
+        write_buffer_high=8192,
+        write_buffer_low=1024,
+    )
+    await server.start()
+    port = server.server.sockets[0].getsockname()[1]
+
+    _, writer = await join(port, "Alice")
+    await asyncio.sleep(0.05)
+
+    client = next(iter(server.connections))
+    sock = client.writer.get_extra_info("socket")
+    assert sock.getsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY)
+    assert sock.getsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE)
+    if hasattr(socket, "TCP_KEEPCNT"):
+        assert sock.getsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPCNT) == 4
+    assert client.writer.transport.get_write_buffer_limits() == (1024, 8192)
+
+    writer.close()
+    await server.stop()
+
+
+@pytest.mark.asyncio
+async def test_stalled_peer_is_dropped_and_nickname_released(make_server):
+    server = make_server(
+        enable_history=False,
+        socket_sndbuf=4096,
+        write_buffer_high=4096,
+        write_stall_timeout=0.2,
+    )
+    await server.start()
+    port = server.server.sockets[0].getsockname()[1]
+
+    _, writer = await join(port, "Stuck", rcvbuf=4096)
+    await asyncio.sleep(0.05)
+
+    for i in range(500):
+        await server.room.broadcast(
+            Message("System", f"filler {i} " + "x" * 500, datetime.now(), True)
+        )
+
+    for _ in range(40):
+        await asyncio.sleep(0.05)
+        if "Stuck" not in server.room.clients:
+            break
+
+    assert "Stuck" not in server.room.clients
+    assert server.reaped_peers == 1
+
+    writer.close()
+    await server.stop()
@@ -0,0 +1,122 @@
+import pytest
+
+from chatserver.core.exceptions import SpamDetectedError
+from chatserver.core.spam import SpamAction, SpamFilter, content_fingerprint
+
+
+def test_fingerprint_ignores_case_and_punctuation():
+    assert content_fingerprint("Buy NOW!!! cheap stuff") == content_fingerprint(
+        "buy now cheap-stuff"
+    )
+    assert content_fingerprint("hello there") != content_fingerprint("hello world")
+
+
+def test_duplicates_across_clients_are_blocked():
+    spam = SpamFilter(duplicate_threshold=3)
+
+    spam.check("alice", "Join my server now!!!", now=0.0)
+    spam.check("bob", "join my server now", now=1.0)
+    with pytest.raises(SpamDetectedError) as exc:
+        spam.check("carol", "JOIN MY SERVER NOW", now=2.0)
+
+    assert exc.value.reason == "duplicate"
+    assert spam.blocked == 1
+
+
+def test_duplicates_expire_after_window():
+    spam = SpamFilter(duplicate_threshold=2, duplicate_window_seconds=5.0)
+
+    spam.check("alice", "repeated paste text", now=0.0)
+    spam.check("alice", "repeated paste text", now=6.0)
+
+
+def test_short_messages_are_not_deduplicated():
+    spam = SpamFilter(duplicate_threshold=2)
+
+    for t in range(5):
+        spam.check(f"user{t}", "lol", now=float(t))
+
+
+def test_room_burst_detection():
+    spam = SpamFilter(burst_threshold=5, burst_window_seconds=1.0)
+
+    for i in range(5):
+        spam.check(f"user{i}", f"unique message number {i}", now=i * 0.1)
+
+    with pytest.raises(SpamDetectedError) as exc:
+        spam.check("user9", "one message too many", now=0.6)
+    assert exc.value.reason == "burst"
+
+    spam.check("user9", "later message", now=2.0)
+
+
+def test_mute_action():
+    spam = SpamFilter(action=SpamAction.MUTE, duplicate_threshold=2)
+
+    spam.check("alice", "spam spam spam spam", now=0.0)
+    with pytest.raises(SpamDetectedError):
+        spam.check("alice", "spam spam spam spam", now=1.0)
+
+    with pytest.raises(SpamDetectedError) as exc:
+        spam.check("alice", "an honest message", now=2.0)
+    assert exc.value.reason == "muted"
+
+    spam.check("bob", "an honest message", now=2.0)
+    spam.check("alice", "back again after mute", now=40.0)
+
+
+def test_slow_action():
+    spam = SpamFilter(
+        action=SpamAction.SLOW, duplicate_threshold=2, slow_mode_interval=2.0
+    )
+
+    spam.check("alice", "spam spam spam spam", now=0.0)
+    with pytest.raises(SpamDetectedError):
+        spam.check("bob", "spam spam spam spam", now=0.5)
+
+    spam.check("carol", "first message", now=1.0)
+    with pytest.raises(SpamDetectedError) as exc:
+        spam.check("carol", "second message", now=1.5)
+    assert exc.value.reason == "slow"
+
+    spam.check("carol", "third message", now=3.5)
+    spam.check("carol", "slow mode is over", now=31.0)
+    spam.check("carol", "so this is fine", now=31.1)
+
+
+def test_burst_mutes_the_flooder_not_the_next_sender():
+    spam = SpamFilter(
+        action=SpamAction.MUTE, burst_threshold=5, burst_window_seconds=1.0
+    )
+
+    for i in range(5):
+        spam.check("flooder", f"flood message number {i}", now=i * 0.1)
+
+    with pytest.raises(SpamDetectedError) as exc:
+        spam.check("alice", "an honest message", now=0.55)
+    assert exc.value.reason == "burst"
+
+    with pytest.raises(SpamDetectedError) as exc:
+        spam.check("flooder", "flood message number 5", now=0.6)
+    assert exc.value.reason == "burst"
+
+    spam.check("alice", "an honest message", now=2.0)
+    with pytest.raises(SpamDetectedError) as exc:
+        spam.check("flooder", "flood message number 6", now=2.1)
+    assert exc.value.reason == "muted"
+
+
+def test_duplicate_strike_goes_to_the_repeating_sender():
+    spam = SpamFilter(action=SpamAction.MUTE, duplicate_threshold=3)
+
+    spam.check("spammer", "join my server now", now=0.0)
+    spam.check("spammer", "join my server now", now=1.0)
+    with pytest.raises(SpamDetectedError):
+        spam.check("alice", "join my server now", now=2.0)
+    with pytest.raises(SpamDetectedError):
+        spam.check("spammer", "join my server now", now=3.0)
+
+    spam.check("alice", "what was that about", now=4.0)
+    with pytest.raises(SpamDetectedError) as exc:
+        spam.check("spammer", "something different", now=5.0)
+    assert exc.value.reason == "muted"
@@ -0,0 +1,45 @@
+from chatserver.core.spectators import Spectators
+
+
+class FakeTransport:
+    def __init__(self, buffered: int = 0):
+        self.buffered = buffered
+        self.closing = False
+        self.aborted = False
+        self.data = b""
+
+    def is_closing(self) -> bool:
+        return self.closing
+
+    def get_write_buffer_size(self) -> int:
+        return self.buffered
+
+    def write(self, data: bytes):
+        self.data += data
+
+    def abort(self):
+        self.aborted = True
+        self.closing = True
+
+    def close(self):
+        self.closing = True
+
+
+def test_publish_shares_bytes_and_drops_laggards():
+    spectators = Spectators(max_buffer=100)
+    fast, slow, gone = FakeTransport(), FakeTransport(buffered=500), FakeTransport()
+    gone.closing = True
+    for transport in (fast, slow, gone):
+        spectators.add(transport)
+
+    spectators.publish(b"hello\r\n")
+
+    assert fast.data == b"hello\r\n"
+    assert slow.aborted and slow.data == b""
+    assert gone.data == b""
+    assert len(spectators) == 1
+    assert spectators.dropped == 1
+
+    spectators.close()
+    assert fast.closing
+    assert len(spectators) == 0
@@ -0,0 +1,44 @@
+import subprocess
+import sys
+
+STARTUP_BUDGET_MS = 150
+
+DEFERRED_MODULES = (
+    "asyncio",
+    "pydantic",
+    "pydantic_settings",
+    "dotenv",
+    "chatserver.config",
+    "chatserver.network.server",
+)
+
+
+def import_times(module: str) -> dict[str, int]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        times[name.strip()] = int(cumulative)
+
+    return times
+
+
+def test_cli_import_defers_heavy_modules():
+    times = import_times("chatserver.main")
+
+    for module in DEFERRED_MODULES:
+        assert module not in times, f"{module} imported at CLI startup"
+
+
+def test_cli_import_time_budget():
+    best = min(import_times("chatserver.main")["chatserver.main"] for _ in range(3))
+
+    assert best / 1000 < STARTUP_BUDGET_MS
@@ -0,0 +1,95 @@
+import asyncio
+import shutil
+import socket
+import ssl
+import subprocess
+
+import pytest
+
+pytestmark = pytest.mark.skipif(
+    shutil.which("openssl") is None, reason="openssl CLI not available"
+)
+
+
+@pytest.fixture
+def cert_files(tmp_path):
+    cert = tmp_path / "cert.pem"
+    key = tmp_path / "key.pem"
+    subprocess.run(
+        [
+            "openssl",
+            "req",
+            "-x509",
+            "-newkey",
+            "rsa:2048",
+            "-nodes",
+            "-days",
+            "1",
+            "-subj",
+            "/CN=localhost",
+            "-keyout",
+            str(key),
+            "-out",
+            str(cert),
+        ],
+        check=True,
+        capture_output=True,
+    )
+    return str(cert), str(key)
+
+
+def client_context() -> ssl.SSLContext:
+    context = ssl.create_default_context()
+    context.check_hostname = False
+    context.verify_mode = ssl.CERT_NONE
+    return context
+
+
+def fetch_prompt(port: int, context: ssl.SSLContext, session=None):
+    with socket.create_connection(("127.0.0.1", port)) as sock:
+        with context.wrap_socket(sock, session=session) as tls:
+            data = b""
+            while b"nickname: " not in data:
+                data += tls.recv(4096)
+            return data, tls.session, tls.session_reused
+
+
+@pytest.mark.asyncio
+async def test_tls_listener_with_session_resumption(cert_files, make_server):
+    cert, key = cert_files
+    server = make_server(enable_history=False, tls_cert_file=cert, tls_key_file=key)
+    await server.start()
+    port = server.server.sockets[0].getsockname()[1]
+    context = client_context()
+
+    data, session, reused = await asyncio.to_thread(fetch_prompt, port, context)
+    assert b"Welcome to MeshChat" in data
+    assert not reused
+
+    _, _, reused = await asyncio.to_thread(fetch_prompt, port, context, session)
+    assert reused
+
+    await server.stop()
+
+
+@pytest.mark.asyncio
+async def test_tls_stalled_handshake_does_not_block_others(cert_files, make_server):
+    cert, key = cert_files
+    server = make_server(
+        enable_history=False,
+        tls_cert_file=cert,
+        tls_key_file=key,
+        tls_handshake_timeout=0.2,
+    )
+    await server.start()
+    port = server.server.sockets[0].getsockname()[1]
+
+    stalled_reader, stalled_writer = await asyncio.open_connection("127.0.0.1", port)
+
+    data, _, _ = await asyncio.to_thread(fetch_prompt, port, client_context())
+    assert b"nickname" in data
+
+    assert await asyncio.wait_for(stalled_reader.read(), timeout=2.0) == b""
+    stalled_writer.close()
+
+    await server.stop()